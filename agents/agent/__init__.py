@@ -1 +1,16 @@
-from agents.agent.insight_agent import build_insight_agent
\ No newline at end of file
+from agents.agent.insight_agent import (
+    build_insight_agent,
+    explain_messages,
+    get_insight_agent,
+    get_llm,
+)
+from agents.agent.insight_cache import (
+    alert_fingerprint,
+    get_alert_insight,
+    get_incident_insight,
+    incident_fingerprint,
+    insight_key,
+    insight_metrics,
+    read_cached_insight,
+    store_insight,
+)
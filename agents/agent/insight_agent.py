@@ -1,50 +1,81 @@
 # agent/insight_agent.py
 import os
+from functools import lru_cache
 from typing import Any, Dict, TypedDict
 
 from dotenv import load_dotenv
 
 load_dotenv()
+from django.conf import settings
+from langchain_core.language_models import FakeListChatModel
 from langchain_core.messages import HumanMessage
 from langchain_openai import ChatOpenAI
 from langgraph.graph import END, StateGraph
 
-from agents.tools import format_alert_for_insight
+from agents.tools import format_alert_for_insight, format_incident_for_insight
 
 BASE_URL = os.getenv("BASE_URL")
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
 
 
-# Define the expected state for LangGraph
-class AgentState(TypedDict):
+# Define the expected state for LangGraph: a single alert or an incident of
+# correlated alerts
+class AgentState(TypedDict, total=False):
     alert: Dict[str, Any]
+    incident: Dict[str, Any]
     explanation: str
 
 
-# Step 1: Format the alert
+# Step 1: Format the alert or incident
 def format_step(state: AgentState) -> AgentState:
-    formatted = format_alert_for_insight.invoke({"alert": state["alert"]})
-    return {"alert": state["alert"], "explanation": formatted}
+    if "incident" in state:
+        formatted = format_incident_for_insight.invoke({"incident": state["incident"]})
+    else:
+        formatted = format_alert_for_insight.invoke({"alert": state["alert"]})
+    return {**state, "explanation": formatted}
+
+
+# Canned answer of the fake LLM backend
+FAKE_INSIGHT = (
+    "The host reports the condition described by the trigger and it is still "
+    "active. It is most likely caused by load or a configuration change on the "
+    "host. Check the related service and recent changes, then watch whether "
+    "the problem clears."
+)
 
 
 # Step 2: Call GPT
-llm = ChatOpenAI(
-    model="gpt-4o",
-    openai_api_base=BASE_URL,
-    openai_api_key=GITHUB_TOKEN,
-    max_tokens=4096,
-)
+@lru_cache(maxsize=1)
+def get_llm():
+    """
+    Chat model of INSIGHT_LLM_BACKEND: "openai" (GPT-4o) or "fake", a local
+    stand-in that streams FAKE_INSIGHT character by character every
+    INSIGHT_FAKE_LLM_DELAY seconds, for offline development and tests
+    """
+    if settings.INSIGHT_LLM_BACKEND == "fake":
+        return FakeListChatModel(
+            responses=[FAKE_INSIGHT], sleep=settings.INSIGHT_FAKE_LLM_DELAY
+        )
+    return ChatOpenAI(
+        model="gpt-4o",
+        openai_api_base=BASE_URL,
+        openai_api_key=GITHUB_TOKEN,
+        max_tokens=4096,
+    )
 
 
-def explain_step(state: AgentState) -> AgentState:
-    messages = [
+def explain_messages(formatted_alert):
+    return [
         HumanMessage(
             content=f"Zabbix Alert Analysis - Use Zabbix 7.2 docs. Keep response to 3 SHORT sentences:\n"
-            f"{state['explanation']}"
+            f"{formatted_alert}"
         )
     ]
-    response = llm.invoke(messages)
-    return {"alert": state["alert"], "explanation": response.content}
+
+
+def explain_step(state: AgentState) -> AgentState:
+    response = get_llm().invoke(explain_messages(state["explanation"]))
+    return {**state, "explanation": response.content}
 
 
 # Build the graph
@@ -61,6 +92,12 @@ def build_insight_agent():
     return builder.compile()
 
 
+@lru_cache(maxsize=1)
+def get_insight_agent():
+    """The insight graph, compiled once per process and shared by requests"""
+    return build_insight_agent()
+
+
 # import os
 # from azure.ai.inference import ChatCompletionsClient
 # from azure.ai.inference.models import SystemMessage, UserMessage
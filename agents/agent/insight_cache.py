@@ -0,0 +1,192 @@
+import logging
+import time
+
+import orjson
+import redis
+import xxhash
+from django.conf import settings
+
+from agents.agent.insight_agent import get_insight_agent
+from agents.tools import format_alert_for_insight
+from utils import get_redis
+
+logger = logging.getLogger("django")
+
+INSIGHT_PREFIX = "monipro:insight"
+METRICS_KEY = f"{INSIGHT_PREFIX}:metrics"
+
+
+def alert_fingerprint(trigger_id, alert):
+    """
+    xxhash fingerprint of an alert as the LLM sees it
+
+    The formatted alert covers the trigger's description, host, lastchange,
+    priority, value and tags, so a trigger gets a new fingerprint (and a new
+    insight) whenever its state changes.
+    """
+    prompt = format_alert_for_insight.invoke({"alert": alert})
+    return xxhash.xxh3_64_hexdigest(f"{trigger_id}\n{prompt}")
+
+
+def incident_fingerprint(incident):
+    """
+    xxhash fingerprint of an incident: its alerts and their states, so the
+    insight is regenerated when an alert joins or resolves
+    """
+    alerts = sorted((alert["id"], alert["status"]) for alert in incident["alerts"])
+    return xxhash.xxh3_64_hexdigest(orjson.dumps(alerts))
+
+
+def insight_key(trigger_id, alert):
+    return f"{INSIGHT_PREFIX}:{alert_fingerprint(trigger_id, alert)}"
+
+
+def read_cached_insight(key):
+    """
+    Cached insight under `key`, or None on a miss or when Redis is down.
+    A hit is counted in the metrics.
+    """
+    try:
+        conn = get_redis()
+        cached = conn.get(key)
+    except redis.RedisError as e:
+        logger.warning(f"Insight cache unavailable: {e}")
+        return None
+    if not cached:
+        return None
+    _record(conn, "hits")
+    return orjson.loads(cached)
+
+
+def store_insight(key, insight, llm_ms, ttft_ms=None):
+    """Cache a new insight and count the LLM call in the metrics"""
+    try:
+        conn = get_redis()
+        conn.set(key, orjson.dumps(insight), ex=settings.INSIGHT_CACHE_TTL_SECONDS)
+    except redis.RedisError as e:
+        logger.warning(f"Could not cache insight: {e}")
+        return
+    _record(conn, "misses", llm_ms, ttft_ms)
+
+
+def get_alert_insight(trigger_id, alert):
+    """
+    Explain an alert, reusing a cached insight of the same fingerprint
+
+    Insights are cached in Redis for INSIGHT_CACHE_TTL_SECONDS. Concurrent
+    requests for one fingerprint wait on a lock while the first one asks the
+    LLM, then read its answer, so they cost one LLM call. Without Redis the
+    LLM is asked directly.
+
+    Returns:
+        tuple: (insight, stats). stats has `cache` ("hit", "coalesced" or
+            "miss") and, when the LLM was called, `llm_ms`.
+    """
+    return _cached_explanation(insight_key(trigger_id, alert), {"alert": alert})
+
+
+def get_incident_insight(incident):
+    """
+    Explain all alerts of an incident with one LLM call
+
+    Cached and coalesced like `get_alert_insight`, keyed by the incident's
+    fingerprint.
+
+    Returns:
+        tuple: (insight, stats) as for `get_alert_insight`
+    """
+    key = f"{INSIGHT_PREFIX}:incident:{incident_fingerprint(incident)}"
+    return _cached_explanation(key, {"incident": incident})
+
+
+def _cached_explanation(key, state):
+    cached = read_cached_insight(key)
+    if cached is not None:
+        return cached, {"cache": "hit"}
+
+    try:
+        conn = get_redis()
+        lock = conn.lock(
+            f"{key}:lock",
+            timeout=settings.INSIGHT_LOCK_SECONDS,
+            blocking_timeout=settings.INSIGHT_LOCK_SECONDS,
+        )
+        acquired = lock.acquire()
+    except redis.RedisError as e:
+        logger.warning(f"Insight cache unavailable: {e}")
+        insight, llm_ms = _explain(state)
+        return insight, {"cache": "miss", "llm_ms": llm_ms}
+
+    try:
+        if acquired:
+            try:
+                cached = conn.get(key)
+            except redis.RedisError:
+                cached = None
+            if cached:
+                _record(conn, "coalesced")
+                return orjson.loads(cached), {"cache": "coalesced"}
+
+        insight, llm_ms = _explain(state)
+        store_insight(key, insight, llm_ms)
+        return insight, {"cache": "miss", "llm_ms": llm_ms}
+    finally:
+        if acquired:
+            try:
+                lock.release()
+            except redis.RedisError:
+                pass
+
+
+def insight_metrics():
+    """
+    Cache hit rate, LLM latency and time to first streamed token of the
+    insight endpoints
+    """
+    try:
+        raw = get_redis().hgetall(METRICS_KEY)
+    except redis.RedisError as e:
+        logger.warning(f"Insight metrics unavailable: {e}")
+        raw = {}
+    values = {key.decode(): float(value) for key, value in raw.items()}
+
+    hits = int(values.get("hits", 0))
+    coalesced = int(values.get("coalesced", 0))
+    misses = int(values.get("misses", 0))
+    streamed = int(values.get("streamed", 0))
+    requests = hits + coalesced + misses
+    return {
+        "requests": requests,
+        "hits": hits,
+        "coalesced": coalesced,
+        "misses": misses,
+        "hit_rate": round((hits + coalesced) / requests, 4) if requests else None,
+        "llm_calls": misses,
+        "llm_ms_avg": round(values["llm_ms_total"] / misses, 1) if misses else None,
+        "streamed": streamed,
+        "ttft_ms_avg": (
+            round(values["ttft_ms_total"] / streamed, 1) if streamed else None
+        ),
+    }
+
+
+def _explain(state):
+    started = time.perf_counter()
+    result = get_insight_agent().invoke(state)
+    llm_ms = (time.perf_counter() - started) * 1000
+    logger.info(f"Alert insight generated in {llm_ms:.0f} ms")
+    return result["explanation"], llm_ms
+
+
+def _record(conn, outcome, llm_ms=None, ttft_ms=None):
+    try:
+        pipe = conn.pipeline()
+        pipe.hincrby(METRICS_KEY, outcome, 1)
+        if llm_ms is not None:
+            pipe.hincrbyfloat(METRICS_KEY, "llm_ms_total", llm_ms)
+        if ttft_ms is not None:
+            pipe.hincrby(METRICS_KEY, "streamed", 1)
+            pipe.hincrbyfloat(METRICS_KEY, "ttft_ms_total", ttft_ms)
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Could not record insight metrics: {e}")
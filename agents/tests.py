@@ -1,3 +1,82 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+import orjson
+from asgiref.sync import async_to_sync
+from django.test import AsyncRequestFactory, SimpleTestCase, override_settings
+
+from agents.agent import build_insight_agent, get_llm
+from agents.agent.insight_agent import FAKE_INSIGHT
+from agents.views.alert_insight_stream import stream_alert_insight
+
+ALERT = {
+    "trigger": {
+        "description": "High CPU utilization",
+        "lastchange": "1700000000",
+        "priority": "4",
+        "value": "1",
+    },
+    "host": {"host": "web-01"},
+    "tags": [{"tag": "service", "value": "nginx"}],
+}
+
+
+async def _user(request):
+    return object()
+
+
+@override_settings(INSIGHT_LLM_BACKEND="fake", INSIGHT_FAKE_LLM_DELAY=0)
+class InsightStreamTests(SimpleTestCase):
+    """Alert insights generated offline by the fake LLM backend"""
+
+    def setUp(self):
+        get_llm.cache_clear()
+        self.addCleanup(get_llm.cache_clear)
+
+    def stream(self, cached=None):
+        """Events of the stream view as (event, data) pairs"""
+        view = "agents.views.alert_insight_stream"
+        with (
+            mock.patch(f"{view}.stream_request_user", _user),
+            mock.patch(f"{view}.get_single_alerts", return_value=ALERT),
+            mock.patch(f"{view}.read_cached_insight", return_value=cached),
+            mock.patch(f"{view}.store_insight") as store,
+        ):
+            request = AsyncRequestFactory().get(
+                "/agents/get-ai-explanation/stream/", {"triggerid": "1"}
+            )
+            response = async_to_sync(stream_alert_insight)(request)
+            self.assertEqual(response["Content-Type"], "text/event-stream")
+            body = async_to_sync(self._read)(response)
+        events = []
+        for block in body.strip().split("\n\n"):
+            lines = dict(line.split(": ", 1) for line in block.splitlines())
+            events.append((lines["event"], orjson.loads(lines["data"])))
+        return events, store
+
+    @staticmethod
+    async def _read(response):
+        return b"".join([chunk async for chunk in response.streaming_content]).decode()
+
+    def test_graph_explains_alert(self):
+        result = build_insight_agent().invoke({"alert": ALERT})
+        self.assertEqual(result["explanation"], FAKE_INSIGHT)
+
+    def test_stream_sends_tokens_and_caches_insight(self):
+        events, store = self.stream()
+
+        self.assertEqual(events[0], ("meta", {"cache": "miss"}))
+        tokens = [data["text"] for event, data in events if event == "token"]
+        self.assertGreater(len(tokens), 1)
+        self.assertEqual("".join(tokens), FAKE_INSIGHT)
+        event, done = events[-1]
+        self.assertEqual(event, "done")
+        self.assertLessEqual(done["ttft_ms"], done["total_ms"])
+        self.assertEqual(store.call_args.args[1], FAKE_INSIGHT)
+
+    def test_stream_sends_cached_insight_as_one_token(self):
+        events, store = self.stream(cached="Cached insight")
+
+        self.assertEqual([event for event, _ in events], ["meta", "token", "done"])
+        self.assertEqual(events[0][1], {"cache": "hit"})
+        self.assertEqual(events[1][1], {"text": "Cached insight"})
+        store.assert_not_called()
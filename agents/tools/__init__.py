@@ -1 +1,2 @@
-from agents.tools.format_alert_tool import format_alert_for_insight
\ No newline at end of file
+from agents.tools.format_alert_tool import format_alert_for_insight
+from agents.tools.format_incident_tool import format_incident_for_insight
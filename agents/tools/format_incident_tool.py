@@ -0,0 +1,47 @@
+import datetime
+from typing import Any, Dict
+
+from langchain_core.tools import tool
+
+# Alerts listed in one prompt; the rest of a large incident is only counted
+MAX_INCIDENT_ALERTS = 25
+
+
+@tool
+def format_incident_for_insight(incident: Dict[str, Any]) -> str:
+    """
+    Takes an incident of correlated Zabbix alerts and returns a formatted
+    string with context, suitable to pass to an LLM for one explanation of
+    the whole incident.
+    """
+    alerts = incident.get("alerts", [])
+
+    lines = []
+    for alert in alerts[:MAX_INCIDENT_ALERTS]:
+        time = datetime.datetime.fromtimestamp(int(alert.get("timestamp", 0)))
+        tags = ", ".join(f"{t['tag']}:{t['value']}" for t in alert.get("tags", []))
+        lines.append(
+            f"- {time.strftime('%H:%M:%S')} [{alert.get('severity')}] "
+            f"{alert.get('host')}: {alert.get('name')} "
+            f"({alert.get('status', '').upper()}){f' tags {tags}' if tags else ''}"
+        )
+    if len(alerts) > MAX_INCIDENT_ALERTS:
+        lines.append(f"- ... and {len(alerts) - MAX_INCIDENT_ALERTS} more alerts")
+
+    started = datetime.datetime.fromtimestamp(int(incident.get("started", 0)))
+    alert_lines = "\n".join(lines)
+    explanation_prompt = f"""Using Zabbix 7.2 documentation for your analysis (but don't mention Zabbix in your response), analyze this incident of related alerts:
+
+**Hosts:** {', '.join(incident.get("hosts", []))}
+**Started:** {started.strftime("%Y-%m-%d %H:%M:%S")}
+**Highest severity:** {incident.get("severity")}
+**Status:** {"ACTIVE" if incident.get("status") == "problem" else "RESOLVED"}
+**Alerts ({len(alerts)}):**
+{alert_lines}
+
+Explain the incident as a whole in 3 sentences max without mentioning Zabbix:
+1. Current system state
+2. Most likely common root cause
+3. Recommended action"""
+
+    return explanation_prompt
@@ -2,10 +2,30 @@
 
 from django.urls import path
 
-from agents.views import AlertInsightAPIView
+from agents.views import (
+    AlertInsightAPIView,
+    AlertInsightMetricsAPIView,
+    IncidentInsightAPIView,
+    stream_alert_insight,
+)
 
 urlpatterns = [
     path(
         "get-ai-explanation/", AlertInsightAPIView.as_view(), name="get-ai-explanation"
     ),
+    path(
+        "get-ai-explanation/stream/",
+        stream_alert_insight,
+        name="get-ai-explanation-stream",
+    ),
+    path(
+        "get-ai-explanation/incident/",
+        IncidentInsightAPIView.as_view(),
+        name="get-ai-explanation-incident",
+    ),
+    path(
+        "get-ai-explanation/metrics/",
+        AlertInsightMetricsAPIView.as_view(),
+        name="get-ai-explanation-metrics",
+    ),
 ]
@@ -1 +1,6 @@
-from agents.views.alert_insight import AlertInsightAPIView
\ No newline at end of file
+from agents.views.alert_insight import (
+    AlertInsightAPIView,
+    AlertInsightMetricsAPIView,
+)
+from agents.views.alert_insight_stream import stream_alert_insight
+from agents.views.incident_insight import IncidentInsightAPIView
@@ -1,10 +1,11 @@
 # views/alert_insight_view.py
 
 from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from agents.agent import build_insight_agent
+from agents.agent import get_alert_insight, insight_metrics
 from zabbixproxy.functions.alert_functions.get_single_alert import get_single_alerts
 
 
@@ -25,11 +26,13 @@ class AlertInsightAPIView(APIView):
                     status=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 )
 
-            agent = build_insight_agent()
-            result = agent.invoke({"alert": alert_data})
+            insight, stats = get_alert_insight(trigger_id, alert_data)
 
+            headers = {"X-Insight-Cache": stats["cache"]}
+            if "llm_ms" in stats:
+                headers["X-LLM-Ms"] = f"{stats['llm_ms']:.0f}"
             return Response(
-                {"insight": result["explanation"]}, status=status.HTTP_200_OK
+                {"insight": insight}, status=status.HTTP_200_OK, headers=headers
             )
 
         except Exception as e:
@@ -37,3 +40,12 @@ class AlertInsightAPIView(APIView):
             return Response(
                 {"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+
+
+class AlertInsightMetricsAPIView(APIView):
+    """Cache hit rate and LLM latency of the alert insight endpoint"""
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        return Response(insight_metrics(), status=status.HTTP_200_OK)
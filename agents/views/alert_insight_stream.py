@@ -0,0 +1,106 @@
+import logging
+import time
+
+import orjson
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+
+from agents.agent import (
+    explain_messages,
+    get_llm,
+    insight_key,
+    read_cached_insight,
+    store_insight,
+)
+from agents.tools import format_alert_for_insight
+from utils import stream_request_user
+from zabbixproxy.functions.alert_functions.get_single_alert import get_single_alerts
+
+logger = logging.getLogger("django")
+
+
+@require_GET
+async def stream_alert_insight(request):
+    """
+    Stream the AI insight of a trigger token by token as Server-Sent Events
+
+    The insight is generated on the ASGI event loop, so no web worker is held
+    while the LLM answers. Events:
+    - meta: {"cache": "hit" or "miss"}
+    - token: {"text": str}, for every chunk the LLM returns; a cached
+      insight is sent as one token
+    - done: {"ttft_ms", "total_ms"}, time to the first token and in total
+    - error: {"error": str}
+
+    Query Parameters:
+    - triggerid: Trigger to explain
+    - token: JWT, since EventSource cannot send an Authorization header
+    """
+    started = time.perf_counter()
+    if await stream_request_user(request) is None:
+        return JsonResponse(
+            {"detail": "Authentication credentials were not provided."}, status=401
+        )
+
+    trigger_id = request.GET.get("triggerid")
+    if not trigger_id:
+        return JsonResponse({"error": "Missing trigger ID"}, status=400)
+
+    alert_data = await sync_to_async(get_single_alerts)(trigger_id)
+    if "error" in alert_data:
+        return JsonResponse({"error": alert_data["error"]}, status=500)
+
+    response = StreamingHttpResponse(
+        _insight_events(trigger_id, alert_data, started),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    # Keep reverse proxies from buffering the tokens
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+async def _insight_events(trigger_id, alert_data, started):
+    key = await sync_to_async(insight_key)(trigger_id, alert_data)
+    cached = await sync_to_async(read_cached_insight)(key)
+    if cached is not None:
+        yield _event("meta", {"cache": "hit"})
+        yield _event("token", {"text": cached})
+        elapsed = _elapsed_ms(started)
+        yield _event("done", {"ttft_ms": elapsed, "total_ms": elapsed})
+        return
+
+    yield _event("meta", {"cache": "miss"})
+    formatted = format_alert_for_insight.invoke({"alert": alert_data})
+    llm_started = time.perf_counter()
+    ttft_ms = None
+    chunks = []
+    try:
+        async for chunk in get_llm().astream(explain_messages(formatted)):
+            if not chunk.content:
+                continue
+            if ttft_ms is None:
+                ttft_ms = _elapsed_ms(started)
+            chunks.append(chunk.content)
+            yield _event("token", {"text": chunk.content})
+    except Exception as e:
+        logger.error(f"Streaming insight for trigger {trigger_id} failed: {e}")
+        yield _event("error", {"error": str(e)})
+        return
+
+    llm_ms = _elapsed_ms(llm_started)
+    await sync_to_async(store_insight)(key, "".join(chunks), llm_ms, ttft_ms)
+    logger.info(
+        f"Streamed insight for trigger {trigger_id}: first token after {ttft_ms} ms, "
+        f"LLM done after {llm_ms:.0f} ms"
+    )
+    yield _event("done", {"ttft_ms": ttft_ms, "total_ms": _elapsed_ms(started)})
+
+
+def _elapsed_ms(started):
+    return round((time.perf_counter() - started) * 1000, 1)
+
+
+def _event(event_type, data):
+    return f"event: {event_type}\ndata: {orjson.dumps(data).decode()}\n\n"
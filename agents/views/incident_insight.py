@@ -0,0 +1,75 @@
+import logging
+
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from agents.agent import get_incident_insight
+from utils import ServiceErrorHandler
+from zabbixproxy.functions.alert_functions import (
+    correlate_alerts,
+    get_active_problems,
+)
+
+logger = logging.getLogger("django")
+
+
+class IncidentInsightAPIView(APIView):
+    """
+    Explain an incident of the caller's organization with one LLM call.
+
+    Body: {"incident_id": id from alerts/incidents/}. The incident is looked
+    up in the organization's current incidents, so its alerts are those the
+    feed shows. Insights are cached per incident fingerprint.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        incident_id = str(request.data.get("incident_id") or "")
+        if not incident_id:
+            return Response(
+                {"error": "Missing incident ID"}, status=status.HTTP_400_BAD_REQUEST
+            )
+        organization = getattr(request.user, "organization", None)
+        if organization is None:
+            return Response(
+                {"error": "User is not part of an organization"},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        try:
+            problems = get_active_problems(organization)["problems"]
+        except ServiceErrorHandler as e:
+            return Response({"error": str(e)}, status=status.HTTP_502_BAD_GATEWAY)
+
+        incident = next(
+            (i for i in correlate_alerts(problems) if i["id"] == incident_id), None
+        )
+        if incident is None:
+            return Response(
+                {"error": "Incident not found or no longer active"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        try:
+            insight, stats = get_incident_insight(incident)
+        except Exception as e:
+            logger.error(f"Insight for incident {incident_id} failed: {e}")
+            return Response(
+                {"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+        headers = {"X-Insight-Cache": stats["cache"]}
+        if "llm_ms" in stats:
+            headers["X-LLM-Ms"] = f"{stats['llm_ms']:.0f}"
+        return Response(
+            {
+                "incident_id": incident_id,
+                "alerts": len(incident["alerts"]),
+                "insight": insight,
+            },
+            status=status.HTTP_200_OK,
+            headers=headers,
+        )
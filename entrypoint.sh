@@ -4,4 +4,4 @@ echo "Applying database migrations..."
 python manage.py migrate
 
 echo "Starting server..."
-python manage.py runserver 0.0.0.0:8000
\ No newline at end of file
+exec uvicorn monipro.asgi:application --host 0.0.0.0 --port 8000 --lifespan off --timeout-graceful-shutdown 10
\ No newline at end of file
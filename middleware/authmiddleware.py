@@ -1,4 +1,5 @@
 import jwt
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.http import JsonResponse
@@ -10,8 +11,15 @@ User = get_user_model()
 
 
 class JWTAuthenticationMiddleware:
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            # Let Django call __call__ without wrapping it in sync_to_async
+            markcoroutinefunction(self)
         jwt_settings = getattr(settings, "JWT_AUTH", {})
         self.excluded_url_names = jwt_settings.get("EXCLUDED_URL_NAMES", [])
         self.excluded_paths = jwt_settings.get("EXCLUDED_PATHS", [])
@@ -24,13 +32,56 @@ class JWTAuthenticationMiddleware:
         )
 
     def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        response, refresh = self._check_tokens(request)
+        if response is not None:
+            return response
+
+        new_access_token = None
+        if refresh is not None:
+            try:
+                User.objects.get(id=refresh.payload.get("user_id"))
+                new_access_token = self._renew_access_token(request, refresh)
+            except Exception:
+                return self._invalid_refresh_token()
+
+        response = self.get_response(request)
+        return self._set_access_cookie(response, new_access_token)
+
+    async def __acall__(self, request):
+        """Async `__call__`, so ASGI requests to async views stay on the event loop"""
+        response, refresh = self._check_tokens(request)
+        if response is not None:
+            return response
+
+        new_access_token = None
+        if refresh is not None:
+            try:
+                await User.objects.aget(id=refresh.payload.get("user_id"))
+                new_access_token = self._renew_access_token(request, refresh)
+            except Exception:
+                return self._invalid_refresh_token()
+
+        response = await self.get_response(request)
+        return self._set_access_cookie(response, new_access_token)
+
+    def _check_tokens(self, request):
+        """
+        Check the CSRF token and the access token cookie of `request`
+
+        Returns:
+            tuple: (error response or None, RefreshToken to renew an expired
+                access token from, or None)
+        """
         # Skip authentication if URL is excluded by name or exact path.
         if request.path in self.excluded_paths or (
             hasattr(request, "resolver_match")
             and request.resolver_match
             and request.resolver_match.url_name in self.excluded_url_names
         ):
-            return self.get_response(request)
+            return None, None
 
         # CSRF check for non-safe HTTP methods
         if request.method not in ("GET", "HEAD", "OPTIONS", "TRACE"):
@@ -42,17 +93,19 @@ class JWTAuthenticationMiddleware:
                 or not request.META.get("CSRF_COOKIE")
                 or csrf_token != request.META.get("CSRF_COOKIE")
             ):
-                return JsonResponse(
-                    {
-                        "status": "error",
-                        "message": "CSRF verification failed. Request aborted.",
-                    },
-                    status=status.HTTP_401_UNAUTHORIZED,
+                return (
+                    JsonResponse(
+                        {
+                            "status": "error",
+                            "message": "CSRF verification failed. Request aborted.",
+                        },
+                        status=status.HTTP_401_UNAUTHORIZED,
+                    ),
+                    None,
                 )
 
         access_token = request.COOKIES.get(self.access_token_name)
         refresh_token = request.COOKIES.get(self.refresh_token_name)
-        new_access_token = None
 
         if access_token:
             try:
@@ -60,40 +113,48 @@ class JWTAuthenticationMiddleware:
                 jwt.decode(access_token, settings.SECRET_KEY, algorithms=["HS256"])
                 request.META["HTTP_AUTHORIZATION"] = f"Bearer {access_token}"
             except ExpiredSignatureError:
-                if refresh_token:
-                    try:
-                        # Validate refresh token and generate new access token
-                        refresh = RefreshToken(refresh_token)
-                        user_id = refresh.payload.get("user_id")
-                        user = User.objects.get(id=user_id)
-                        new_access_token = str(refresh.access_token)
-                        request.META["HTTP_AUTHORIZATION"] = (
-                            f"Bearer {new_access_token}"
-                        )
-                    except Exception:
-                        return JsonResponse(
-                            {"status": "error", "message": "Invalid refresh token"},
+                if not refresh_token:
+                    return (
+                        JsonResponse(
+                            {
+                                "status": "error",
+                                "messgae": "Access token expired and no refresh token provided",
+                            },
                             status=status.HTTP_401_UNAUTHORIZED,
-                        )
-                else:
-                    return JsonResponse(
+                        ),
+                        None,
+                    )
+                try:
+                    # Validate refresh token; the caller checks its user
+                    return None, RefreshToken(refresh_token)
+                except Exception:
+                    return self._invalid_refresh_token(), None
+            except Exception:
+                return (
+                    JsonResponse(
                         {
                             "status": "error",
-                            "messgae": "Access token expired and no refresh token provided",
+                            "message": "Invalid authentication credentials",
                         },
                         status=status.HTTP_401_UNAUTHORIZED,
-                    )
-            except Exception:
-                return JsonResponse(
-                    {
-                        "status": "error",
-                        "message": "Invalid authentication credentials",
-                    },
-                    status=status.HTTP_401_UNAUTHORIZED,
+                    ),
+                    None,
                 )
+        return None, None
 
-        response = self.get_response(request)
+    def _renew_access_token(self, request, refresh):
+        """Authenticate `request` with a new access token generated from `refresh`"""
+        new_access_token = str(refresh.access_token)
+        request.META["HTTP_AUTHORIZATION"] = f"Bearer {new_access_token}"
+        return new_access_token
+
+    def _invalid_refresh_token(self):
+        return JsonResponse(
+            {"status": "error", "message": "Invalid refresh token"},
+            status=status.HTTP_401_UNAUTHORIZED,
+        )
 
+    def _set_access_cookie(self, response, new_access_token):
         # Update access token if refreshed
         if new_access_token:
             cookie_settings = settings.JWT_AUTH.get("COOKIE_SETTINGS", {})
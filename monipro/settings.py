@@ -18,6 +18,103 @@ ZABBIX_ADMIN_USER = os.getenv("ZABBIX_ADMIN_USER", "Admin")
 ZABBIX_ADMIN_PASSWORD = os.getenv("ZABBIX_ADMIN_PASSWORD", "zabbix")
 ZABBIX_DEFAULT_PASSWORD = os.getenv("ZABBIX_DEFAULT_PASSWORD", "nochangeatall")
 
+# Shared Zabbix API client (connection pool per worker process)
+ZABBIX_POOL_SIZE = int(os.getenv("ZABBIX_POOL_SIZE", "20"))
+ZABBIX_CONNECT_TIMEOUT = float(os.getenv("ZABBIX_CONNECT_TIMEOUT", "5"))
+ZABBIX_READ_TIMEOUT = float(os.getenv("ZABBIX_READ_TIMEOUT", "15"))
+ZABBIX_MAX_RETRIES = int(os.getenv("ZABBIX_MAX_RETRIES", "3"))
+ZABBIX_RETRY_BACKOFF = float(os.getenv("ZABBIX_RETRY_BACKOFF", "0.5"))
+ZABBIX_VERIFY_SSL = os.getenv("ZABBIX_VERIFY_SSL", "True").lower() == "true"
+# Upstream calls one async (ASGI) request may have in flight at once
+ZABBIX_ASYNC_CONCURRENCY = int(os.getenv("ZABBIX_ASYNC_CONCURRENCY", "8"))
+
+# Cached Zabbix admin session (see zabbixproxy.services.zabbix_auth)
+ZABBIX_TOKEN_TTL = int(os.getenv("ZABBIX_TOKEN_TTL", "900"))
+ZABBIX_TOKEN_REFRESH_MARGIN = int(os.getenv("ZABBIX_TOKEN_REFRESH_MARGIN", "60"))
+ZABBIX_TOKEN_LOCK_TIMEOUT = int(os.getenv("ZABBIX_TOKEN_LOCK_TIMEOUT", "30"))
+
+# Batched history.get for the visualization endpoints
+ZABBIX_HISTORY_BATCH_SIZE = int(os.getenv("ZABBIX_HISTORY_BATCH_SIZE", "50"))
+ZABBIX_HISTORY_CONCURRENCY = int(os.getenv("ZABBIX_HISTORY_CONCURRENCY", "4"))
+# Ranges longer than this are served from hourly trends, except for the last
+# ZABBIX_TREND_RAW_HOURS which always come from raw history
+ZABBIX_TREND_THRESHOLD_HOURS = int(os.getenv("ZABBIX_TREND_THRESHOLD_HOURS", "72"))
+ZABBIX_TREND_RAW_HOURS = int(os.getenv("ZABBIX_TREND_RAW_HOURS", "2"))
+
+# Streaming history export: time window and page size of each history.get,
+# and the longest range one export may cover
+ZABBIX_EXPORT_WINDOW_SECONDS = int(os.getenv("ZABBIX_EXPORT_WINDOW_SECONDS", "21600"))
+ZABBIX_EXPORT_PAGE_SIZE = int(os.getenv("ZABBIX_EXPORT_PAGE_SIZE", "10000"))
+ZABBIX_EXPORT_MAX_DAYS = int(os.getenv("ZABBIX_EXPORT_MAX_DAYS", "31"))
+
+# Local mirror of numeric history for active hosts (HistoryChunk rows)
+HISTORY_MIRROR_ENABLED = os.getenv("HISTORY_MIRROR_ENABLED", "True").lower() == "true"
+HISTORY_MIRROR_SYNC_SECONDS = int(os.getenv("HISTORY_MIRROR_SYNC_SECONDS", "60"))
+HISTORY_MIRROR_CHUNK_SECONDS = int(os.getenv("HISTORY_MIRROR_CHUNK_SECONDS", "3600"))
+# History copied for an item when it starts being mirrored
+HISTORY_MIRROR_BACKFILL_HOURS = int(os.getenv("HISTORY_MIRROR_BACKFILL_HOURS", "24"))
+# History is only mirrored up to this long ago, so rows that proxies and
+# buffering agents deliver late have landed first; newer rows are read from
+# Zabbix. Rows stored later than this are never mirrored.
+HISTORY_MIRROR_SYNC_DELAY_SECONDS = int(
+    os.getenv("HISTORY_MIRROR_SYNC_DELAY_SECONDS", "900")
+)
+# Mirrored items whose sync is this much further behind than the delay
+# are read from Zabbix again
+HISTORY_MIRROR_MAX_LAG_SECONDS = int(os.getenv("HISTORY_MIRROR_MAX_LAG_SECONDS", "300"))
+# Bulk host onboarding and deletion: hosts per request, and hosts per
+# array-valued host.create / host.delete call (one Celery task per chunk)
+BULK_HOST_MAX_ROWS = int(os.getenv("BULK_HOST_MAX_ROWS", "1000"))
+ZABBIX_HOST_CREATE_CHUNK_SIZE = int(os.getenv("ZABBIX_HOST_CREATE_CHUNK_SIZE", "50"))
+ZABBIX_HOST_DELETE_CHUNK_SIZE = int(os.getenv("ZABBIX_HOST_DELETE_CHUNK_SIZE", "100"))
+# Same value as the {$MONIPRO_HISTORY_DAYS} macro of the monitoring templates
+MONIPRO_HISTORY_DAYS = int(os.getenv("MONIPRO_HISTORY_DAYS", "7"))
+
+# Org-scoped alert feed: upstream problem/event queries are cached per
+# organization (and cursor) for this long
+ALERT_FEED_CACHE_SECONDS = int(os.getenv("ALERT_FEED_CACHE_SECONDS", "10"))
+ALERT_FEED_PAGE_SIZE = int(os.getenv("ALERT_FEED_PAGE_SIZE", "100"))
+ALERT_FEED_MAX_PAGE_SIZE = int(os.getenv("ALERT_FEED_MAX_PAGE_SIZE", "500"))
+# Alerts on one host, or sharing a value of one of these tags, that happen
+# within the window of each other are grouped into one incident
+ALERT_CORRELATION_WINDOW_SECONDS = int(
+    os.getenv("ALERT_CORRELATION_WINDOW_SECONDS", "300")
+)
+ALERT_CORRELATION_TAGS = [
+    tag.strip()
+    for tag in os.getenv("ALERT_CORRELATION_TAGS", "service,application").split(",")
+    if tag.strip()
+]
+
+# AI alert insights: cached per alert fingerprint, and how long concurrent
+# requests for one fingerprint wait for the LLM call in flight
+INSIGHT_CACHE_TTL_SECONDS = int(os.getenv("INSIGHT_CACHE_TTL_SECONDS", "900"))
+INSIGHT_LOCK_SECONDS = int(os.getenv("INSIGHT_LOCK_SECONDS", "120"))
+# "openai" or "fake": a local stand-in that streams a canned insight with
+# INSIGHT_FAKE_LLM_DELAY seconds between characters, for offline testing
+INSIGHT_LLM_BACKEND = os.getenv("INSIGHT_LLM_BACKEND", "openai")
+INSIGHT_FAKE_LLM_DELAY = float(os.getenv("INSIGHT_FAKE_LLM_DELAY", "0.01"))
+
+# Redis snapshot cache for host visualizations (stale-while-revalidate)
+VISUALIZATION_SNAPSHOT_BUCKET_SECONDS = int(
+    os.getenv("VISUALIZATION_SNAPSHOT_BUCKET_SECONDS", "60")
+)
+VISUALIZATION_SNAPSHOT_MAX_STALE_SECONDS = int(
+    os.getenv("VISUALIZATION_SNAPSHOT_MAX_STALE_SECONDS", "300")
+)
+VISUALIZATION_SNAPSHOT_KEEP_SECONDS = int(
+    os.getenv("VISUALIZATION_SNAPSHOT_KEEP_SECONDS", "86400")
+)
+VISUALIZATION_SNAPSHOT_LOCK_SECONDS = int(
+    os.getenv("VISUALIZATION_SNAPSHOT_LOCK_SECONDS", "120")
+)
+# Snapshots with items whose Zabbix call failed are only cached this long
+VISUALIZATION_SNAPSHOT_PARTIAL_SECONDS = int(
+    os.getenv("VISUALIZATION_SNAPSHOT_PARTIAL_SECONDS", "10")
+)
+# Item signatures whose visualization suggestion and category are memoized
+VISUALIZATION_RULE_CACHE_SIZE = int(os.getenv("VISUALIZATION_RULE_CACHE_SIZE", "4096"))
+
 
 # ALLOWED_HOSTS = os.environ.get("DJANGO_ALLOWED_HOSTS", "").split(",")
 # CORS_ALLOWED_ORIGINS = os.environ.get("CORS_ALLOWED_ORIGINS", "").split(",")
@@ -46,7 +143,12 @@ CORS_ALLOWED_ORIGINS = [
 
 # Update CORS and CSRF settings
 CORS_ALLOW_CREDENTIALS = True
-CORS_EXPOSE_HEADERS = ["Content-Type", "X-CSRFToken"]
+CORS_EXPOSE_HEADERS = [
+    "Content-Type",
+    "X-CSRFToken",
+    "X-Upstream-Calls",
+    "X-Downsample-Ms",
+]
 CSRF_COOKIE_SAMESITE = "Lax"
 CSRF_COOKIE_HTTPONLY = False  # Allow JavaScript to read the CSRF token
 CSRF_COOKIE_SECURE = False  # Set to True in production with HTTPS
@@ -55,7 +157,12 @@ CORS_ALLOW_ALL_ORIGINS = False  # Add this line
 CORS_ORIGIN_ALLOW_ALL = False  # Add this line
 
 # Add these settings
-CORS_EXPOSE_HEADERS = ["Content-Type", "X-CSRFToken"]
+CORS_EXPOSE_HEADERS = [
+    "Content-Type",
+    "X-CSRFToken",
+    "X-Upstream-Calls",
+    "X-Downsample-Ms",
+]
 CORS_PREFLIGHT_MAX_AGE = 86400
 CORS_ALLOW_METHODS = [
     "DELETE",
@@ -418,12 +525,78 @@ ZABBIX_PLAYBOOK_PATH = os.path.join(
     "ansibal_playbooks",
     "zabbix-playbook.yml",
 )
+# Fleet agent deployment: hosts worked on in parallel by one Ansible run,
+# SSH pipelining (needs sudo without requiretty on the targets) and how long
+# SSH connections are kept open for reuse
+ANSIBLE_FORKS = int(os.getenv("ANSIBLE_FORKS", "25"))
+ANSIBLE_PIPELINING = os.getenv("ANSIBLE_PIPELINING", "True").lower() == "true"
+ANSIBLE_CONTROL_PERSIST_SECONDS = int(
+    os.getenv("ANSIBLE_CONTROL_PERSIST_SECONDS", "60")
+)
+# Tasks listed per host in Ansible results (all are counted), and how often
+# deployment progress is written to the TaskStatus
+ANSIBLE_RESULT_MAX_TASKS = int(os.getenv("ANSIBLE_RESULT_MAX_TASKS", "50"))
+ANSIBLE_PROGRESS_INTERVAL_SECONDS = float(
+    os.getenv("ANSIBLE_PROGRESS_INTERVAL_SECONDS", "1")
+)
+# Agent config written by zabbix-playbook.yml, and the preflight probe that
+# skips or narrows the playbook on hosts already running this agent version
+ZABBIX_AGENT_SERVER = os.getenv("ZABBIX_AGENT_SERVER", "zx.brothersit.dev")
+ZABBIX_AGENT_VERSION = os.getenv("ZABBIX_AGENT_VERSION", "7.2")
+ZABBIX_AGENT_REFRESH_ACTIVE_CHECKS = int(
+    os.getenv("ZABBIX_AGENT_REFRESH_ACTIVE_CHECKS", "120")
+)
+AGENT_PREFLIGHT_ENABLED = os.getenv("AGENT_PREFLIGHT_ENABLED", "True").lower() == "true"
+AGENT_PREFLIGHT_TIMEOUT_SECONDS = int(
+    os.getenv("AGENT_PREFLIGHT_TIMEOUT_SECONDS", "10")
+)
+# Local cache of the agent .deb pushed to targets by the playbook (see the
+# cache_agent_packages command); without a cached package targets install
+# from ZABBIX_AGENT_REPO_URL themselves
+ZABBIX_AGENT_CACHE_ENABLED = (
+    os.getenv("ZABBIX_AGENT_CACHE_ENABLED", "True").lower() == "true"
+)
+ZABBIX_AGENT_CACHE_DIR = os.getenv(
+    "ZABBIX_AGENT_CACHE_DIR", os.path.join(BASE_DIR, "agent_packages")
+)
+ZABBIX_AGENT_REPO_URL = os.getenv(
+    "ZABBIX_AGENT_REPO_URL", "https://repo.zabbix.com/zabbix/7.2/release/ubuntu"
+)
+ZABBIX_AGENT_DIST = os.getenv("ZABBIX_AGENT_DIST", "noble")
+ZABBIX_AGENT_ARCH = os.getenv("ZABBIX_AGENT_ARCH", "amd64")
+ZABBIX_UPGRADE_PLAYBOOK_PATH = os.path.join(
+    BASE_DIR,
+    "zabbixproxy",
+    "functions",
+    "automation_functions",
+    "ansibal_playbooks",
+    "zabbix-upgrade-playbook.yml",
+)
+# Rolling agent upgrades: hosts per batch (a count or a percentage like
+# "20%"), and the share of failed hosts in a batch that stops the upgrade
+AGENT_UPGRADE_SERIAL = os.getenv("AGENT_UPGRADE_SERIAL", "10")
+AGENT_UPGRADE_MAX_FAIL_PERCENTAGE = int(
+    os.getenv("AGENT_UPGRADE_MAX_FAIL_PERCENTAGE", "10")
+)
+# One upgrade runs per organization. The running upgrade renews its lock on
+# every progress update; the lock of a worker that died expires after this
+AGENT_UPGRADE_LOCK_SECONDS = int(os.getenv("AGENT_UPGRADE_LOCK_SECONDS", "900"))
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "monipro.settings")
 # Update Redis connection settings to use the service name instead of localhost
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://redis:6379/0")
 CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", "redis://redis:6379/0")
 
+# Shared Redis for caches, locks and token storage
+REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/1")
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", "2"))
+
+# Server-Sent Events: events kept per organization for Last-Event-ID resume,
+# how long an idle stream key lives, and the keep-alive interval
+EVENT_STREAM_MAXLEN = int(os.getenv("EVENT_STREAM_MAXLEN", "1000"))
+EVENT_STREAM_TTL_SECONDS = int(os.getenv("EVENT_STREAM_TTL_SECONDS", "86400"))
+EVENT_STREAM_HEARTBEAT_SECONDS = int(os.getenv("EVENT_STREAM_HEARTBEAT_SECONDS", "15"))
+
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 
 # Additional Celery settings
@@ -431,6 +604,16 @@ CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = TIME_ZONE
+CELERY_BEAT_SCHEDULE = {
+    "sync-history-mirror": {
+        "task": "zabbixproxy.tasks.history_mirror.history_mirror.sync_history_mirror_task",
+        "schedule": HISTORY_MIRROR_SYNC_SECONDS,
+    },
+    "prune-history-mirror": {
+        "task": "zabbixproxy.tasks.history_mirror.history_mirror.prune_history_mirror_task",
+        "schedule": 3600,
+    },
+}
 
 
 MEDIA_URL = "/media/"
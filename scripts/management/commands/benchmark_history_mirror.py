@@ -0,0 +1,65 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from zabbixproxy.functions.history_mirror_functions import mirrored_items
+from zabbixproxy.functions.visualization_functions import get_items_for_host
+from zabbixproxy.functions.visualization_functions.build_host_visualizations import (
+    _chartable_items,
+)
+from zabbixproxy.functions.visualization_functions.get_series_for_items import (
+    get_series_for_items,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Time chart history reads of a host from the local history mirror "
+        "against reading them from the Zabbix API"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hostid", required=True, help="Zabbix host ID")
+        parser.add_argument(
+            "--hours", type=int, default=24, help="Length of the time range"
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=5, help="Number of timed runs per mode"
+        )
+
+    def handle(self, *args, **options):
+        _, items = _chartable_items(get_items_for_host(options["hostid"]))
+        if not items:
+            self.stdout.write(self.style.WARNING("No numeric items on this host"))
+            return
+
+        time_till = int(time.time())
+        time_from = time_till - options["hours"] * 3600
+        served = len(mirrored_items([item["itemid"] for item in items], time_from))
+        self.stdout.write(
+            f"{len(items)} numeric items, {served} served from the local mirror"
+        )
+
+        results = {}
+        for label, enabled in (("zabbix api", False), ("mirror", True)):
+            with override_settings(HISTORY_MIRROR_ENABLED=enabled):
+                timings = []
+                for _ in range(options["repeat"]):
+                    started = time.perf_counter()
+                    _, calls, _ = get_series_for_items(
+                        items, limit=None, time_from=time_from, time_till=time_till
+                    )
+                    timings.append((time.perf_counter() - started) * 1000)
+            results[label] = statistics.mean(timings)
+            self.stdout.write(
+                f"{label:>10}: mean {results[label]:.1f} ms, "
+                f"p50 {statistics.median(timings):.1f} ms, {calls} API calls"
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ Speedup: {results['zabbix api'] / results['mirror']:.1f}x"
+            )
+        )
@@ -0,0 +1,63 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from scripts.functions.item_and_trigger_functions.data import (
+    active_agent_items_params,
+    icmp_items_params,
+)
+from zabbixproxy.functions.visualization_functions import (
+    clear_rule_caches,
+    match_category,
+    match_visualization_rule,
+    suggest_visualization_for_item,
+)
+from zabbixproxy.functions.visualization_functions.build_host_visualizations import (
+    _determine_category,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Time visualization suggestion and categorisation over the monitoring "
+        "template items, with a cold and a warm rule cache"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--hosts",
+            type=int,
+            default=1000,
+            help="Number of hosts to simulate, each carrying every template item",
+        )
+
+    def handle(self, *args, **options):
+        hosts = options["hosts"]
+        items = active_agent_items_params + icmp_items_params
+
+        clear_rule_caches()
+        cold = self._classify(items, hosts, clear_each_host=True)
+        clear_rule_caches()
+        warm = self._classify(items, hosts, clear_each_host=False)
+
+        classified = len(items) * hosts
+        for label, seconds in (("cold cache", cold), ("memoized", warm)):
+            self.stdout.write(
+                f"{label:>10}: {classified} items in {seconds * 1000:.1f} ms "
+                f"({seconds / classified * 1e6:.2f} µs/item)"
+            )
+        self.stdout.write(
+            f"rule cache: {match_visualization_rule.cache_info()}, "
+            f"category cache: {match_category.cache_info()}"
+        )
+        self.stdout.write(self.style.SUCCESS(f"✅ Speedup: {cold / warm:.1f}x"))
+
+    def _classify(self, items, hosts, clear_each_host):
+        started = time.perf_counter()
+        for _ in range(hosts):
+            if clear_each_host:
+                clear_rule_caches()
+            for item in items:
+                suggest_visualization_for_item(item)
+                _determine_category(item)
+        return time.perf_counter() - started
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from utils import ServiceErrorHandler
+from zabbixproxy.functions.automation_functions import (
+    cache_agent_package,
+    cached_agent_package,
+    import_agent_package,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Cache the Zabbix agent .deb that agent deployments push to their "
+        "targets, from the Zabbix repository or from a local file"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--import",
+            dest="import_path",
+            help="Add this .deb instead of downloading it, for offline networks",
+        )
+        parser.add_argument("--sha256", help="Expected checksum of the imported .deb")
+
+    def handle(self, *args, **options):
+        try:
+            if options["import_path"]:
+                entry = import_agent_package(
+                    options["import_path"], sha256=options["sha256"]
+                )
+            else:
+                entry = cache_agent_package()
+        except ServiceErrorHandler as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Cached zabbix-agent {entry['version']} "
+                f"({entry['size']} bytes, sha256 {entry['sha256']})"
+            )
+        )
+        if not entry["verified"]:
+            self.stdout.write(
+                self.style.WARNING("No checksum was given, the package is unverified")
+            )
+        self.stdout.write(f"Deployments install {cached_agent_package()}")
@@ -0,0 +1,89 @@
+import asyncio
+import statistics
+import time
+
+import httpx
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "Load test proxy endpoints with many concurrent clients, e.g. the sync "
+        "and async variants of the same endpoint against one worker"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "paths",
+            nargs="+",
+            help="Paths to test in turn, e.g. /api/host-items/?hostids=10655",
+        )
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+        parser.add_argument(
+            "--concurrency", type=int, default=100, help="Simultaneous clients"
+        )
+        parser.add_argument(
+            "--requests", type=int, default=1000, help="Requests per path"
+        )
+        parser.add_argument("--token", help="JWT sent as a Bearer token")
+        parser.add_argument("--timeout", type=float, default=60)
+
+    def handle(self, *args, **options):
+        for path in options["paths"]:
+            result = asyncio.run(self._run(path, options))
+            self._report(path, result)
+
+    async def _run(self, path, options):
+        headers = {"Accept-Encoding": "gzip"}
+        if options["token"]:
+            headers["Authorization"] = f"Bearer {options['token']}"
+
+        latencies = []
+        statuses = {}
+        remaining = iter(range(options["requests"]))
+        limits = httpx.Limits(max_connections=options["concurrency"])
+
+        async with httpx.AsyncClient(
+            base_url=options["base_url"],
+            headers=headers,
+            limits=limits,
+            timeout=options["timeout"],
+        ) as client:
+
+            async def worker():
+                for _ in remaining:
+                    started = time.perf_counter()
+                    try:
+                        response = await client.get(path)
+                        status = response.status_code
+                    except httpx.HTTPError as e:
+                        status = type(e).__name__
+                    latencies.append(time.perf_counter() - started)
+                    statuses[status] = statuses.get(status, 0) + 1
+
+            started = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(options["concurrency"])))
+            elapsed = time.perf_counter() - started
+
+        return {"elapsed": elapsed, "latencies": latencies, "statuses": statuses}
+
+    def _report(self, path, result):
+        latencies = sorted(result["latencies"])
+        if not latencies:
+            self.stdout.write(self.style.WARNING(f"⚠ No requests sent to {path}"))
+            return
+
+        def percentile(p):
+            return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+        self.stdout.write(self.style.SUCCESS(f"✅ {path}"))
+        self.stdout.write(
+            f"  {len(latencies)} requests in {result['elapsed']:.2f} s "
+            f"({len(latencies) / result['elapsed']:.1f} req/s)"
+        )
+        self.stdout.write(
+            f"  latency ms: mean {statistics.mean(latencies) * 1000:.1f}, "
+            f"p50 {percentile(0.5):.1f}, p95 {percentile(0.95):.1f}, "
+            f"p99 {percentile(0.99):.1f}"
+        )
+        self.stdout.write(f"  statuses: {result['statuses']}")
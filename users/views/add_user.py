@@ -9,9 +9,10 @@ from rest_framework.views import APIView
 
 from users.serializers import AddUserSerializer
 from utils import ServiceErrorHandler, generate_password, send_team_user_creation_email
-from zabbixproxy.functions.credentials_functions import create_user, zabbix_login
+from zabbixproxy.functions.credentials_functions import create_user
 from zabbixproxy.models import ZabbixUserGroup
 from zabbixproxy.serializers import ZabbixUserSerializer
+from zabbixproxy.services import get_zabbix_auth_token
 
 django_logger = logging.getLogger("django")
 zabbix_logger = logging.getLogger("zabbix")
@@ -19,17 +20,13 @@ zabbix_logger = logging.getLogger("zabbix")
 
 class AddUserView(APIView):
     api_url = settings.ZABBIX_API_URL
-    username = settings.ZABBIX_ADMIN_USER
-    password = settings.ZABBIX_ADMIN_PASSWORD
     default_password = settings.ZABBIX_DEFAULT_PASSWORD
 
     permission_classes = [IsAuthenticated]
 
     def get_zabbix_auth_token(self):
         try:
-            return zabbix_login(
-                api_url=self.api_url, username=self.username, password=self.password
-            )
+            return get_zabbix_auth_token()
         except ServiceErrorHandler as e:
             raise ServiceErrorHandler(f"{str(e)}")
 
@@ -1,6 +1,15 @@
+from utils.compressed_response import (
+    accepted_encodings,
+    compress_for_request,
+    compressed_json_response,
+    gzip_stream,
+)
 from utils.error_handler import ServiceErrorHandler
+from utils.event_stream import event_channel, event_stream_key, publish_event
 from utils.otp_send_email import send_otp_via_email
 from utils.password_reset_email import password_reset_email
 from utils.random_password import generate_password
+from utils.redis_client import get_redis
 from utils.single_sms import send_single_sms
+from utils.stream_auth import stream_request_user
 from utils.team_user_email import send_team_user_creation_email
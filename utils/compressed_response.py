@@ -0,0 +1,83 @@
+import gzip
+import zlib
+
+import orjson
+import zstandard
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+
+# Below this size compression costs more than it saves on the wire
+MIN_COMPRESS_BYTES = 1024
+
+
+def accepted_encodings(request):
+    """Return the content codings the client accepts (q > 0), lowercased."""
+    accepted = set()
+    for part in request.headers.get("Accept-Encoding", "").split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        quality = params.strip()
+        if quality.startswith("q="):
+            try:
+                if float(quality[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+def compress_for_request(request, body):
+    """
+    Compress `body` with the best coding the client accepts
+
+    zstd is preferred over gzip; small bodies are sent as they are.
+
+    Returns:
+        tuple: (bytes, Content-Encoding value or None)
+    """
+    if len(body) < MIN_COMPRESS_BYTES:
+        return body, None
+    accepted = accepted_encodings(request)
+    if "zstd" in accepted:
+        return zstandard.ZstdCompressor(level=3).compress(body), "zstd"
+    if "gzip" in accepted:
+        return gzip.compress(body, compresslevel=6), "gzip"
+    return body, None
+
+
+def compressed_json_response(request, data, status=200, headers=None):
+    """
+    Render `data` with orjson and compress it according to Accept-Encoding.
+    """
+    body, encoding = compress_for_request(
+        request, orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    )
+    response = HttpResponse(body, status=status, content_type="application/json")
+    for name, value in (headers or {}).items():
+        response[name] = value
+    if encoding:
+        response["Content-Encoding"] = encoding
+    patch_vary_headers(response, ["Accept-Encoding"])
+    return response
+
+
+def gzip_stream(chunks, level=6):
+    """
+    Gzip an iterable of byte chunks on the fly, for streaming responses.
+
+    Every chunk is sync-flushed so the client can decode what it has received
+    so far; closing the returned generator closes `chunks` as well.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    try:
+        for chunk in chunks:
+            data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            if data:
+                yield data
+        yield compressor.flush()
+    finally:
+        close = getattr(chunks, "close", None)
+        if close:
+            close()
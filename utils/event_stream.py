@@ -0,0 +1,57 @@
+import logging
+
+import orjson
+import redis
+from django.conf import settings
+
+from utils.redis_client import get_redis
+
+logger = logging.getLogger("django")
+
+EVENT_PREFIX = "monipro:events"
+
+
+def event_stream_key(organization_id):
+    """Redis stream holding the recent events of an organization"""
+    return f"{EVENT_PREFIX}:{organization_id}"
+
+
+def event_channel(organization_id):
+    """Redis pub/sub channel live events of an organization are sent on"""
+    return f"{EVENT_PREFIX}:{organization_id}:live"
+
+
+def publish_event(organization_id, event_type, data):
+    """
+    Publish an event to the connected clients of an organization
+
+    The event is appended to the organization's Redis stream (the last
+    EVENT_STREAM_MAXLEN events are kept, so clients can resume from a
+    Last-Event-ID) and then published on its channel with the stream ID.
+    Publishing is best effort: a Redis failure is logged, never raised.
+
+    Returns:
+        str: Stream ID of the event, or None when it was not published
+    """
+    if organization_id is None:
+        return None
+
+    key = event_stream_key(organization_id)
+    body = orjson.dumps(data)
+    try:
+        conn = get_redis()
+        event_id = conn.xadd(
+            key,
+            {"type": event_type, "data": body},
+            maxlen=settings.EVENT_STREAM_MAXLEN,
+            approximate=True,
+        ).decode()
+        conn.expire(key, settings.EVENT_STREAM_TTL_SECONDS)
+        conn.publish(
+            event_channel(organization_id),
+            orjson.dumps({"id": event_id, "type": event_type, "data": data}),
+        )
+    except redis.RedisError as e:
+        logger.warning(f"Could not publish {event_type} event: {e}")
+        return None
+    return event_id
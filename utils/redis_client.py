@@ -0,0 +1,21 @@
+import redis
+from django.conf import settings
+
+_redis = None
+
+
+def get_redis():
+    """
+    Return the process-wide Redis client used for shared caches and locks.
+
+    redis-py keeps its own connection pool, so a single client per process
+    is enough for both Django workers and Celery tasks.
+    """
+    global _redis
+    if _redis is None:
+        _redis = redis.Redis.from_url(
+            settings.REDIS_URL,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        )
+    return _redis
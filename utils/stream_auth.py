@@ -0,0 +1,22 @@
+from asgiref.sync import sync_to_async
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+
+async def stream_request_user(request):
+    """
+    User of the JWT of an async streaming request, or None
+
+    EventSource cannot send an Authorization header, so the token may also
+    be passed as ?token=.
+    """
+    authentication = JWTAuthentication()
+    try:
+        if request.GET.get("token"):
+            token = authentication.get_validated_token(request.GET["token"])
+            return await sync_to_async(authentication.get_user)(token)
+        result = await sync_to_async(authentication.authenticate)(request)
+    except (AuthenticationFailed, InvalidToken, TokenError):
+        return None
+    return result[0] if result else None
@@ -1,6 +1,8 @@
 from django.contrib import admin
 
 from .models import (
+    HistoryChunk,
+    HistoryMirrorItem,
     Host,
     HostCredentials,
     HostLifecycle,
@@ -24,3 +26,5 @@ admin.site.register(HostLifecycle)
 admin.site.register(TemplateGroupMirror)
 admin.site.register(TemplateMirror)
 admin.site.register(ZabbixAuthToken)
+admin.site.register(HistoryMirrorItem)
+admin.site.register(HistoryChunk)
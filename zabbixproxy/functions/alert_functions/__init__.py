@@ -1,2 +1,16 @@
-from zabbixproxy.functions.alert_functions.get_alert import get_zabbix_alerts
+from zabbixproxy.functions.alert_functions.alert_feed import (
+    format_event,
+    get_active_problems,
+    get_alert_changes,
+)
+from zabbixproxy.functions.alert_functions.correlate_alerts import correlate_alerts
+from zabbixproxy.functions.alert_functions.get_alert import (
+    ALERT_PARAMS,
+    alert_params,
+    get_zabbix_alerts,
+    group_alerts_by_host,
+)
 from zabbixproxy.functions.alert_functions.get_single_alert import get_single_alerts
+from zabbixproxy.functions.alert_functions.organization_hosts import (
+    organization_host_ids,
+)
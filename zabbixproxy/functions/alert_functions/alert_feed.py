@@ -0,0 +1,216 @@
+import logging
+import time
+
+import orjson
+import redis
+from django.conf import settings
+
+from utils import get_redis
+from zabbixproxy.services import get_zabbix_client
+
+from .get_alert import map_severity
+from .organization_hosts import organization_host_ids
+
+logger = logging.getLogger("zabbix")
+
+ALERT_FEED_PREFIX = "monipro:alerts"
+
+# Trigger events only (source 0 = trigger, object 0 = trigger)
+TRIGGER_EVENTS = {"source": 0, "object": 0}
+
+
+def get_active_problems(organization):
+    """
+    Active problems of an organization's hosts, shared by all of its users
+
+    The problem set is cached in Redis for ALERT_FEED_CACHE_SECONDS, and only
+    one request per organization rebuilds it when it expires; the others wait
+    for it and read the new copy.
+
+    Returns:
+        dict: {"cursor": newest eventid of the hosts, "built_at": int,
+            "problems": alerts newest first}
+    """
+    host_ids = organization_host_ids(organization)
+    if not host_ids:
+        return {"cursor": 0, "built_at": int(time.time()), "problems": []}
+
+    key = f"{ALERT_FEED_PREFIX}:{organization.pk}:problems"
+    return _cached(key, lambda: _load_active_problems(host_ids))
+
+
+def get_alert_changes(organization, cursor, limit):
+    """
+    Trigger events of an organization's hosts after the eventid `cursor`
+
+    Users of one organization polling with the same cursor share one cached
+    event.get call.
+
+    Returns:
+        dict: {"events": at most `limit` alerts oldest first, "cursor": eventid
+            to poll from next, "has_more": bool}
+    """
+    host_ids = organization_host_ids(organization)
+    if not host_ids:
+        return {"events": [], "cursor": cursor, "has_more": False}
+
+    key = f"{ALERT_FEED_PREFIX}:{organization.pk}:changes:{cursor}:{limit}"
+    return _cached(key, lambda: _load_alert_changes(host_ids, cursor, limit))
+
+
+def format_event(event, status=None):
+    """Alert record of a Zabbix problem or event row"""
+    host = (event.get("hosts") or [{}])[0]
+    if status is None:
+        status = "problem" if event.get("value") == "1" else "resolved"
+    return {
+        "id": event["eventid"],
+        "triggerid": event.get("objectid"),
+        "name": event.get("name", ""),
+        "severity": map_severity(int(event.get("severity", 0))),
+        "host": host.get("host", "N/A"),
+        "hostid": host.get("hostid"),
+        "status": status,
+        "acknowledged": event.get("acknowledged") == "1",
+        "timestamp": int(event.get("clock", 0)),
+        "tags": event.get("tags", []),
+    }
+
+
+def _load_active_problems(host_ids):
+    client = get_zabbix_client()
+    # Read the cursor first: events after it are then never missed, at worst
+    # a problem is in the set and also sent again as a change
+    newest = client.call_with_auth(
+        "event.get",
+        {
+            **TRIGGER_EVENTS,
+            "output": ["eventid"],
+            "hostids": host_ids,
+            "sortfield": ["eventid"],
+            "sortorder": "DESC",
+            "limit": 1,
+        },
+    )
+    problems = (
+        client.call_with_auth(
+            "problem.get",
+            {
+                **TRIGGER_EVENTS,
+                "output": [
+                    "eventid",
+                    "objectid",
+                    "name",
+                    "severity",
+                    "clock",
+                    "acknowledged",
+                ],
+                "hostids": host_ids,
+                "selectTags": ["tag", "value"],
+                "sortfield": ["eventid"],
+                "sortorder": "DESC",
+            },
+        )
+        or []
+    )
+
+    # problem.get has no selectHosts, so take the hosts from the events
+    hosts = {}
+    if problems:
+        events = client.call_with_auth(
+            "event.get",
+            {
+                "eventids": [problem["eventid"] for problem in problems],
+                "output": ["eventid"],
+                "selectHosts": ["hostid", "host"],
+            },
+        )
+        hosts = {event["eventid"]: event.get("hosts") for event in events or []}
+
+    return {
+        "cursor": int(newest[0]["eventid"]) if newest else 0,
+        "built_at": int(time.time()),
+        "problems": [
+            format_event({**problem, "hosts": hosts.get(problem["eventid"])}, "problem")
+            for problem in problems
+        ],
+    }
+
+
+def _load_alert_changes(host_ids, cursor, limit):
+    events = (
+        get_zabbix_client().call_with_auth(
+            "event.get",
+            {
+                **TRIGGER_EVENTS,
+                "output": [
+                    "eventid",
+                    "objectid",
+                    "name",
+                    "severity",
+                    "clock",
+                    "value",
+                    "acknowledged",
+                ],
+                "hostids": host_ids,
+                "eventid_from": str(cursor + 1),
+                "selectHosts": ["hostid", "host"],
+                "selectTags": ["tag", "value"],
+                "sortfield": ["eventid"],
+                "sortorder": "ASC",
+                # One extra row tells whether another page follows
+                "limit": limit + 1,
+            },
+        )
+        or []
+    )
+    page = events[:limit]
+    return {
+        "events": [format_event(event) for event in page],
+        "cursor": int(page[-1]["eventid"]) if page else cursor,
+        "has_more": len(events) > limit,
+    }
+
+
+def _cached(key, load):
+    """
+    Read `key` from Redis, or build it with `load` under a per-key lock so
+    concurrent misses cause one upstream query
+    """
+    ttl = settings.ALERT_FEED_CACHE_SECONDS
+    try:
+        conn = get_redis()
+        cached = conn.get(key)
+        if cached:
+            return orjson.loads(cached)
+        lock = conn.lock(f"{key}:lock", timeout=30, blocking_timeout=10)
+        acquired = lock.acquire()
+    except redis.RedisError as e:
+        logger.warning(f"Alert feed cache unavailable: {e}")
+        return load()
+
+    try:
+        if acquired:
+            # The holder we waited on has usually filled the cache
+            cached = _read(conn, key)
+            if cached:
+                return orjson.loads(cached)
+        value = load()
+        try:
+            conn.set(key, orjson.dumps(value), ex=ttl)
+        except redis.RedisError as e:
+            logger.warning(f"Could not cache alert feed: {e}")
+        return value
+    finally:
+        if acquired:
+            try:
+                lock.release()
+            except redis.RedisError:
+                pass
+
+
+def _read(conn, key):
+    try:
+        return conn.get(key)
+    except redis.RedisError:
+        return None
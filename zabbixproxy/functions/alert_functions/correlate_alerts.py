@@ -0,0 +1,102 @@
+from django.conf import settings
+
+SEVERITY_ORDER = [
+    "Unknown",
+    "Unclassified",
+    "Information",
+    "Warning",
+    "Average",
+    "High",
+    "Disaster",
+]
+
+
+def correlate_alerts(alerts, window=None, tags=None):
+    """
+    Group alerts of the alert feed into incidents
+
+    Alerts are walked oldest first. An alert joins an open incident when it
+    is on one of the incident's hosts, or carries one of its correlation tag
+    values (ALERT_CORRELATION_TAGS, e.g. a shared service), and happened at
+    most `window` seconds (ALERT_CORRELATION_WINDOW_SECONDS) after the
+    incident's last alert. An alert linking several open incidents merges
+    them. A host going down (ICMP loss, agent unavailable, failing service
+    checks) so becomes one incident instead of one alert per trigger.
+
+    Args:
+        alerts (list): Alerts as built by `format_event`
+        window (int, optional): Correlation window in seconds
+        tags (list, optional): Tag names that link alerts across hosts
+
+    Returns:
+        list: Incidents, newest first. Each has id (eventid of its first
+            alert), status, severity, hosts, started, last_seen and its
+            alerts oldest first.
+    """
+    window = window if window is not None else settings.ALERT_CORRELATION_WINDOW_SECONDS
+    tags = set(tags if tags is not None else settings.ALERT_CORRELATION_TAGS)
+
+    incidents = []
+    open_incidents = []
+    for alert in sorted(alerts, key=lambda a: (a["timestamp"], int(a["id"]))):
+        keys = _correlation_keys(alert, tags)
+        open_incidents = [
+            incident
+            for incident in open_incidents
+            if alert["timestamp"] - incident["last_seen"] <= window
+        ]
+        linked = [incident for incident in open_incidents if incident["keys"] & keys]
+
+        if not linked:
+            incident = {"keys": set(), "alerts": [], "last_seen": alert["timestamp"]}
+            incidents.append(incident)
+            open_incidents.append(incident)
+        else:
+            incident = linked[0]
+            for other in linked[1:]:
+                incident["keys"] |= other["keys"]
+                incident["alerts"].extend(other["alerts"])
+                incident["last_seen"] = max(incident["last_seen"], other["last_seen"])
+                incidents.remove(other)
+                open_incidents.remove(other)
+
+        incident["keys"] |= keys
+        incident["alerts"].append(alert)
+        incident["last_seen"] = max(incident["last_seen"], alert["timestamp"])
+
+    return sorted(
+        (_summarize(incident) for incident in incidents),
+        key=lambda incident: incident["last_seen"],
+        reverse=True,
+    )
+
+
+def _correlation_keys(alert, tags):
+    keys = {("host", alert.get("hostid") or alert.get("host"))}
+    keys.update(
+        ("tag", tag["tag"], tag["value"])
+        for tag in alert.get("tags", [])
+        if tag.get("tag") in tags
+    )
+    return keys
+
+
+def _summarize(incident):
+    alerts = sorted(incident["alerts"], key=lambda a: (a["timestamp"], int(a["id"])))
+    return {
+        "id": alerts[0]["id"],
+        "status": (
+            "problem"
+            if any(alert["status"] == "problem" for alert in alerts)
+            else "resolved"
+        ),
+        "severity": max((alert["severity"] for alert in alerts), key=_severity_rank),
+        "hosts": sorted({alert["host"] for alert in alerts}),
+        "started": alerts[0]["timestamp"],
+        "last_seen": incident["last_seen"],
+        "alerts": alerts,
+    }
+
+
+def _severity_rank(severity):
+    return SEVERITY_ORDER.index(severity) if severity in SEVERITY_ORDER else 0
@@ -1,55 +1,58 @@
-import requests
 from django.http import JsonResponse
-from django.views.decorators.http import require_GET
-
-
-@require_GET
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+
+from utils import ServiceErrorHandler
+from zabbixproxy.services import ZabbixAPIError, get_zabbix_client
+
+from .organization_hosts import organization_host_ids
+
+ALERT_PARAMS = {
+    "output": [
+        "triggerid",
+        "description",
+        "lastchange",
+        "priority",
+        "status",
+        "value",
+        "comments",
+        "event_name",
+        "tags",
+    ],
+    "selectHosts": ["hostid", "host"],
+    "sortfield": "lastchange",
+    "sortorder": "DESC",
+}
+
+
+def alert_params(host_ids):
+    """ALERT_PARAMS limited to `host_ids`"""
+    return {**ALERT_PARAMS, "hostids": host_ids}
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
 def get_zabbix_alerts(request):
-    host_ids = [10655, 10698, 10663]
-
-    zabbix_api_url = "https://zx.brothersit.dev/api_jsonrpc.php"
-    auth_token = "98822a8062620e621d93240ce8ad0be8"
-
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {auth_token}",
-    }
-
-    payload = {
-        "jsonrpc": "2.0",
-        "method": "trigger.get",
-        "params": {
-            "output": [
-                "triggerid",
-                "description",
-                "lastchange",
-                "priority",
-                "status",
-                "value",
-                "comments",
-                "event_name",
-                "tags",
-            ],
-            "selectHosts": ["hostid", "host"],
-            "hostids": host_ids,
-            "sortfield": "lastchange",
-            "sortorder": "DESC",
-        },
-        "id": 1,
-    }
-
-    response = requests.post(
-        zabbix_api_url, json=payload, headers=headers, verify=False
-    )
-
-    if response.status_code != 200:
+    """Triggers of the caller's organization, grouped by host"""
+    host_ids = organization_host_ids(getattr(request.user, "organization", None))
+    if not host_ids:
+        return JsonResponse({})
+
+    try:
+        alerts = get_zabbix_client().call_with_auth(
+            "trigger.get", alert_params(host_ids)
+        )
+    except ZabbixAPIError as e:
+        return JsonResponse({"error": e.data or str(e)}, status=500)
+    except ServiceErrorHandler:
         return JsonResponse({"error": "Zabbix API request failed"}, status=500)
 
-    data = response.json()
-    if "error" in data:
-        return JsonResponse({"error": data["error"]["data"]}, status=500)
+    return JsonResponse(group_alerts_by_host(alerts), safe=False)
+
 
-    alerts = data.get("result", [])
+def group_alerts_by_host(alerts):
+    """Group triggers by host name into active and inactive alerts"""
+    alerts = alerts or []
 
     # Group alerts by host name
     host_alerts = {}
@@ -77,7 +80,7 @@ def get_zabbix_alerts(request):
             print(f"Error processing alert: {e}")
             continue
 
-    return JsonResponse(host_alerts, safe=False)
+    return host_alerts
 
 
 def map_severity(level):
@@ -1,31 +1,19 @@
-import requests
+from zabbixproxy.services import get_zabbix_client
 
 
 def get_single_alerts(triggerid):
 
-    zabbix_api_url = "https://zx.brothersit.dev/api_jsonrpc.php"
-    auth_token = "98822a8062620e621d93240ce8ad0be8"
-
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {auth_token}",
-    }
-    payload = {
-        "jsonrpc": "2.0",
-        "method": "trigger.get",
-        "params": {
-            "triggerids": triggerid,
-            "output": "extend",
-            "selectHosts": ["hostid", "host"],
-            "selectTags": "extend",
-            "expandDescription": 1
-        },
-        "id": 1
+    params = {
+        "triggerids": triggerid,
+        "output": "extend",
+        "selectHosts": ["hostid", "host"],
+        "selectTags": "extend",
+        "expandDescription": 1
     }
 
     try:
-        response = requests.post(zabbix_api_url, json=payload, headers=headers).json()
-        alert_data = response.get("result", [{}])[0]
+        result = get_zabbix_client().call_with_auth("trigger.get", params)
+        alert_data = (result or [{}])[0]
         
         return {
             "trigger": {
@@ -43,4 +31,3 @@ def get_single_alerts(triggerid):
         
     except Exception as e:
         return {"error": f"error from zabbix{str(e)}" }
-
@@ -0,0 +1,25 @@
+from zabbixproxy.models import Host, ZabbixHost
+
+
+def organization_host_ids(organization):
+    """
+    Zabbix host IDs of an organization, from the `Host` and `ZabbixHost`
+    rows of its host groups
+
+    Returns:
+        list: Sorted host IDs as strings; empty when the organization has no
+            hosts in Zabbix yet
+    """
+    if organization is None:
+        return []
+    host_ids = set(
+        Host.objects.filter(host_group__belongs_to=organization)
+        .exclude(host_id=0)
+        .values_list("host_id", flat=True)
+    )
+    host_ids.update(
+        ZabbixHost.objects.filter(hostgroup__belongs_to=organization).values_list(
+            "hostid", flat=True
+        )
+    )
+    return sorted(str(host_id) for host_id in host_ids)
@@ -1,3 +1,19 @@
+from zabbixproxy.functions.automation_functions.agent_package_cache import (
+    cache_agent_package,
+    cached_agent_package,
+    import_agent_package,
+)
+from zabbixproxy.functions.automation_functions.agent_preflight import (
+    agent_preflight,
+)
+from zabbixproxy.functions.automation_functions.agent_upgrade_lock import (
+    agent_upgrade_lock,
+    extend_agent_upgrade_lock,
+    release_agent_upgrade_lock,
+)
 from zabbixproxy.functions.automation_functions.ansibal_runner import (
     create_zabbix_agent,
+    deploy_zabbix_agents,
+    task_status_progress,
+    upgrade_zabbix_agents,
 )
@@ -0,0 +1,176 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+from functools import lru_cache
+
+import requests
+from django.conf import settings
+from django.utils import timezone
+
+from utils import ServiceErrorHandler
+
+ansible_logger = logging.getLogger("ansibal")
+
+AGENT_PACKAGE = "zabbix-agent"
+MANIFEST = "manifest.json"
+
+
+def cache_agent_package(package=AGENT_PACKAGE):
+    """
+    Download the newest `package` .deb of the Zabbix apt repository
+    (ZABBIX_AGENT_REPO_URL, ZABBIX_AGENT_DIST, ZABBIX_AGENT_ARCH) into the
+    package cache and make it the one deployments use
+
+    The download is checked against the SHA256 of the repository's Packages
+    index before it is stored.
+
+    Returns:
+        dict: The manifest entry of the cached package
+    """
+    stanza = _newest(_packages_index(), package)
+    url = f"{settings.ZABBIX_AGENT_REPO_URL}/{stanza['Filename']}"
+    ansible_logger.info(f"Caching {package} {stanza['Version']} from {url}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, os.path.basename(stanza["Filename"]))
+        try:
+            with requests.get(url, stream=True, timeout=60) as response:
+                response.raise_for_status()
+                with open(path, "wb") as f:
+                    for chunk in response.iter_content(chunk_size=1 << 20):
+                        f.write(chunk)
+        except requests.RequestException as e:
+            raise ServiceErrorHandler(f"Could not download {url}: {e}")
+        return _store(path, package, stanza["Version"], stanza["SHA256"], url)
+
+
+def import_agent_package(path, sha256=None, package=AGENT_PACKAGE):
+    """
+    Add a .deb copied onto this machine to the package cache, for networks
+    without access to the Zabbix repository
+
+    Args:
+        path: The .deb, named <package>_<version>_<arch>.deb
+        sha256 (str, optional): Expected checksum, e.g. from the Packages
+            index of the repository it was taken from
+    """
+    match = re.match(r"^([^_]+)_([^_]+)_[^_]+\.deb$", os.path.basename(path))
+    if not match or match.group(1) != package:
+        raise ServiceErrorHandler(f"{path} is not named {package}_<version>_<arch>.deb")
+    return _store(path, package, match.group(2), sha256, path)
+
+
+def cached_agent_package(package=AGENT_PACKAGE):
+    """
+    Path of the cached `package` .deb deployments should install, or None
+
+    The file is checked against its manifest checksum once per process (and
+    again only if it changes on disk).
+    """
+    entry = _read_manifest().get(package)
+    if not entry:
+        return None
+    path = os.path.join(settings.ZABBIX_AGENT_CACHE_DIR, entry["path"])
+    try:
+        stat = os.stat(path)
+    except OSError:
+        ansible_logger.warning(f"Cached {package} package {path} is missing")
+        return None
+    if not _verified(path, stat.st_mtime_ns, stat.st_size, entry["sha256"]):
+        ansible_logger.error(f"Cached {package} package {path} fails its checksum")
+        return None
+    return path
+
+
+def _store(source, package, version, sha256, origin):
+    checksum = _sha256(source)
+    if sha256 and checksum != sha256.lower():
+        raise ServiceErrorHandler(
+            f"Checksum mismatch for {package} {version}: {checksum} != {sha256}"
+        )
+
+    # Without the epoch ("1:"), which does not belong in a path
+    relative = os.path.join(package, version.split(":")[-1], os.path.basename(source))
+    target = os.path.join(settings.ZABBIX_AGENT_CACHE_DIR, relative)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    shutil.copyfile(source, target)
+
+    entry = {
+        "version": version,
+        "path": relative,
+        "sha256": checksum,
+        "size": os.path.getsize(target),
+        "source": origin,
+        "verified": bool(sha256),
+        "cached_at": timezone.now().isoformat(),
+    }
+    manifest = _read_manifest()
+    manifest[package] = entry
+    manifest_path = os.path.join(settings.ZABBIX_AGENT_CACHE_DIR, MANIFEST)
+    with open(f"{manifest_path}.tmp", "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(f"{manifest_path}.tmp", manifest_path)
+    ansible_logger.info(f"Cached {package} {version} at {target}")
+    return entry
+
+
+def _read_manifest():
+    try:
+        with open(os.path.join(settings.ZABBIX_AGENT_CACHE_DIR, MANIFEST)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+@lru_cache(maxsize=16)
+def _verified(path, mtime_ns, size, sha256):
+    return _sha256(path) == sha256
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _packages_index():
+    base = (
+        f"{settings.ZABBIX_AGENT_REPO_URL}/dists/{settings.ZABBIX_AGENT_DIST}"
+        f"/main/binary-{settings.ZABBIX_AGENT_ARCH}"
+    )
+    try:
+        response = requests.get(f"{base}/Packages.gz", timeout=30)
+        if response.ok:
+            return gzip.decompress(response.content).decode()
+        response = requests.get(f"{base}/Packages", timeout=30)
+        response.raise_for_status()
+        return response.text
+    except (requests.RequestException, OSError) as e:
+        raise ServiceErrorHandler(f"Could not read the package index at {base}: {e}")
+
+
+def _newest(index, package):
+    stanzas = [
+        dict(
+            line.split(": ", 1)
+            for line in block.splitlines()
+            if ": " in line and not line.startswith(" ")
+        )
+        for block in index.split("\n\n")
+    ]
+    candidates = [s for s in stanzas if s.get("Package") == package]
+    if not candidates:
+        raise ServiceErrorHandler(f"{package} is not in the package index")
+    return max(candidates, key=lambda s: _version_key(s["Version"]))
+
+
+def _version_key(version):
+    return [
+        int(part) if part.isdigit() else part for part in re.split(r"(\d+)", version)
+    ]
@@ -0,0 +1,119 @@
+import hashlib
+import logging
+import os
+import re
+import subprocess
+
+from django.conf import settings
+
+ansible_logger = logging.getLogger("ansibal")
+
+# Agent config lines managed by zabbix-playbook.yml
+MANAGED_KEYS = ("Server", "ServerActive", "Hostname", "RefreshActiveChecks")
+
+PROBE_SCRIPT = (
+    'echo "version=$(zabbix_agentd -V 2>/dev/null | head -n 1)"; '
+    'echo "active=$(systemctl is-active zabbix-agent 2>/dev/null)"; '
+    f"echo \"config=$(grep -E '^({'|'.join(MANAGED_KEYS)})=' "
+    '/etc/zabbix/zabbix_agentd.conf 2>/dev/null | sort | sha256sum)"'
+)
+
+VERSION = re.compile(r"(\d+\.\d+)\.\d+")
+
+
+def agent_playbook_vars(hostname):
+    """Playbook variables of the agent config of `hostname`"""
+    return {
+        "zabbix_server": settings.ZABBIX_AGENT_SERVER,
+        "zabbix_hostname": hostname,
+        "zabbix_refresh_active_checks": settings.ZABBIX_AGENT_REFRESH_ACTIVE_CHECKS,
+    }
+
+
+def agent_config_hash(hostname):
+    """sha256 of the managed config lines the playbook writes, sorted"""
+    values = agent_playbook_vars(hostname)
+    lines = sorted(
+        [
+            f"Server={values['zabbix_server']}",
+            f"ServerActive={values['zabbix_server']}",
+            f"Hostname={hostname}",
+            f"RefreshActiveChecks={values['zabbix_refresh_active_checks']}",
+        ]
+    )
+    return hashlib.sha256(("\n".join(lines) + "\n").encode()).hexdigest()
+
+
+def agent_preflight(target_host, username, password, hostname):
+    """
+    Check the Zabbix agent of a host over one SSH connection
+
+    Reads the installed agent version, the service state and a hash of the
+    config lines the playbook manages, and tells how much of the playbook
+    still has to run:
+    - "skip": ZABBIX_AGENT_VERSION is installed, running and configured
+    - "configure": it is installed but stopped or configured differently,
+      only the `configure` tagged tasks are needed
+    - "install": anything else, including a failed probe
+
+    Returns:
+        dict: {"action", "version", "active", "config_ok", "reason"}
+    """
+    if str(username).startswith("-") or str(target_host).startswith("-"):
+        return _result("install", reason="Preflight skipped: invalid user or host")
+    command = [
+        "sshpass",
+        "-e",
+        "ssh",
+        "-o",
+        "StrictHostKeyChecking=no",
+        "-o",
+        f"ConnectTimeout={settings.AGENT_PREFLIGHT_TIMEOUT_SECONDS}",
+        "-o",
+        "NumberOfPasswordPrompts=1",
+        "--",
+        f"{username}@{target_host}",
+        PROBE_SCRIPT,
+    ]
+    try:
+        probe = subprocess.run(
+            command,
+            env={**os.environ, "SSHPASS": password or ""},
+            capture_output=True,
+            text=True,
+            timeout=settings.AGENT_PREFLIGHT_TIMEOUT_SECONDS * 2,
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        return _result("install", reason=f"Preflight probe failed: {e}")
+    if probe.returncode != 0:
+        return _result(
+            "install", reason=f"Preflight probe exited with {probe.returncode}"
+        )
+
+    facts = dict(
+        line.partition("=")[::2] for line in probe.stdout.splitlines() if "=" in line
+    )
+    version_match = VERSION.search(facts.get("version", ""))
+    version = version_match.group(0) if version_match else None
+    active = facts.get("active", "").strip() == "active"
+    config_ok = facts.get("config", "").split(" ")[0] == agent_config_hash(hostname)
+
+    if not version or version_match.group(1) != settings.ZABBIX_AGENT_VERSION:
+        action, reason = "install", f"Installed agent version: {version or 'none'}"
+    elif not active or not config_ok:
+        action = "configure"
+        reason = "Agent is not running" if not active else "Agent config differs"
+    else:
+        action, reason = "skip", f"Agent {version} is running and configured"
+    ansible_logger.info(f"Preflight of {hostname} ({target_host}): {action}, {reason}")
+    return _result(action, version, active, config_ok, reason)
+
+
+def _result(action, version=None, active=False, config_ok=False, reason=""):
+    return {
+        "action": action,
+        "version": version,
+        "active": active,
+        "config_ok": config_ok,
+        "reason": reason,
+    }
@@ -0,0 +1,42 @@
+import logging
+
+import redis
+from django.conf import settings
+
+from utils import get_redis
+
+ansible_logger = logging.getLogger("ansibal")
+
+
+def agent_upgrade_lock(organization_id, token=None):
+    """
+    Redis lock that lets one agent upgrade run per organization
+
+    The view takes it with the id of the upgrade's TaskStatus as token; the
+    upgrade task holds the same token, extends the lock while it runs and
+    releases it when done. The lock of a worker that died expires after
+    AGENT_UPGRADE_LOCK_SECONDS.
+    """
+    lock = get_redis().lock(
+        f"monipro:agent_upgrade:{organization_id}",
+        timeout=settings.AGENT_UPGRADE_LOCK_SECONDS,
+        thread_local=False,
+    )
+    if token is not None:
+        lock.local.token = str(token).encode()
+    return lock
+
+
+def extend_agent_upgrade_lock(lock):
+    """Reset the lock's TTL to AGENT_UPGRADE_LOCK_SECONDS"""
+    try:
+        lock.extend(settings.AGENT_UPGRADE_LOCK_SECONDS, replace_ttl=True)
+    except (redis.RedisError, redis.exceptions.LockError) as e:
+        ansible_logger.warning(f"Could not extend agent upgrade lock {lock.name}: {e}")
+
+
+def release_agent_upgrade_lock(lock):
+    try:
+        lock.release()
+    except (redis.RedisError, redis.exceptions.LockError) as e:
+        ansible_logger.warning(f"Could not release agent upgrade lock {lock.name}: {e}")
@@ -1,14 +1,27 @@
 # ansibal/views/ansibal_runner.py
 import logging
 import tempfile
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 import ansible_runner
 from django.conf import settings
 
 from utils import ServiceErrorHandler
+from zabbixproxy.functions.automation_functions.agent_package_cache import (
+    cached_agent_package,
+)
+from zabbixproxy.functions.automation_functions.agent_preflight import (
+    agent_playbook_vars,
+    agent_preflight,
+)
 
 ansible_logger = logging.getLogger("ansibal")
 
+# Last task of zabbix-upgrade-playbook.yml, a host is upgraded once it passed
+HEALTH_TASK = "HEALTH - Check the agent version"
+
 
 def sanitize_error(error):
     sensitive_terms = ["password", "sudo", "ssh"]
@@ -19,43 +32,136 @@ def sanitize_error(error):
     return error.split("\n")[0][:100]
 
 
-def format_response(runner, target_host):
-    tasks = []
-    errors = []
+class AnsibleResultCollector:
+    """
+    event_handler for `ansible_runner.run` that builds the result of every
+    host (see `response`) while the playbook runs
 
-    for event in runner.events:
-        if event["event"] in ["runner_on_ok", "runner_on_failed"]:
-            task = event["event_data"].get("task", "Unknown Task")
-            result = event["event_data"]["res"]
+    Events are not kept: the handler tells ansible-runner not to write them
+    to disk, and per host only the first `max_tasks` successful and failed
+    tasks are listed (ANSIBLE_RESULT_MAX_TASKS), while the stats count all
+    of them. `on_progress(collector)` is called as tasks finish, at most
+    every `progress_interval` seconds, and once more by `finish`. Hosts that
+    completed `final_task` successfully are collected in `completed`.
+    """
 
-            if event["event"] == "runner_on_ok":
-                tasks.append(
-                    {
-                        "task": task,
-                        "status": "success",
-                        "details": result.get("msg", "Task completed"),
-                    }
-                )
-            else:
-                error_msg = sanitize_error(result.get("msg", "Unknown error"))
-                errors.append({"task": task, "status": "error", "details": error_msg})
+    TASK_EVENTS = ("runner_on_ok", "runner_on_failed", "runner_on_unreachable")
 
-    success = True if len(errors) == 0 else False
+    def __init__(
+        self,
+        hostnames,
+        on_progress=None,
+        progress_interval=None,
+        max_tasks=None,
+        final_task=None,
+    ):
+        self.max_tasks = max_tasks or settings.ANSIBLE_RESULT_MAX_TASKS
+        self.final_task = final_task
+        self.completed = set()
+        self.on_progress = on_progress
+        self.progress_interval = (
+            settings.ANSIBLE_PROGRESS_INTERVAL_SECONDS
+            if progress_interval is None
+            else progress_interval
+        )
+        self.reported_at = 0.0
+        self.results = {
+            hostname: {
+                "host": hostname,
+                "overall_success": True,
+                "successfully_executed_tasks": [],
+                "unsuccessfully_executed_tasks": [],
+                "stats": {"total_tasks": 0, "successful": 0, "failed": 0},
+            }
+            for hostname in hostnames
+        }
+        self.successful = 0
+        self.failed = 0
+        self.recent = deque(maxlen=20)
 
-    return {
-        "host": target_host,
-        "overall_success": success,
-        "successfully_executed_tasks": tasks,
-        "unsuccessfully_executed_tasks": errors,
-        "stats": {
-            "total_tasks": len(tasks) + len(errors),
-            "successful": len(tasks),
-            "failed": len(errors),
-        },
-    }
+    def __call__(self, event, host=None):
+        if event.get("event") not in self.TASK_EVENTS:
+            return False
+        event_data = event["event_data"]
+        result = self.results.get(host or event_data.get("host"))
+        if result is None:
+            return False
+
+        res = event_data.get("res") or {}
+        if event["event"] == "runner_on_ok" or event_data.get("ignore_errors"):
+            details = res.get("msg", "Task completed")
+            ok = True
+        else:
+            details = sanitize_error(res.get("msg", "Unknown error"))
+            ok = False
+        self.record(result["host"], event_data.get("task", "Unknown Task"), ok, details)
+        # Events are consumed here, ansible-runner need not store them
+        return False
+
+    def record(self, hostname, task, ok, details):
+        """Add a finished task of `hostname` to its result"""
+        result = self.results[hostname]
+        entry = {
+            "task": task,
+            "status": "success" if ok else "error",
+            "details": details,
+        }
+        if ok:
+            if task == self.final_task:
+                self.completed.add(hostname)
+            tasks = result["successfully_executed_tasks"]
+            result["stats"]["successful"] += 1
+            self.successful += 1
+        else:
+            tasks = result["unsuccessfully_executed_tasks"]
+            result["stats"]["failed"] += 1
+            result["overall_success"] = False
+            self.failed += 1
+        result["stats"]["total_tasks"] += 1
+        if len(tasks) < self.max_tasks:
+            tasks.append(entry)
+        self.recent.append({"host": hostname, "task": task, "status": entry["status"]})
 
+        if self.on_progress and (
+            time.monotonic() - self.reported_at >= self.progress_interval
+        ):
+            self.reported_at = time.monotonic()
+            self.on_progress(self)
 
-def create_zabbix_agent(port, target_host, username, hostname, password, tags=None):
+    def finish(self):
+        if self.on_progress:
+            self.on_progress(self)
+
+    def response(self, hostname):
+        return self.results[hostname]
+
+    def errors(self, limit=None):
+        """Failed tasks of all hosts, as {"host", "task", "details"}"""
+        errors = [
+            {"host": hostname, "task": error["task"], "details": error["details"]}
+            for hostname, result in self.results.items()
+            for error in result["unsuccessfully_executed_tasks"]
+        ]
+        return errors[: limit or settings.ANSIBLE_RESULT_MAX_TASKS]
+
+
+def create_zabbix_agent(
+    port,
+    target_host,
+    username,
+    hostname,
+    password,
+    tags=None,
+    on_progress=None,
+    preflight=False,
+):
+    """
+    Run zabbix-playbook.yml on one host
+
+    With `preflight`, an "install" run is first checked by `agent_preflight`:
+    it is skipped when the agent is already compliant, or narrowed to the
+    "configure" tag when only its config or service state differ.
+    """
     if port is None and password is None and username is None and target_host is None:
         ansible_logger.error(f"Port, password, or username is missing to {hostname}")
         raise ServiceErrorHandler(
@@ -65,6 +171,15 @@ def create_zabbix_agent(port, target_host, username, hostname, password, tags=No
     ansible_logger.info(
         f"Creating Zabbix agent on {hostname} with {target_host} and port {port}"
     )
+    collector = AnsibleResultCollector([target_host], on_progress)
+    if preflight and tags in (None, "install"):
+        check = agent_preflight(target_host, username, password, hostname)
+        if check["action"] == "skip":
+            collector.record(target_host, "Preflight", True, check["reason"])
+            collector.finish()
+            return collector.response(target_host)
+        tags = "configure" if check["action"] == "configure" else "install"
+
     try:
         with tempfile.NamedTemporaryFile(mode="w+", delete=True) as inv_file:
             inv_content = f"""
@@ -81,13 +196,15 @@ def create_zabbix_agent(port, target_host, username, hostname, password, tags=No
             inv_file.write(inv_content.strip())
             inv_file.flush()
 
-            ansible_logger.info(f"Inventory content:\n{inv_content} ")
-
             # Create the runner configuration
             runner_config = {
                 "playbook": settings.ZABBIX_PLAYBOOK_PATH,
                 "inventory": inv_file.name,
-                "extravars": {"port": port},
+                "extravars": {
+                    "port": port,
+                    **agent_playbook_vars(hostname),
+                    **package_vars(),
+                },
                 "quiet": False,
                 "json_mode": False,
                 "suppress_env_files": True,
@@ -98,13 +215,18 @@ def create_zabbix_agent(port, target_host, username, hostname, password, tags=No
                 runner_config["tags"] = tags
                 ansible_logger.info(f"Running playbook with tags: {tags}")
 
+            runner_config["event_handler"] = collector
             runner = ansible_runner.run(**runner_config)
+            collector.finish()
 
-            ansible_logger.info(f"Ansible run completed with status: {runner.status}")
-            ansible_logger.error(f"Ansible events: {runner.events}")
-            ansible_logger.error(f"Ansible stdout:\n{runner.stdout.read()}")
-
-            formatted = format_response(runner, target_host)
+            formatted = collector.response(target_host)
+            ansible_logger.info(
+                f"Ansible run completed with status: {runner.status}, stats: {formatted['stats']}"
+            )
+            if not formatted["overall_success"]:
+                ansible_logger.warning(
+                    f"Ansible failed tasks on {target_host}: {collector.errors()}"
+                )
             return formatted
 
     except Exception as e:
@@ -112,3 +234,260 @@ def create_zabbix_agent(port, target_host, username, hostname, password, tags=No
             f"An error occurred during deployment to {target_host}: {str(e)}"
         )
         raise ServiceErrorHandler("Internal server error")
+
+
+def package_vars():
+    """
+    Playbook variables pointing the install at the cached agent package, so
+    targets need no access to the Zabbix repository; empty without a cache
+    """
+    path = cached_agent_package() if settings.ZABBIX_AGENT_CACHE_ENABLED else None
+    return {"zabbix_agent_package": path} if path else {}
+
+
+def fleet_inventory(hosts):
+    """
+    One inventory for all `hosts`, each under its Zabbix host name with its
+    own address and credentials
+    """
+    return {
+        "all": {
+            "hosts": {
+                host["hostname"]: {
+                    "ansible_host": host["target_host"],
+                    "ansible_user": host["username"],
+                    "ansible_ssh_pass": host["password"],
+                    "ansible_become_pass": host["password"],
+                    **agent_playbook_vars(host["hostname"]),
+                }
+                for host in hosts
+            },
+            "vars": {
+                "ansible_python_interpreter": "/usr/bin/python3",
+                "ansible_ssh_common_args": "-o StrictHostKeyChecking=no -o ConnectTimeout=30",
+            },
+        }
+    }
+
+
+def deploy_zabbix_agents(
+    hosts, port=10050, tags=None, forks=None, on_progress=None, preflight=False
+):
+    """
+    Deploy the Zabbix agent to many hosts with one ansible-runner run
+
+    All hosts share one inventory, so Ansible bootstraps once and works on
+    ANSIBLE_FORKS hosts in parallel. SSH connections are reused across tasks
+    (ControlPersist) and modules are piped over them (ANSIBLE_PIPELINING),
+    instead of one run with its own connection setup per host.
+
+    With `preflight`, an "install" deployment first probes all hosts in
+    parallel with `agent_preflight`: compliant hosts are skipped and hosts
+    that only need their config or service fixed get a "configure" run.
+
+    Args:
+        hosts (list): {"hostname", "target_host", "username", "password"}
+            per host; hostname must be unique
+        tags (str, optional): Playbook tags to run
+        forks (int, optional): Hosts worked on in parallel
+        on_progress (callable, optional): Called with the
+            `AnsibleResultCollector` as tasks finish
+        preflight (bool, optional): Probe the hosts first
+
+    Returns:
+        dict: `AnsibleResultCollector.response` result per hostname
+    """
+    if not hosts:
+        return {}
+    for host in hosts:
+        if not host.get("target_host") or not host.get("username"):
+            raise ServiceErrorHandler(
+                f"Target host or username is missing to {host.get('hostname')}"
+            )
+
+    forks = forks or settings.ANSIBLE_FORKS
+    collector = AnsibleResultCollector(
+        [host["hostname"] for host in hosts], on_progress
+    )
+    runs = {tags: hosts}
+    if preflight and tags in (None, "install"):
+        with ThreadPoolExecutor(max_workers=forks) as executor:
+            checks = list(
+                executor.map(
+                    lambda host: agent_preflight(
+                        host["target_host"],
+                        host["username"],
+                        host["password"],
+                        host["hostname"],
+                    ),
+                    hosts,
+                )
+            )
+        runs = {"install": [], "configure": []}
+        for host, check in zip(hosts, checks):
+            if check["action"] == "skip":
+                collector.record(host["hostname"], "Preflight", True, check["reason"])
+            else:
+                runs[check["action"]].append(host)
+
+    statuses = []
+    try:
+        for run_tags, run_hosts in runs.items():
+            if run_hosts:
+                statuses.append(
+                    _run_fleet_playbook(run_hosts, port, run_tags, forks, collector)
+                )
+        collector.finish()
+    except Exception as e:
+        ansible_logger.exception(
+            f"An error occurred during deployment to {len(hosts)} hosts: {str(e)}"
+        )
+        raise ServiceErrorHandler("Internal server error")
+
+    return _fleet_results(collector, statuses)
+
+
+def upgrade_zabbix_agents(
+    hosts,
+    port=10050,
+    serial=None,
+    max_fail_percentage=None,
+    forks=None,
+    reconfigure_only=False,
+    on_progress=None,
+):
+    """
+    Upgrade and reconfigure the Zabbix agent of deployed hosts in rolling
+    batches with zabbix-upgrade-playbook.yml
+
+    Hosts are worked on `serial` at a time (a count or a percentage like
+    "20%", AGENT_UPGRADE_SERIAL), `forks` of them in parallel. After each
+    host's upgrade the agent port, service and version are checked; once
+    more than `max_fail_percentage` (AGENT_UPGRADE_MAX_FAIL_PERCENTAGE) of a
+    batch fails, Ansible stops the whole play. A host only counts as
+    upgraded when its last health check passed; hosts stopped before it,
+    and hosts of batches that were not started, are reported as aborted.
+
+    Args:
+        hosts (list): As for `deploy_zabbix_agents`
+        reconfigure_only (bool, optional): Only rewrite the agent config,
+            keep the installed package and skip the version check
+
+    Returns:
+        dict: `AnsibleResultCollector.response` result per hostname, with
+            `aborted` set on the hosts that did not reach the health check
+    """
+    if not hosts:
+        return {}
+    collector = AnsibleResultCollector(
+        [host["hostname"] for host in hosts], on_progress, final_task=HEALTH_TASK
+    )
+    extravars = {
+        "upgrade_serial": serial or settings.AGENT_UPGRADE_SERIAL,
+        "upgrade_max_fail_percentage": (
+            settings.AGENT_UPGRADE_MAX_FAIL_PERCENTAGE
+            if max_fail_percentage is None
+            else max_fail_percentage
+        ),
+        "zabbix_agent_version": settings.ZABBIX_AGENT_VERSION,
+        "check_version": not reconfigure_only,
+    }
+    try:
+        status = _run_fleet_playbook(
+            hosts,
+            port,
+            "configure" if reconfigure_only else None,
+            forks or settings.ANSIBLE_FORKS,
+            collector,
+            playbook=settings.ZABBIX_UPGRADE_PLAYBOOK_PATH,
+            extravars=extravars,
+        )
+        collector.finish()
+    except Exception as e:
+        ansible_logger.exception(
+            f"An error occurred during the upgrade of {len(hosts)} hosts: {str(e)}"
+        )
+        raise ServiceErrorHandler("Internal server error")
+    results = _fleet_results(
+        collector,
+        [status],
+        "Not started, an earlier batch exceeded the failure threshold",
+    )
+    for hostname, result in results.items():
+        result["aborted"] = hostname not in collector.completed and (
+            result["overall_success"] or not result["stats"]["failed"]
+        )
+        if result["aborted"] and result["overall_success"]:
+            result["overall_success"] = False
+            result["unsuccessfully_executed_tasks"].append(
+                {
+                    "task": HEALTH_TASK,
+                    "status": "error",
+                    "details": "Aborted before the health check, the batch "
+                    "exceeded the failure threshold",
+                }
+            )
+    return results
+
+
+def task_status_progress(task_status):
+    """on_progress callback that reports an Ansible run in a TaskStatus"""
+    return lambda collector: task_status.update_status(
+        "in_progress",
+        successfully_executed_tasks=list(collector.recent),
+        unsuccessfully_executed_tasks=collector.errors(),
+        successful_task=collector.successful,
+        faild_task=collector.failed,
+    )
+
+
+def _fleet_results(collector, statuses, missing=None):
+    ansible_logger.info(
+        f"Ansible runs for {len(collector.results)} hosts completed with status: "
+        f"{statuses}, {collector.successful} tasks ok, {collector.failed} failed"
+    )
+    if collector.failed:
+        ansible_logger.warning(f"Ansible failed tasks: {collector.errors()}")
+
+    for result in collector.results.values():
+        if not result["stats"]["total_tasks"]:
+            result["overall_success"] = False
+            result["unsuccessfully_executed_tasks"] = [
+                {
+                    "task": "Ansible run",
+                    "status": "error",
+                    "details": missing
+                    or f"No result, run ended with status {statuses}",
+                }
+            ]
+    return collector.results
+
+
+def _run_fleet_playbook(
+    hosts, port, tags, forks, collector, playbook=None, extravars=None
+):
+    """One ansible-runner run for `hosts`; returns the run's status"""
+    with tempfile.TemporaryDirectory() as private_data_dir:
+        runner_config = {
+            "private_data_dir": private_data_dir,
+            "playbook": playbook or settings.ZABBIX_PLAYBOOK_PATH,
+            "inventory": fleet_inventory(hosts),
+            "extravars": {"port": port, **package_vars(), **(extravars or {})},
+            "forks": forks,
+            "envvars": {
+                "ANSIBLE_PIPELINING": str(settings.ANSIBLE_PIPELINING),
+                "ANSIBLE_SSH_ARGS": (
+                    "-o ControlMaster=auto "
+                    f"-o ControlPersist={settings.ANSIBLE_CONTROL_PERSIST_SECONDS}s"
+                ),
+            },
+            "event_handler": collector,
+            "quiet": True,
+            "suppress_env_files": True,
+        }
+        if tags:
+            runner_config["tags"] = tags
+            ansible_logger.info(
+                f"Running playbook with tags: {tags} on {len(hosts)} hosts"
+            )
+        return ansible_runner.run(**runner_config).status
@@ -1,3 +1,5 @@
 from zabbixproxy.functions.check_reachability_functions.check_reachability import (
     check_reachability,
+    check_reachability_async,
+    validate_reachability_target,
 )
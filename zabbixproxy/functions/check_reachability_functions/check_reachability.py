@@ -1,10 +1,35 @@
+import asyncio
+import ipaddress
 import logging
+import re
 import socket
 
+from asgiref.sync import sync_to_async
 from pythonping import ping
 
 django_logger = logging.getLogger("django")
 
+DOMAIN_REGEX = re.compile(
+    r"^(?!-)[A-Za-z0-9-]{1,63}(?<!-)(\.(?!-)[A-Za-z0-9-]{1,63}(?<!-))*$"
+)
+
+
+def validate_reachability_target(host, is_domain):
+    """
+    Return why `host` cannot be checked, or None when it is a valid target.
+    """
+    if not host:
+        return "Missing 'host' parameter"
+    if is_domain:
+        if not DOMAIN_REGEX.fullmatch(host):
+            return "Invalid domain format"
+    else:
+        try:
+            ipaddress.ip_address(host)
+        except ValueError:
+            return "Invalid IP address format"
+    return None
+
 
 def check_reachability(is_domain: bool, target: str, timeout: int = 5) -> bool:
     """
@@ -34,3 +59,26 @@ def check_reachability(is_domain: bool, target: str, timeout: int = 5) -> bool:
         except Exception as e:
             django_logger.error(f"Failed to ping IP '{target}': {str(e)} ")
             return False
+
+
+async def check_reachability_async(
+    is_domain: bool, target: str, timeout: int = 5
+) -> bool:
+    """
+    Async `check_reachability` for ASGI views.
+
+    Domains are resolved on the event loop; pythonping blocks on a raw
+    socket, so pings run in a worker thread.
+    """
+    if not is_domain:
+        return await sync_to_async(check_reachability, thread_sensitive=False)(
+            is_domain, target, timeout
+        )
+    try:
+        await asyncio.wait_for(
+            asyncio.get_running_loop().getaddrinfo(target, None), timeout
+        )
+        return True
+    except (socket.gaierror, asyncio.TimeoutError) as e:
+        django_logger.error(f"Failed to resolve domain '{target}': {str(e)} ")
+        return False
@@ -1,12 +1,10 @@
 import logging
-import time
-
-import requests
 
 zabbix_logger = logging.getLogger("zabbix")
 django_logger = logging.getLogger("django")
 
 from utils import ServiceErrorHandler
+from zabbixproxy.services import get_zabbix_client
 
 
 def create_user(
@@ -16,8 +14,8 @@ def create_user(
     password,
     roleid,
     usergroup_id,
-    max_retries=3,
-    retry_delay=2,
+    max_retries=None,
+    retry_delay=None,
 ):
     """
     Create a user in Zabbix.
@@ -29,97 +27,35 @@ def create_user(
         password: Password for the new user
         roleid: Role ID for the user (1 for admin, 0 for user)
         usergroup_id: User group ID to assign the user to
-        max_retries: Maximum number of retry attempts
-        retry_delay: Delay between retries in seconds
+        max_retries: Optional override of the client retry count
+        retry_delay: Optional override of the client backoff delay
 
     Returns:
         User ID string
 
     Raises:
-        ServiceErrorHandler: If user creation fails after max_retries
+        ServiceErrorHandler: If user creation fails
     """
-    for attempt in range(max_retries):
-        try:
-            zabbix_logger.info(
-                f"Attempting to create user '{username}' (attempt {attempt + 1}/{max_retries})"
-            )
-
-            response = requests.post(
-                f"{api_url}/api_jsonrpc.php",
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {auth_token}",
-                },
-                json={
-                    "jsonrpc": "2.0",
-                    "method": "user.create",
-                    "params": {
-                        "username": username,
-                        "passwd": password,
-                        "roleid": roleid,
-                        "usrgrps": [{"usrgrpid": usergroup_id}],
-                    },
-                    "id": 1,
-                },
-                timeout=10,  # Add timeout to prevent hanging requests
-            )
-
-            try:
-                response_data_for_log = response.json()
-            except ValueError:
-                zabbix_logger.error("Invalid JSON received from Zabbix.")
-                raise ServiceErrorHandler("Host creation please try again later")
-
-            if "error" in response_data_for_log:
-                error_info = response_data_for_log["error"]
-                error_code = error_info.get("code", "N/A")
-                error_message = error_info.get("message", "No message")
-                error_data = error_info.get("data", "")
-
-                zabbix_logger.error(
-                    f"Zabbix API Error [{error_code}]: {error_message} - {error_data}"
-                )
-
-                raise ServiceErrorHandler(f"{error_message}: {error_data}")
-
-            result = response.json()
-            # Success case
-            userid = result["result"]["userids"][0]
-            zabbix_logger.info(
-                f"User '{username}' created successfully with ID: {userid}"
-            )
-            return userid
-
-        except requests.RequestException as e:
-            zabbix_logger.error(
-                f"Network error during user creation (attempt {attempt + 1}): {str(e)}"
-            )
-        except (ValueError, KeyError) as e:
-            zabbix_logger.error(
-                f"Invalid response from Zabbix API (attempt {attempt + 1}): {str(e)}"
-            )
-        except ServiceErrorHandler as e:
-            # Don't retry if the error is due to invalid auth token
-            if (
-                "not authorized" in str(e).lower()
-                or "session terminated" in str(e).lower()
-            ):
-                zabbix_logger.critical(
-                    "Authentication error during user creation, token may be invalid"
-                )
-                raise
-            zabbix_logger.error(
-                f"Zabbix service error (attempt {attempt + 1}): {str(e)}"
-            )
-        except Exception as e:
-            zabbix_logger.error(
-                f"Unexpected error during user creation (attempt {attempt + 1}): {str(e)}"
-            )
-
-        # Only sleep if we're going to retry
-        if attempt < max_retries - 1:
-            time.sleep(retry_delay)
-
-    # If we get here, all retries failed
-    zabbix_logger.critical(f"User creation failed after {max_retries} attempts")
-    raise ServiceErrorHandler(f"User creation failed after {max_retries} attempts")
+    zabbix_logger.info(f"Attempting to create user '{username}'")
+
+    result = get_zabbix_client(api_url).call_with_auth(
+        "user.create",
+        {
+            "username": username,
+            "passwd": password,
+            "roleid": roleid,
+            "usrgrps": [{"usrgrpid": usergroup_id}],
+        },
+        auth_token=auth_token,
+        max_retries=max_retries,
+        retry_delay=retry_delay,
+    )
+
+    try:
+        userid = result["userids"][0]
+    except (KeyError, IndexError, TypeError) as e:
+        zabbix_logger.error(f"Invalid response from Zabbix API: {str(e)}")
+        raise ServiceErrorHandler("User creation failed please try again later")
+
+    zabbix_logger.info(f"User '{username}' created successfully with ID: {userid}")
+    return userid
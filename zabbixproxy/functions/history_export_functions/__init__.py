@@ -0,0 +1,7 @@
+from zabbixproxy.functions.history_export_functions.export_writers import (
+    EXPORT_FORMATS,
+    write_export,
+)
+from zabbixproxy.functions.history_export_functions.iter_history_pages import (
+    iter_history_pages,
+)
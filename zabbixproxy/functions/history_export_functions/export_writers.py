@@ -0,0 +1,81 @@
+import csv
+import io
+import logging
+
+import orjson
+
+from utils import ServiceErrorHandler
+
+logger = logging.getLogger("zabbix")
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+CSV_COLUMNS = ["itemid", "key", "clock", "ns", "value"]
+
+
+def write_export(pages, items, output):
+    """
+    Encode history pages as NDJSON or CSV, yielding one bytes chunk per page
+
+    Every row is written as itemid, key, clock, ns and value. If a page
+    cannot be fetched the export ends early; NDJSON exports then end with an
+    {"error": ...} line and CSV exports with a "# error: ..." line.
+
+    Args:
+        pages: Iterator of history row lists (see `iter_history_pages`)
+        items (list): The exported items, for their keys
+        output (str): "ndjson" or "csv"
+    """
+    keys = {item["itemid"]: item.get("key_", "") for item in items}
+    rows_written = 0
+    completed = False
+
+    try:
+        if output == "csv":
+            yield _csv_chunk([CSV_COLUMNS])
+
+        try:
+            for page in pages:
+                rows = [
+                    [
+                        row["itemid"],
+                        keys.get(row["itemid"], ""),
+                        row["clock"],
+                        row.get("ns", "0"),
+                        row["value"],
+                    ]
+                    for row in page
+                ]
+                rows_written += len(rows)
+                if output == "csv":
+                    yield _csv_chunk(rows)
+                else:
+                    yield b"".join(
+                        orjson.dumps(dict(zip(CSV_COLUMNS, row))) + b"\n"
+                        for row in rows
+                    )
+        except ServiceErrorHandler as e:
+            logger.error(f"History export stopped after {rows_written} rows: {e}")
+            if output == "csv":
+                message = " ".join(str(e).split())
+                yield f"# error: {message}\r\n".encode()
+            else:
+                yield orjson.dumps({"error": str(e)}) + b"\n"
+            return
+
+        completed = True
+        logger.info(f"History export finished with {rows_written} rows")
+    finally:
+        if not completed:
+            # The client went away (or the export failed): stop paging upstream
+            pages.close()
+            logger.info(f"History export ended early after {rows_written} rows")
+
+
+def _csv_chunk(rows):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode()
@@ -0,0 +1,140 @@
+import logging
+from collections import defaultdict
+
+from django.conf import settings
+
+from zabbixproxy.functions.history_mirror_functions.read_history_mirror import (
+    iter_mirrored_pages,
+    mirrored_items,
+    unsynced_tails,
+)
+from zabbixproxy.functions.visualization_functions.request import send_request
+
+logger = logging.getLogger("zabbix")
+
+
+def iter_history_pages(
+    items, time_from, time_till, window=None, page_size=None, use_mirror=True
+):
+    """
+    Walk the raw history of many items in time order, one page at a time
+
+    The range is cut into windows of ZABBIX_EXPORT_WINDOW_SECONDS and every
+    window is read with ascending history.get calls of at most
+    ZABBIX_EXPORT_PAGE_SIZE rows per value type, so only one page is ever
+    held in memory. A full page continues from its last clock; rows of that
+    second already returned are skipped by (itemid, clock, ns).
+
+    Items the local history mirror covers are read from it instead, window
+    by window, before the items read from Zabbix; their rows after the last
+    sync are read from Zabbix.
+
+    Nothing is fetched ahead: when the consumer stops iterating (e.g. the
+    client of a streaming response disconnected), paging stops with it.
+
+    Args:
+        items (list): Zabbix items with itemid and value_type
+        time_from (int): Start time as Unix timestamp
+        time_till (int): End time as Unix timestamp
+        window (int, optional): Window length in seconds
+        page_size (int, optional): Maximum rows per history.get call
+        use_mirror (bool, optional): Read from the local mirror where it
+            covers the range. Defaults to True.
+
+    Yields:
+        list: History rows (itemid, clock, ns, value), oldest first within a
+            window and value type
+
+    Raises:
+        ServiceErrorHandler: A history.get call failed
+    """
+    window = window or settings.ZABBIX_EXPORT_WINDOW_SECONDS
+    page_size = page_size or settings.ZABBIX_EXPORT_PAGE_SIZE
+
+    mirror = (
+        mirrored_items([item["itemid"] for item in items], time_from)
+        if use_mirror
+        else {}
+    )
+    synced_till = unsynced_tails(mirror.values(), time_till)
+    item_ids = defaultdict(list)
+    tail_ids = defaultdict(list)
+    for item in items:
+        if item["itemid"] not in mirror:
+            item_ids[str(item["value_type"])].append(item["itemid"])
+        elif item["itemid"] in synced_till:
+            tail_ids[str(item["value_type"])].append(item["itemid"])
+    tail_from = min(synced_till.values(), default=time_till) + 1
+
+    for start in range(time_from, time_till + 1, window):
+        end = min(start + window - 1, time_till)
+        if mirror:
+            yield from iter_mirrored_pages(mirror.values(), start, end)
+        if end >= tail_from:
+            for value_type in sorted(tail_ids):
+                for page in _iter_window(
+                    tail_ids[value_type],
+                    value_type,
+                    max(start, tail_from),
+                    end,
+                    page_size,
+                ):
+                    page = [
+                        row
+                        for row in page
+                        if int(row["clock"]) > synced_till[row["itemid"]]
+                    ]
+                    if page:
+                        yield page
+        for value_type in sorted(item_ids):
+            yield from _iter_window(
+                item_ids[value_type], value_type, start, end, page_size
+            )
+
+
+def _iter_window(item_ids, value_type, start, end, page_size):
+    seen = set()
+    page_from = start
+    while True:
+        rows = send_request(
+            "history.get",
+            {
+                "output": ["itemid", "clock", "ns", "value"],
+                "history": value_type,
+                "itemids": item_ids,
+                "time_from": page_from,
+                "time_till": end,
+                "sortfield": "clock",
+                "sortorder": "ASC",
+                "limit": page_size,
+            },
+        )
+        fresh = [
+            row
+            for row in rows
+            if (row["itemid"], row["clock"], row.get("ns")) not in seen
+        ]
+        if fresh:
+            yield fresh
+        if len(rows) < page_size:
+            return
+
+        last_clock = int(rows[-1]["clock"])
+        if not fresh:
+            # A whole page of one second: more rows share it than fit in a
+            # page, so move on rather than ask for the same page again
+            logger.warning(
+                f"More than {page_size} history rows at clock {last_clock}, "
+                "some were skipped"
+            )
+            last_clock += 1
+            if last_clock > end:
+                return
+        if last_clock != page_from:
+            seen = set()
+        seen.update(
+            (row["itemid"], row["clock"], row.get("ns"))
+            for row in rows
+            if int(row["clock"]) == last_clock
+        )
+        page_from = last_clock
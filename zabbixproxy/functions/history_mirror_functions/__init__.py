@@ -0,0 +1,11 @@
+from zabbixproxy.functions.history_mirror_functions.read_history_mirror import (
+    iter_mirrored_pages,
+    merge_tail,
+    mirrored_items,
+    read_mirrored_history,
+    unsynced_tails,
+)
+from zabbixproxy.functions.history_mirror_functions.sync_history_mirror import (
+    prune_history_mirror,
+    sync_history_mirror,
+)
@@ -0,0 +1,148 @@
+import logging
+import time
+from bisect import bisect_left, bisect_right
+
+from django.conf import settings
+from django.db import DatabaseError
+
+from zabbixproxy.models import HistoryChunk, HistoryMirrorItem
+
+logger = logging.getLogger("zabbix")
+
+
+def mirrored_items(item_ids, time_from, now=None):
+    """
+    Mirror entries that can serve history of `item_ids` from `time_from` on
+
+    An item qualifies when its mirror starts at or before `time_from` and is
+    synced to within HISTORY_MIRROR_MAX_LAG_SECONDS of where the sync delay
+    (HISTORY_MIRROR_SYNC_DELAY_SECONDS) lets it be. Nothing qualifies when the
+    mirror is disabled or the database cannot be read.
+
+    Returns:
+        dict: {itemid: HistoryMirrorItem}
+    """
+    if not settings.HISTORY_MIRROR_ENABLED or not item_ids or not time_from:
+        return {}
+
+    fresh_after = (
+        int(now or time.time())
+        - settings.HISTORY_MIRROR_SYNC_DELAY_SECONDS
+        - settings.HISTORY_MIRROR_MAX_LAG_SECONDS
+    )
+    try:
+        return {
+            mirror.itemid: mirror
+            for mirror in HistoryMirrorItem.objects.filter(
+                itemid__in=item_ids,
+                mirrored_from__lte=time_from,
+                synced_till__gte=fresh_after,
+            )
+        }
+    except DatabaseError as e:
+        logger.warning(f"History mirror unavailable, reading from Zabbix: {e}")
+        return {}
+
+
+def read_mirrored_history(items, limit=None, time_from=None, time_till=None):
+    """
+    Serve history from the local mirror where it covers the range
+
+    The mirror only holds an item's history up to its last sync; the rows
+    after it must still be read from Zabbix and joined with `merge_tail`.
+
+    Args:
+        items (list): Zabbix items with itemid
+        limit (int, optional): Keep only the newest `limit` rows per item
+        time_from (int): Start time as Unix timestamp
+        time_till (int, optional): End time as Unix timestamp
+
+    Returns:
+        tuple: ({itemid: history rows oldest first}, items left for Zabbix,
+            {itemid: synced_till} of the mirrored items whose sync ends
+            before `time_till`). Rows have the shape of history.get rows.
+    """
+    mirror = mirrored_items([item["itemid"] for item in items], time_from)
+    if not mirror:
+        return {}, items, {}
+
+    time_till = time_till or int(time.time())
+    history = {}
+    for page in iter_mirrored_pages(mirror.values(), time_from, time_till):
+        history.setdefault(page[0]["itemid"], []).extend(page)
+
+    if limit:
+        history = {itemid: rows[-limit:] for itemid, rows in history.items()}
+    for itemid in mirror:
+        history.setdefault(itemid, [])
+
+    logger.debug(f"Served history of {len(mirror)} items from the local mirror")
+    return (
+        history,
+        [item for item in items if item["itemid"] not in mirror],
+        unsynced_tails(mirror.values(), time_till),
+    )
+
+
+def unsynced_tails(mirror_items, time_till):
+    """{itemid: synced_till} of the items synced before `time_till`"""
+    return {
+        mirror.itemid: mirror.synced_till
+        for mirror in mirror_items
+        if mirror.synced_till < time_till
+    }
+
+
+def merge_tail(history, tail, synced_till, limit=None):
+    """
+    Append the rows read from Zabbix after each item's last sync to its
+    mirrored history
+
+    Args:
+        history (dict): {itemid: mirrored rows oldest first}, updated in place
+        tail (dict): {itemid: history.get rows oldest first}
+        synced_till (dict): {itemid: clock the item's mirror is synced till}
+        limit (int, optional): Keep only the newest `limit` rows per item
+    """
+    for itemid, rows in tail.items():
+        if itemid not in synced_till:
+            continue
+        merged = history.get(itemid, []) + [
+            row for row in rows if int(row["clock"]) > synced_till[itemid]
+        ]
+        history[itemid] = merged[-limit:] if limit else merged
+
+
+def iter_mirrored_pages(mirror_items, time_from, time_till):
+    """
+    Yield the mirrored rows between `time_from` and `time_till`, one list
+    per stored chunk, item by item and oldest first
+    """
+    value_types = {mirror.pk: mirror.value_type for mirror in mirror_items}
+    chunks = (
+        HistoryChunk.objects.filter(
+            item_id__in=value_types,
+            start_clock__lte=time_till,
+            end_clock__gte=time_from,
+        )
+        .order_by("item_id", "start_clock")
+        .values_list("item_id", "item__itemid", "clocks", "ns", "values", "uint_values")
+    )
+    for item_pk, itemid, clocks, ns, values, uint_values in chunks.iterator(
+        chunk_size=200
+    ):
+        first = bisect_left(clocks, time_from)
+        last = bisect_right(clocks, time_till)
+        if first == last:
+            continue
+        if value_types[item_pk] == 3:
+            values = uint_values
+        yield [
+            {
+                "itemid": itemid,
+                "clock": str(clocks[i]),
+                "ns": str(ns[i]),
+                "value": str(values[i]),
+            }
+            for i in range(first, last)
+        ]
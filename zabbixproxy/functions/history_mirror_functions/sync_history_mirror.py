@@ -0,0 +1,236 @@
+import logging
+import time
+from collections import defaultdict
+from decimal import Decimal
+from itertools import groupby
+
+from django.conf import settings
+from django.contrib.postgres.fields import ArrayField
+from django.db import models, transaction
+from django.db.models import F, Func, Value
+from django.db.models.functions import Cast
+
+from zabbixproxy.functions.visualization_functions.request import send_request
+from zabbixproxy.models import HistoryChunk, HistoryMirrorItem, HostLifecycle
+
+logger = logging.getLogger("zabbix")
+
+# HistoryChunk column and array element type per mirrored value type
+VALUE_COLUMNS = {
+    0: ("values", models.FloatField()),
+    3: ("uint_values", models.DecimalField(max_digits=20, decimal_places=0)),
+}
+
+
+def sync_history_mirror(now=None, on_page=None):
+    """
+    Copy new numeric history of active hosts into the local mirror
+
+    Hosts whose HostLifecycle is "active" are mirrored; items of other hosts
+    are dropped from the mirror. New items start with
+    HISTORY_MIRROR_BACKFILL_HOURS of history. Items are then read with paged
+    history.get calls from their last sync up to
+    HISTORY_MIRROR_SYNC_DELAY_SECONDS ago, so rows that proxies and buffering
+    agents deliver late have landed first; rows after an item's last sync
+    are read from Zabbix (see `merge_tail`). Every page is appended to
+    `HistoryChunk` rows together with the items' high-water marks in one
+    transaction, so an interrupted sync resumes where it stopped.
+    `on_page()` is called after every page, e.g. to keep a lock alive.
+
+    Returns:
+        dict: Number of hosts, items and rows synced
+    """
+    # The export imports the mirror's readers, so import it late
+    from zabbixproxy.functions.history_export_functions import iter_history_pages
+
+    now = int(now or time.time())
+    hostids = [
+        str(hostid)
+        for hostid in HostLifecycle.objects.filter(status="active")
+        .exclude(host__host_id=0)
+        .values_list("host__host_id", flat=True)
+        .distinct()
+    ]
+    if not hostids:
+        HistoryMirrorItem.objects.all().delete()
+        return {"hosts": 0, "items": 0, "rows": 0}
+
+    items = send_request(
+        "item.get",
+        {
+            "output": ["itemid", "hostid", "value_type"],
+            "hostids": hostids,
+            "filter": {"status": "0", "value_type": ["0", "3"]},
+        },
+    )
+    mirror = _register_items(items, now)
+
+    rows = 0
+    till = now - settings.HISTORY_MIRROR_SYNC_DELAY_SECONDS
+    by_sync = defaultdict(list)
+    for entry in mirror.values():
+        if entry.synced_till < till:
+            by_sync[entry.synced_till].append(entry)
+    for synced_till, entries in by_sync.items():
+        pages = iter_history_pages(
+            [{"itemid": e.itemid, "value_type": e.value_type} for e in entries],
+            synced_till,
+            till,
+            use_mirror=False,
+        )
+        for page in pages:
+            rows += _append_page(page, mirror)
+            if on_page:
+                on_page()
+        HistoryMirrorItem.objects.filter(pk__in=[e.pk for e in entries]).update(
+            synced_till=till
+        )
+
+    logger.info(
+        f"History mirror synced {rows} rows of {len(mirror)} items on {len(hostids)} hosts"
+    )
+    return {"hosts": len(hostids), "items": len(mirror), "rows": rows}
+
+
+def prune_history_mirror(now=None):
+    """
+    Drop mirrored history older than MONIPRO_HISTORY_DAYS, like Zabbix does
+
+    Returns:
+        int: Number of chunks deleted
+    """
+    cutoff = int(now or time.time()) - settings.MONIPRO_HISTORY_DAYS * 86400
+    deleted, _ = HistoryChunk.objects.filter(end_clock__lt=cutoff).delete()
+    HistoryMirrorItem.objects.filter(mirrored_from__lt=cutoff).update(
+        mirrored_from=cutoff
+    )
+    logger.info(f"History mirror pruned {deleted} chunks older than {cutoff}")
+    return deleted
+
+
+def _register_items(items, now):
+    """
+    Start mirroring new items and forget the ones that went away, including
+    the items of hosts that are no longer active.
+
+    The stored items are diffed against `items` in Python, so no query ever
+    lists every mirrored item ID.
+    """
+    start = now - min(
+        settings.HISTORY_MIRROR_BACKFILL_HOURS * 3600,
+        settings.MONIPRO_HISTORY_DAYS * 86400,
+    )
+    wanted = {item["itemid"] for item in items}
+    mirror = {}
+    stale = []
+    for entry in HistoryMirrorItem.objects.all():
+        if entry.itemid in wanted:
+            mirror[entry.itemid] = entry
+        else:
+            stale.append(entry.pk)
+    if stale:
+        HistoryMirrorItem.objects.filter(pk__in=stale).delete()
+
+    new_items = [item for item in items if item["itemid"] not in mirror]
+    if new_items:
+        HistoryMirrorItem.objects.bulk_create(
+            [
+                HistoryMirrorItem(
+                    itemid=item["itemid"],
+                    hostid=item["hostid"],
+                    value_type=int(item["value_type"]),
+                    mirrored_from=start,
+                    synced_till=start,
+                    last_clock=start,
+                )
+                for item in new_items
+            ],
+            ignore_conflicts=True,
+        )
+        # Read them back for their primary keys; another sync may have
+        # created some of them first
+        mirror.update(
+            (entry.itemid, entry)
+            for entry in HistoryMirrorItem.objects.filter(
+                itemid__in=[item["itemid"] for item in new_items]
+            )
+        )
+    return mirror
+
+
+def _append_page(page, mirror):
+    """
+    Append the rows newer than each item's high-water mark; return their count.
+
+    The marks are read again under a row lock before appending, so a sync
+    running at the same time can never append a row twice.
+    """
+    points = defaultdict(list)
+    for row in page:
+        entry = mirror.get(row["itemid"])
+        clock, ns = int(row["clock"]), int(row.get("ns", 0))
+        if entry is None or (clock, ns) <= (entry.last_clock, entry.last_ns):
+            continue
+        value = Decimal(row["value"]) if entry.value_type == 3 else float(row["value"])
+        points[entry].append((clock, ns, value))
+    if not points:
+        return 0
+
+    chunk_seconds = settings.HISTORY_MIRROR_CHUNK_SECONDS
+    with transaction.atomic():
+        marks = {
+            pk: (last_clock, last_ns)
+            for pk, last_clock, last_ns in HistoryMirrorItem.objects.select_for_update()
+            .filter(pk__in=[entry.pk for entry in points])
+            .values_list("pk", "last_clock", "last_ns")
+        }
+        for entry in list(points):
+            if entry.pk not in marks:
+                del points[entry]
+                continue
+            entry.last_clock, entry.last_ns = marks[entry.pk]
+            points[entry] = [
+                point for point in points[entry] if point[:2] > marks[entry.pk]
+            ]
+            if not points[entry]:
+                del points[entry]
+
+        for entry, item_points in points.items():
+            column, base_field = VALUE_COLUMNS[entry.value_type]
+            item_points.sort()
+            for start, chunk in groupby(
+                item_points, key=lambda point: point[0] - point[0] % chunk_seconds
+            ):
+                clocks, ns, values = (list(column) for column in zip(*chunk))
+                updated = HistoryChunk.objects.filter(
+                    item=entry, start_clock=start
+                ).update(
+                    end_clock=clocks[-1],
+                    clocks=_array_append("clocks", clocks, models.IntegerField()),
+                    ns=_array_append("ns", ns, models.IntegerField()),
+                    **{column: _array_append(column, values, base_field)},
+                )
+                if not updated:
+                    HistoryChunk.objects.create(
+                        item=entry,
+                        start_clock=start,
+                        end_clock=clocks[-1],
+                        clocks=clocks,
+                        ns=ns,
+                        **{column: values},
+                    )
+            entry.last_clock, entry.last_ns = item_points[-1][:2]
+        HistoryMirrorItem.objects.bulk_update(list(points), ["last_clock", "last_ns"])
+    return sum(len(item_points) for item_points in points.values())
+
+
+def _array_append(field, items, base_field):
+    array = ArrayField(base_field)
+    return Func(
+        F(field),
+        # Cast so the literal array has the column's type whatever the driver
+        # infers from the Python values
+        Cast(Value(items, output_field=array), array),
+        function="array_cat",
+        output_field=array,
+    )
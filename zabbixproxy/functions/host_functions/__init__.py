@@ -1,3 +1,16 @@
+from zabbixproxy.functions.host_functions.bulk_host_creation import (
+    bulk_host_creation,
+    host_create_params,
+)
+from zabbixproxy.functions.host_functions.bulk_host_deletion import (
+    bulk_host_deletion,
+    existing_host_ids,
+)
+from zabbixproxy.functions.host_functions.bulk_host_onboarding import (
+    create_local_hosts,
+    parse_host_rows,
+    validate_host_rows,
+)
 from zabbixproxy.functions.host_functions.host_creat import create_host
 from zabbixproxy.functions.host_functions.host_creation import host_creation
 from zabbixproxy.functions.host_functions.host_delete import delete_host
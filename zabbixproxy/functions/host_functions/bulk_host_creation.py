@@ -0,0 +1,65 @@
+import logging
+
+from zabbixproxy.services import ZabbixAPIError, get_zabbix_client
+
+zabbix_logger = logging.getLogger("zabbix")
+
+
+def host_create_params(host_name, hostgroup, template_list, ip, dns, port=10050):
+    """host.create parameters of one host, as built by `host_creation`"""
+    return {
+        "host": host_name,
+        "interfaces": [
+            {
+                "type": 1,
+                "main": 1,
+                "useip": 1 if ip else 0,
+                "ip": ip,
+                "dns": dns,
+                "port": port,
+            }
+        ],
+        "templates": [{"templateid": template} for template in template_list],
+        "groups": [{"groupid": hostgroup}],
+    }
+
+
+def bulk_host_creation(hosts, api_url=None, auth_token=None):
+    """
+    Create many hosts with one array-valued host.create call
+
+    Zabbix creates all hosts of a call or none, so when the call is rejected
+    (e.g. one host already exists in Zabbix) every host is created on its own
+    to tell the good ones from the bad.
+
+    Args:
+        hosts (list): host.create parameters per host, see `host_create_params`
+
+    Returns:
+        list: (hostid, None) or (None, error message) per host, in order
+
+    Raises:
+        ServiceErrorHandler: Zabbix could not be reached
+    """
+    client = get_zabbix_client(api_url)
+    try:
+        result = client.call_with_auth("host.create", hosts, auth_token=auth_token)
+        hostids = result["hostids"]
+        zabbix_logger.info(f"Created {len(hostids)} hosts with one host.create call")
+        return [(hostid, None) for hostid in hostids]
+    except ZabbixAPIError as e:
+        if len(hosts) == 1:
+            return [(None, str(e))]
+        zabbix_logger.warning(
+            f"Bulk host.create of {len(hosts)} hosts rejected, creating them one by one: {e}"
+        )
+
+    results = []
+    for host in hosts:
+        try:
+            result = client.call_with_auth("host.create", host, auth_token=auth_token)
+            results.append((result["hostids"][0], None))
+        except ZabbixAPIError as e:
+            zabbix_logger.error(f"host.create of '{host['host']}' failed: {e}")
+            results.append((None, str(e)))
+    return results
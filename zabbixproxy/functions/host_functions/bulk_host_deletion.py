@@ -0,0 +1,76 @@
+import logging
+
+from utils import ServiceErrorHandler
+from zabbixproxy.services import ZabbixAPIError, get_zabbix_client
+
+zabbix_logger = logging.getLogger("zabbix")
+
+
+def existing_host_ids(host_ids, api_url=None, auth_token=None):
+    """
+    The ones of `host_ids` that exist in Zabbix, checked with one host.get
+
+    Returns:
+        set: Zabbix host IDs as strings
+
+    Raises:
+        ServiceErrorHandler: Zabbix could not be reached or returned an error
+    """
+    if not host_ids:
+        return set()
+    try:
+        result = get_zabbix_client(api_url).call_with_auth(
+            "host.get",
+            {"output": ["hostid"], "hostids": [str(h) for h in host_ids]},
+            auth_token=auth_token,
+        )
+    except ZabbixAPIError:
+        raise ServiceErrorHandler("Zabbix API returned an error")
+    return {str(host["hostid"]) for host in result or []}
+
+
+def bulk_host_deletion(host_ids, api_url=None, auth_token=None):
+    """
+    Delete many hosts with one array-valued host.delete call
+
+    Zabbix deletes all hosts of a call or none, so when the call is rejected
+    every host is deleted on its own to tell the good ones from the bad.
+
+    Returns:
+        dict: None (deleted) or an error message per host ID
+
+    Raises:
+        ServiceErrorHandler: Zabbix could not be reached
+    """
+    host_ids = [str(h) for h in host_ids]
+    client = get_zabbix_client(api_url)
+    try:
+        result = client.call_with_auth("host.delete", host_ids, auth_token=auth_token)
+        deleted = set((result or {}).get("hostids", []))
+        zabbix_logger.info(f"Deleted {len(deleted)} hosts with one host.delete call")
+        return {
+            h: None if h in deleted else "Zabbix did not confirm the deletion"
+            for h in host_ids
+        }
+    except ZabbixAPIError as e:
+        if len(host_ids) == 1:
+            return {host_ids[0]: str(e)}
+        zabbix_logger.warning(
+            f"Bulk host.delete of {len(host_ids)} hosts rejected, deleting them one by one: {e}"
+        )
+
+    results = {}
+    for host_id in host_ids:
+        try:
+            result = client.call_with_auth(
+                "host.delete", [host_id], auth_token=auth_token
+            )
+            results[host_id] = (
+                None
+                if host_id in (result or {}).get("hostids", [])
+                else "Zabbix did not confirm the deletion"
+            )
+        except ZabbixAPIError as e:
+            zabbix_logger.error(f"host.delete of host ID '{host_id}' failed: {e}")
+            results[host_id] = str(e)
+    return results
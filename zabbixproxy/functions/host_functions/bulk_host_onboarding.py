@@ -0,0 +1,196 @@
+import csv
+import io
+import ipaddress
+
+from django.conf import settings
+from django.db import transaction
+
+from utils import ServiceErrorHandler
+from zabbixproxy.models import Host, HostCredentials, HostLifecycle, TemplateMirror
+
+HOST_FIELDS = (
+    "host",
+    "ip",
+    "dns",
+    "device_type",
+    "network_device_type",
+    "templates",
+    "username",
+    "password",
+)
+
+
+def parse_host_rows(data):
+    """
+    Rows of a bulk onboarding request
+
+    Args:
+        data: A list of host dicts (JSON), or CSV text with a header row using
+            the names of HOST_FIELDS. Templates of a CSV row are separated
+            by ";".
+
+    Returns:
+        list: Host dicts with stripped string values
+    """
+    if isinstance(data, str):
+        reader = csv.DictReader(io.StringIO(data.lstrip("\ufeff")))
+        rows = [
+            {
+                **row,
+                "templates": [
+                    t.strip() for t in (row.get("templates") or "").split(";")
+                ],
+            }
+            for row in reader
+        ]
+    elif isinstance(data, list):
+        rows = data
+    else:
+        raise ServiceErrorHandler("hosts must be a list or a CSV file")
+
+    if not rows:
+        raise ServiceErrorHandler("No hosts to onboard")
+    if len(rows) > settings.BULK_HOST_MAX_ROWS:
+        raise ServiceErrorHandler(
+            f"At most {settings.BULK_HOST_MAX_ROWS} hosts can be onboarded at once"
+        )
+
+    parsed = []
+    for row in rows:
+        if not isinstance(row, dict):
+            raise ServiceErrorHandler("Every host must be an object")
+        templates = row.get("templates") or []
+        parsed.append(
+            {
+                **{
+                    field: str(row.get(field) or "").strip()
+                    for field in HOST_FIELDS
+                    if field != "templates"
+                },
+                "templates": [str(t).strip() for t in templates if str(t).strip()],
+            }
+        )
+    return parsed
+
+
+def validate_host_rows(rows, default_templates=None):
+    """
+    Validate all rows with one query for taken host names and one for the
+    templates
+
+    Rows without templates use `default_templates`. A row's monitoring
+    category is the template group of its first template.
+
+    Returns:
+        tuple: (rows with `host_monitoring_category_id` added, errors as
+            [{"row": n, "host": name, "error": message}]), rows numbered
+            from 1
+    """
+    default_templates = [str(t) for t in default_templates or []]
+    for row in rows:
+        row["templates"] = row["templates"] or default_templates
+        row["device_type"] = row["device_type"] or "vm"
+
+    names = [row["host"] for row in rows if row["host"]]
+    taken = set(Host.objects.filter(host__in=names).values_list("host", flat=True))
+    template_groups = dict(
+        TemplateMirror.objects.filter(
+            template_id__in={t for row in rows for t in row["templates"]}
+        ).values_list("template_id", "template_group_id")
+    )
+
+    errors = []
+    seen = {}
+    for number, row in enumerate(rows, start=1):
+        error = _row_error(row, taken, seen, template_groups)
+        if error:
+            errors.append({"row": number, "host": row["host"], "error": error})
+            continue
+        seen[row["host"]] = number
+        if row["ip"]:
+            seen[row["ip"]] = number
+        row["host_monitoring_category_id"] = template_groups[row["templates"][0]]
+    return rows, errors
+
+
+def create_local_hosts(rows, host_group):
+    """
+    Insert the Host, HostCredentials and HostLifecycle rows of validated
+    hosts with one bulk_create each
+
+    Returns:
+        list: HostLifecycle objects, in the order of `rows`
+    """
+    with transaction.atomic():
+        hosts = Host.objects.bulk_create(
+            [
+                Host(
+                    host=row["host"],
+                    ip=row["ip"],
+                    dns=row["dns"],
+                    host_group=host_group,
+                    device_type=row["device_type"],
+                    network_device_type=row["network_device_type"] or None,
+                )
+                for row in rows
+            ]
+        )
+        HostCredentials.objects.bulk_create(
+            [
+                HostCredentials(
+                    host=host, username=row["username"], password=row["password"]
+                )
+                for host, row in zip(hosts, rows)
+                if row["username"] and row["password"]
+            ]
+        )
+        lifecycles = HostLifecycle.objects.bulk_create(
+            [
+                HostLifecycle(
+                    host=host,
+                    host_monitoring_category_id=row["host_monitoring_category_id"],
+                    status="creation_in_progress",
+                    status_message="Bulk host creation queued.",
+                )
+                for host, row in zip(hosts, rows)
+            ]
+        )
+    HostLifecycle.publish_many(lifecycles)
+    return lifecycles
+
+
+def _row_error(row, taken, seen, template_groups):
+    if not row["host"]:
+        return "host is required"
+    if row["host"] in taken:
+        return "Host name is taken please choose another name."
+    if row["host"] in seen:
+        return f"Duplicate host name, also in row {seen[row['host']]}"
+    if not row["ip"] and not row["dns"]:
+        return "ip or dns is required"
+    # ssh would read these as options, e.g. "-oProxyCommand=..."
+    if row["dns"].startswith("-"):
+        return "dns must not start with '-'"
+    if row["username"].startswith("-"):
+        return "username must not start with '-'"
+    if row["ip"]:
+        try:
+            ipaddress.ip_address(row["ip"])
+        except ValueError:
+            return f"Invalid ip {row['ip']}"
+        if row["ip"] in seen:
+            return f"Duplicate ip, also in row {seen[row['ip']]}"
+    if row["device_type"] not in dict(Host.DEVICE_TYPE_CHOICES):
+        return f"Invalid device_type {row['device_type']}"
+    if row["device_type"] == "network" and not row["network_device_type"]:
+        return "network device type required when device_type is 'network'."
+    if row["network_device_type"] and row["network_device_type"] not in dict(
+        Host.NETWORK_DEVICE_TYPE
+    ):
+        return f"Invalid network_device_type {row['network_device_type']}"
+    if not row["templates"]:
+        return "At least one template is required"
+    unknown = [t for t in row["templates"] if t not in template_groups]
+    if unknown:
+        return f"Template not found: {', '.join(unknown)}"
+    return None
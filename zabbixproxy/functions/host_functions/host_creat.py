@@ -1,10 +1,8 @@
 import logging
-import time
-
-import requests
 
 zabbix_logger = logging.getLogger("zabbix")
 from utils import ServiceErrorHandler
+from zabbixproxy.services import get_zabbix_client
 
 
 def create_host(
@@ -16,8 +14,8 @@ def create_host(
     port,
     dns,
     useip,
-    max_retries=3,
-    retry_delay=2,
+    max_retries=None,
+    retry_delay=None,
 ):
     """
     Create a host in Zabbix.
@@ -30,103 +28,43 @@ def create_host(
         ip: IP address of the host
         port: Port number for the host
         dns: DNS name for the host
-        max_retries: Maximum number of retry attempts
-        retry_delay: Delay between retries in seconds
+        max_retries: Optional override of the client retry count
+        retry_delay: Optional override of the client backoff delay
 
     Returns:
         Host ID string
 
     Raises:
-        ServiceErrorHandler: If host creation fails after max_retries
+        ServiceErrorHandler: If host creation fails
     """
-    for attempt in range(max_retries):
-        try:
-            zabbix_logger.info(
-                f"Attempting to create host '{host}' (attempt {attempt + 1}/{max_retries})"
-            )
-
-            response = requests.post(
-                f"{api_url}/api_jsonrpc.php",
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {auth_token}",
-                },
-                json={
-                    "jsonrpc": "2.0",
-                    "method": "host.create",
-                    "params": {
-                        "host": host,
-                        "interfaces": [
-                            {
-                                "type": 1,
-                                "main": 1,
-                                "useip": useip,
-                                "ip": ip,
-                                "dns": dns,
-                                "port": port,
-                            }
-                        ],
-                        "groups": [{"groupid": hostgroup}],
-                    },
-                    "id": 1,
-                },
-                timeout=10,
-            )
-
-            try:
-                response_data_for_log = response.json()
-            except ValueError:
-                zabbix_logger.error("Invalid JSON received from Zabbix.")
-                raise ServiceErrorHandler("Host creation please try again later")
-
-            if "error" in response_data_for_log:
-                error_info = response_data_for_log["error"]
-                error_code = error_info.get("code", "N/A")
-                error_message = error_info.get("message", "No message")
-                error_data = error_info.get("data", "")
-
-                zabbix_logger.error(
-                    f"Zabbix API Error [{error_code}]: {error_message} - {error_data}"
-                )
-
-                raise ServiceErrorHandler(f"{error_message}: {error_data}")
-
-            result = response.json()
-
-            # Success case
-            hostid = result["result"]["hostids"][0]
-            zabbix_logger.info(f"Host '{host}' created successfully with ID: {hostid}")
-            return hostid
-
-        except requests.RequestException as e:
-            zabbix_logger.error(
-                f"Network error during host creation (attempt {attempt + 1}): {str(e)}"
-            )
-        except (ValueError, KeyError) as e:
-            zabbix_logger.error(
-                f"Invalid response from Zabbix API (attempt {attempt + 1}): {str(e)}"
-            )
-        except ServiceErrorHandler as e:
-            if (
-                "not authorized" in str(e).lower()
-                or "session terminated" in str(e).lower()
-            ):
-                zabbix_logger.critical(
-                    "Authentication error during host creation, token may be invalid"
-                )
-                raise
-            zabbix_logger.error(
-                f"Zabbix service error (attempt {attempt + 1}): {str(e)}"
-            )
-        except Exception as e:
-            zabbix_logger.error(
-                f"Unexpected error during host creation (attempt {attempt + 1}): {str(e)}"
-            )
-
-        # Only sleep if we're going to retry
-        if attempt < max_retries - 1:
-            time.sleep(retry_delay)
-
-    # If we get here, all retries failed
-    zabbix_logger.critical(f"Host creation failed after {max_retries} attempts")
-    raise ServiceErrorHandler("Host creation failed please try again later")
+    zabbix_logger.info(f"Attempting to create host '{host}'")
+
+    result = get_zabbix_client(api_url).call_with_auth(
+        "host.create",
+        {
+            "host": host,
+            "interfaces": [
+                {
+                    "type": 1,
+                    "main": 1,
+                    "useip": useip,
+                    "ip": ip,
+                    "dns": dns,
+                    "port": port,
+                }
+            ],
+            "groups": [{"groupid": hostgroup}],
+        },
+        auth_token=auth_token,
+        max_retries=max_retries,
+        retry_delay=retry_delay,
+    )
+
+    try:
+        hostid = result["hostids"][0]
+    except (KeyError, IndexError, TypeError) as e:
+        zabbix_logger.error(f"Invalid response from Zabbix API: {str(e)}")
+        raise ServiceErrorHandler("Host creation failed please try again later")
+
+    zabbix_logger.info(f"Host '{host}' created successfully with ID: {hostid}")
+    return hostid
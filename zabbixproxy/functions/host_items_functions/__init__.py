@@ -1,4 +1,10 @@
 from zabbixproxy.functions.host_items_functions.item_content_function import (
     get_real_time_data,
+    get_real_time_data_for_items,
+)
+from zabbixproxy.functions.host_items_functions.item_list_function import (
+    compile_host_items,
+    get_host_items,
+    host_items_params,
+    latest_history,
 )
-from zabbixproxy.functions.host_items_functions.item_list_function import get_host_items
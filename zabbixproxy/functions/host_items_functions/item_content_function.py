@@ -1,43 +1,29 @@
 import logging
 
-import requests
 from django.conf import settings
 
 from utils import ServiceErrorHandler
-from zabbixproxy.functions.credentials_functions import zabbix_login
+from zabbixproxy.functions.visualization_functions import get_history_batched
+from zabbixproxy.services import get_zabbix_client
 
 api_url = settings.ZABBIX_API_URL
-username = settings.ZABBIX_ADMIN_USER
-password = settings.ZABBIX_ADMIN_PASSWORD
 
 zabbix_logger = logging.getLogger("zabbix")
 django_logger = logging.getLogger("django")
 
 
-def get_zabbix_auth_token():
-    try:
-        return zabbix_login(api_url=api_url, username=username, password=password)
-    except ServiceErrorHandler as e:
-        raise ServiceErrorHandler(f"{str(e)}")
-
-
 def get_real_time_data(itemids, value_type, hostids):
     """
     Get real-time data from Zabbix API.
     Returns: Dictionary containing the response data or raises ServiceErrorHandler
     """
-    try:
-        if not itemids:
-            raise ServiceErrorHandler("Missing itemids parameter")
-
-        # Get auth token using the zabbix_login function
-        auth_token = get_zabbix_auth_token()
+    if not itemids:
+        raise ServiceErrorHandler("Missing itemids parameter")
 
-        # Prepare the request to Zabbix API
-        zabbix_request = {
-            "jsonrpc": "2.0",
-            "method": "history.get",
-            "params": {
+    try:
+        result = get_zabbix_client(api_url).call_with_auth(
+            "history.get",
+            {
                 "hostids": hostids,
                 "output": "extend",
                 "history": value_type,
@@ -46,42 +32,33 @@ def get_real_time_data(itemids, value_type, hostids):
                 "sortfield": "clock",
                 "sortorder": "DESC",
             },
-            "id": 3,
-        }
-
-        # Make the request to Zabbix API
-        response = requests.post(
-            f"{api_url}/api_jsonrpc.php",
-            json=zabbix_request,
-            headers={
-                "Content-Type": "application/json-rpc",
-                "Authorization": f"Bearer {auth_token}",
-            },
-            timeout=15,
         )
+        return {"result": result}
 
-        try:
-            response_data = response.json()
-        except ValueError:
-            zabbix_logger.error("Invalid JSON received from Zabbix.")
-            raise ServiceErrorHandler("Invalid response from Zabbix API")
-
-        if "error" in response_data:
-            error_info = response_data["error"]
-            error_code = error_info.get("code", "N/A")
-            error_message = error_info.get("message", "No message")
-            error_data = error_info.get("data", "")
+    except ServiceErrorHandler:
+        raise
+    except Exception as e:
+        django_logger.exception(f"Unexpected error in get_real_time_data: {str(e)}")
+        raise ServiceErrorHandler("Unexpected error occurred")
 
-            zabbix_logger.error(
-                f"Zabbix API Error [{error_code}]: {error_message} - {error_data}"
-            )
-            raise ServiceErrorHandler(f"{error_message} - {error_data}")
 
-        return response_data
+def get_real_time_data_for_items(items, limit=100):
+    """
+    Get recent history for many items with one history.get per value type.
+    Returns: ({itemid: history rows, newest first}, number of history.get calls,
+    IDs of the items whose call failed)
+    """
+    if not items:
+        return {}, 0, set()
 
-    except requests.RequestException as e:
-        zabbix_logger.error(f"Request error: {str(e)}")
-        raise ServiceErrorHandler("Failed to connect to Zabbix API")
+    try:
+        history, calls, missing = get_history_batched(items, limit=limit)
+    except ServiceErrorHandler:
+        raise
     except Exception as e:
-        django_logger.exception(f"Unexpected error in get_real_time_data: {str(e)}")
+        django_logger.exception(
+            f"Unexpected error in get_real_time_data_for_items: {str(e)}"
+        )
         raise ServiceErrorHandler("Unexpected error occurred")
+
+    return {itemid: rows[::-1] for itemid, rows in history.items()}, calls, missing
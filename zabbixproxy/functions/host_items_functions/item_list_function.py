@@ -1,122 +1,67 @@
 import json
 import logging
 
-import requests
 from django.conf import settings
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_GET
 
-from utils import ServiceErrorHandler
-from zabbixproxy.functions.credentials_functions import zabbix_login
-from zabbixproxy.functions.host_items_functions import get_real_time_data
+from zabbixproxy.functions.host_items_functions import get_real_time_data_for_items
+from zabbixproxy.services import ZabbixAPIError, get_zabbix_client
 
 api_url = settings.ZABBIX_API_URL
-username = settings.ZABBIX_ADMIN_USER
-password = settings.ZABBIX_ADMIN_PASSWORD
 
 zabbix_logger = logging.getLogger("zabbix")
 django_logger = logging.getLogger("django")
 
 
-def get_zabbix_auth_token():
-    try:
-        return zabbix_login(api_url=api_url, username=username, password=password)
-    except ServiceErrorHandler as e:
-        raise ServiceErrorHandler(f"{str(e)}")
-
-
 @csrf_exempt
 @require_GET
 def get_host_items(request):
     """
     Proxy endpoint to get host items from Zabbix API.
     Frontend only needs to send the hostids and name as query parameters.
+    With latest=true each item carries only its last value, taken from
+    item.get, and no history is queried. Otherwise the IDs of items whose
+    history call failed are listed in `missing_items`.
     """
     try:
         hostids = request.GET.get("hostids")
         name = request.GET.get("name", "CPU")
+        latest = request.GET.get("latest", "false").lower() in ("1", "true")
 
         if not hostids:
             return JsonResponse({"error": "Missing hostids parameter"}, status=400)
 
-        auth_token = get_zabbix_auth_token()
-
-        zabbix_request = {
-            "jsonrpc": "2.0",
-            "method": "item.get",
-            "params": {
-                "output": ["itemid", "name", "key_", "value_type", "units"],
-                "hostids": hostids,
-                "search": {
-                    "name": name,
-                },
-                "sortfield": "name",
-            },
-            "id": 2,
-        }
-
-        response = requests.post(
-            f"{api_url}/api_jsonrpc.php",
-            json=zabbix_request,
-            headers={
-                "Content-Type": "application/json-rpc",
-                "Authorization": f"Bearer {auth_token}",
-            },
-            timeout=15,
-        )
-
         try:
-            response_data_for_log = response.json()
-        except ValueError:
-            zabbix_logger.error("Invalid JSON received from Zabbix.")
-            raise ServiceErrorHandler("Host creation please try again later")
-
-        if "error" in response_data_for_log:
-            error_info = response_data_for_log["error"]
-            error_code = error_info.get("code", "N/A")
-            error_message = error_info.get("message", "No message")
-            error_data = error_info.get("data", "")
-
-            zabbix_logger.error(
-                f"Zabbix API Error [{error_code}]: {error_message} - {error_data}"
+            items = get_zabbix_client(api_url).call_with_auth(
+                "item.get",
+                host_items_params(hostids, name),
             )
-
+        except ZabbixAPIError as e:
             return JsonResponse(
                 {
                     "status": "error",
-                    "message": f"{error_message} - {error_data}",
+                    "message": str(e),
                 },
                 status=502,
             )
 
-        # Parse the response
-        result = response.json()
-        # Return the result directly
         compiled_response = {
             "status": "success",
             "data": [],
         }
 
         try:
-            for item in result["result"]:
-                item_content_result_data = []
-                item_content_result = get_real_time_data(
-                    itemids=item["itemid"],
-                    value_type=item["value_type"],
-                    hostids=hostids,
+            if latest:
+                history = latest_history(items)
+            else:
+                history, calls, missing = get_real_time_data_for_items(items)
+                zabbix_logger.debug(
+                    f"Fetched history for {len(items)} items with {calls} history.get calls"
                 )
-                if item_content_result.get("result"):
-                    item_content_result_data = item_content_result["result"]
-                    compiled_response["data"].append(
-                        {
-                            "itemid": item["itemid"],
-                            "name": item["name"],
-                            "value_type": item["value_type"],
-                            "units": item["units"],
-                            "result": item_content_result_data,
-                        }
-                    )
+                compiled_response["missing_items"] = sorted(missing)
+            compiled_response["data"] = compile_host_items(items, history)
 
         except Exception as e:
             django_logger.exception(f"Error processing item: {str(e)}")
@@ -140,3 +85,53 @@ def get_host_items(request):
             },
             status=500,
         )
+
+
+def host_items_params(hostids, name):
+    """item.get parameters for the items of `hostids` matching `name`"""
+    return {
+        "output": [
+            "itemid",
+            "name",
+            "key_",
+            "value_type",
+            "units",
+            "lastvalue",
+            "lastclock",
+        ],
+        "hostids": hostids,
+        "search": {
+            "name": name,
+        },
+        "sortfield": "name",
+    }
+
+
+def latest_history(items):
+    """One history row per item built from its lastvalue, without history.get"""
+    return {
+        item["itemid"]: [
+            {
+                "itemid": item["itemid"],
+                "clock": item["lastclock"],
+                "value": item["lastvalue"],
+            }
+        ]
+        for item in items
+        if item.get("lastclock", "0") != "0"
+    }
+
+
+def compile_host_items(items, history):
+    """Pair every item that has history with its rows, in item order"""
+    return [
+        {
+            "itemid": item["itemid"],
+            "name": item["name"],
+            "value_type": item["value_type"],
+            "units": item["units"],
+            "result": history[item["itemid"]],
+        }
+        for item in items
+        if history.get(item["itemid"])
+    ]
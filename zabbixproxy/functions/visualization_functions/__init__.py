@@ -1,3 +1,27 @@
+from .build_host_visualizations import (
+    build_host_visualization_delta,
+    build_host_visualizations,
+    decode_cursor,
+    encode_cursor,
+)
+from .build_host_visualizations_async import (
+    build_host_visualizations_async,
+    get_history_batched_async,
+    get_series_for_items_async,
+)
+from .columnar import LAYOUTS, to_columnar, value_format
+from .downsample import DOWNSAMPLE_METHODS, downsample_series
+from .get_history_batched import get_history_batched
 from .get_history_for_items import get_history_for_items
 from .get_items_for_host import get_items_for_host
+from .get_series_for_items import get_series_for_items
+from .get_trends_batched import get_trends_batched
+from .snapshot_cache import get_host_visualizations, refresh_snapshot
 from .suggest_visualization_for_item import suggest_visualization_for_item
+from .visualization_rules import (
+    CATEGORY_RULES,
+    VISUALIZATION_RULES,
+    clear_rule_caches,
+    match_category,
+    match_visualization_rule,
+)
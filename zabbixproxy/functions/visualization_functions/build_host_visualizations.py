@@ -0,0 +1,423 @@
+import base64
+import binascii
+import logging
+import time
+from datetime import datetime
+
+import orjson
+
+from utils import ServiceErrorHandler
+
+from .downsample import downsample_series
+from .get_history_batched import get_history_batched
+from .get_items_for_host import get_items_for_host
+from .get_series_for_items import get_series_for_items
+from .suggest_visualization_for_item import suggest_visualization_for_item
+from .visualization_rules import match_category, tag_category
+
+logger = logging.getLogger("zabbix")
+
+
+def build_host_visualizations(
+    host_id, time_range=24, limit=100, downsample=None, points=500
+):
+    """
+    Build the visualization payload for a host from live Zabbix data
+
+    Args:
+        host_id: Zabbix host ID
+        time_range (int, optional): Time range in hours. Defaults to 24.
+        limit (int, optional): Data points per item. Defaults to 100.
+        downsample (str, optional): "lttb" or "minmax" to fetch the whole
+            range and reduce each series to `points`. Defaults to None.
+        points (int, optional): Point budget when downsampling. Defaults to 500.
+
+    Returns:
+        tuple: (payload or None when the host has no items, stats) where stats
+            has upstream_calls and, when downsampling, downsample_ms
+    """
+    stats = {"upstream_calls": 1}
+
+    # Calculate time range for history data
+    time_till = int(time.time())
+    time_from = time_till - (time_range * 3600)  # Convert hours to seconds
+
+    # 1. Get all items for the host
+    logger.info(f"Fetching items for host ID {host_id}")
+    items = get_items_for_host(host_id)
+
+    if not items:
+        logger.warning(f"No items found for host ID {host_id}")
+        return None, stats
+
+    logger.info(f"Found {len(items)} items for host ID {host_id}")
+
+    # 2. Pick a visualization for every item up front so history is
+    # only fetched for items that will be displayed
+    suggestions, numeric_items = _chartable_items(items)
+
+    # 3. Fetch history (or trends) for all numeric items in batched calls
+    series_by_item, history_calls, missing = get_series_for_items(
+        numeric_items,
+        limit=None if downsample else limit,
+        time_from=time_from,
+        time_till=time_till,
+    )
+    upstream_calls = 1 + history_calls
+    logger.info(
+        f"Fetched history for {len(numeric_items)} items of host {host_id} "
+        f"with {upstream_calls} Zabbix API calls"
+    )
+
+    return assemble_host_visualizations(
+        host_id,
+        suggestions,
+        series_by_item,
+        time_from,
+        time_till,
+        upstream_calls,
+        missing=missing,
+        downsample=downsample,
+        points=points,
+    )
+
+
+def assemble_host_visualizations(
+    host_id,
+    suggestions,
+    series_by_item,
+    time_from,
+    time_till,
+    upstream_calls,
+    missing=(),
+    downsample=None,
+    points=500,
+):
+    """
+    Turn fetched items and series into the visualization payload
+
+    Shared by the sync builder and the async view, which only differ in how
+    they fetch from Zabbix.
+
+    Args:
+        suggestions (list): (item, suggestion) pairs from `_chartable_items`
+        series_by_item (dict): Series per item ID from `get_series_for_items`
+        upstream_calls (int): Zabbix API calls made to fetch them
+        missing (set, optional): IDs of the items whose history or trend call
+            failed, listed in the payload's `missing_items`
+
+    Returns:
+        tuple: (payload, stats) as returned by `build_host_visualizations`
+    """
+    stats = {}
+
+    # Group items by application/category for better organization
+    item_groups = {}
+    standalone_items = []
+    raw_points = 0
+    downsample_seconds = 0.0
+    last_clocks = {}
+
+    # 4. Build the visualization items
+    for item, suggestion in suggestions:
+        try:
+            item_id = item.get("itemid", "unknown")
+            item_name = item.get("name", "unknown")
+            logger.debug(f"Processing item: {item_name} (ID: {item_id})")
+
+            chart_data = []
+            resolution = None
+            if str(item.get("value_type")) in ("0", "3"):
+                if item_id not in series_by_item:
+                    # Its history.get call failed; it is listed in
+                    # missing_items instead
+                    continue
+                history = series_by_item[item_id]["points"]
+                resolution = series_by_item[item_id]["resolution"]
+                last_clocks[item_id] = (
+                    int(history[-1]["clock"]) if history else time_till
+                )
+
+                if downsample:
+                    raw_points += len(history)
+                    started = time.perf_counter()
+                    chart_data = downsample_series(history, downsample, points)
+                    downsample_seconds += time.perf_counter() - started
+                    for point in chart_data:
+                        point["formatted"] = _format_value(
+                            point["value"], item.get("units", "")
+                        )
+                else:
+                    chart_data = _chart_points(history, item.get("units", ""))
+
+            # Create visualization item with enhanced metadata
+            viz_item = {
+                "id": item.get("itemid", ""),
+                "name": item.get("name", ""),
+                "key": item.get("key_", ""),
+                "units": item.get("units", ""),
+                "value_type": item.get("value_type", ""),
+                "visualization": suggestion,
+                "resolution": resolution,
+                "data": chart_data,
+            }
+
+            # Group items by application if available
+            category = _determine_category(item)
+
+            if category:
+                if category not in item_groups:
+                    item_groups[category] = []
+                item_groups[category].append(viz_item)
+            else:
+                standalone_items.append(viz_item)
+
+        except Exception as item_error:
+            logger.error(
+                f"Error processing item {item.get('name', 'unknown')}: {str(item_error)}"
+            )
+            # Continue with next item instead of failing the whole request
+            continue
+
+    # Prepare the final response
+    response_data = {
+        "host_id": host_id,
+        "time_range": {
+            "from": time_from,
+            "till": time_till,
+            "from_formatted": _format_timestamp(time_from),
+            "till_formatted": _format_timestamp(time_till),
+        },
+        "groups": [
+            {"name": group_name, "items": items_list}
+            for group_name, items_list in item_groups.items()
+        ],
+        "standalone_items": standalone_items,
+        "missing_items": sorted(missing),
+        "cursor": encode_cursor(host_id, last_clocks),
+    }
+
+    stats["upstream_calls"] = upstream_calls
+    if missing:
+        logger.warning(
+            f"Visualization data for host {host_id} is missing {len(missing)} items "
+            f"whose Zabbix calls failed"
+        )
+    if downsample:
+        stats["downsample_ms"] = downsample_seconds * 1000
+        logger.info(
+            f"Downsampled {raw_points} points with {downsample} to {points} "
+            f"per series in {downsample_seconds * 1000:.2f} ms"
+        )
+
+    logger.info(f"Built visualization data for host {host_id}")
+    return response_data, stats
+
+
+def build_host_visualization_delta(host_id, since, time_range=24, limit=100):
+    """
+    Build only what changed for a host since the client's last poll
+
+    Args:
+        host_id: Zabbix host ID
+        since (dict): Last clock the client has, per item ID
+        time_range (int, optional): Never look further back than this many
+            hours. Defaults to 24.
+        limit (int, optional): Newest data points per item. Defaults to 100.
+
+    Returns:
+        tuple: (payload or None when the host has no items, stats). The
+            payload lists new points per item in `items`, the IDs of charted
+            items that disappeared in `removed`, those the client does not
+            know yet in `added` (refetch the full view to get them), those
+            whose history call failed in `missing_items` (their clocks are
+            kept so the next poll asks again), and the `cursor` for the next
+            poll.
+    """
+    stats = {"upstream_calls": 1}
+    time_till = int(time.time())
+    window_start = time_till - (time_range * 3600)
+
+    items = get_items_for_host(host_id)
+    if not items:
+        logger.warning(f"No items found for host ID {host_id}")
+        return None, stats
+
+    _, numeric_items = _chartable_items(items)
+    current_ids = {item["itemid"] for item in numeric_items}
+    known_items = [item for item in numeric_items if item["itemid"] in since]
+
+    clocks = {itemid: int(clock) for itemid, clock in since.items()}
+    changed = []
+    missing = set()
+    if known_items:
+        # One narrowed history.get per group, starting after the oldest clock
+        # the client holds; newer rows are then filtered per item.
+        time_from = max(
+            min(clocks[item["itemid"]] for item in known_items) + 1, window_start
+        )
+        history_by_item, history_calls, missing = get_history_batched(
+            known_items, limit=limit, time_from=time_from, time_till=time_till
+        )
+        stats["upstream_calls"] += history_calls
+
+        for item in known_items:
+            item_id = item["itemid"]
+            rows = [
+                row
+                for row in history_by_item.get(item_id, [])
+                if int(row.get("clock", 0)) > clocks[item_id]
+            ]
+            if not rows:
+                continue
+            clocks[item_id] = int(rows[-1]["clock"])
+            changed.append(
+                {"id": item_id, "data": _chart_points(rows, item.get("units", ""))}
+            )
+
+    removed = sorted(itemid for itemid in since if itemid not in current_ids)
+    for itemid in removed:
+        clocks.pop(itemid, None)
+
+    payload = {
+        "host_id": host_id,
+        "till": time_till,
+        "items": changed,
+        "removed": removed,
+        "added": sorted(current_ids - set(since)),
+        "missing_items": sorted(missing),
+        "cursor": encode_cursor(host_id, clocks),
+    }
+    logger.info(
+        f"Built visualization delta for host {host_id}: {len(changed)} items changed, "
+        f"{len(removed)} removed"
+    )
+    return payload, stats
+
+
+def encode_cursor(host_id, clocks):
+    """Pack the last clock per item into an opaque, URL-safe cursor."""
+    blob = orjson.dumps({"h": str(host_id), "c": clocks})
+    return base64.urlsafe_b64encode(blob).rstrip(b"=").decode()
+
+
+def decode_cursor(host_id, cursor):
+    """
+    Unpack a cursor made by `encode_cursor` into {itemid: clock}
+
+    Raises:
+        ServiceErrorHandler: The cursor is malformed or belongs to another host
+    """
+    try:
+        blob = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = orjson.loads(blob)
+        clocks = {str(itemid): int(clock) for itemid, clock in data["c"].items()}
+    except (binascii.Error, orjson.JSONDecodeError, KeyError, TypeError, ValueError):
+        raise ServiceErrorHandler("Invalid cursor")
+    if data.get("h") != str(host_id):
+        raise ServiceErrorHandler("Cursor belongs to another host")
+    return clocks
+
+
+def _chartable_items(items):
+    """
+    Suggest a visualization per item and drop items that cannot be shown
+
+    Returns:
+        tuple: ([(item, suggestion)], numeric items among them)
+    """
+    suggestions = []
+    numeric_items = []
+    for item in items:
+        try:
+            suggestion = suggest_visualization_for_item(item)
+        except Exception as item_error:
+            logger.error(
+                f"Error processing item {item.get('name', 'unknown')}: {str(item_error)}"
+            )
+            continue
+
+        # Skip items with unknown visualization type
+        if suggestion["type"] == "unknown":
+            logger.debug(
+                f"Skipping item with unknown visualization type: {item.get('name', 'unknown')}"
+            )
+            continue
+
+        suggestions.append((item, suggestion))
+        if str(item.get("value_type")) in ("0", "3"):  # float, numeric unsigned
+            numeric_items.append(item)
+    return suggestions, numeric_items
+
+
+def _chart_points(history, units):
+    """
+    Format history for charting libraries
+    """
+    chart_data = []
+    for h in history:
+        try:
+            value = float(h.get("value", 0))
+            point = {
+                "time": int(h.get("clock", 0)),
+                "value": value,
+                "formatted": _format_value(value, units),
+            }
+            if "min" in h:
+                point["min"] = float(h["min"])
+                point["max"] = float(h["max"])
+            chart_data.append(point)
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Error formatting history value: {e}")
+    return chart_data
+
+
+def _determine_category(item):
+    """
+    Determine the category for an item, preferring its Zabbix tags
+    (component/application) over matching its key and name
+    """
+    try:
+        return tag_category(item.get("tags")) or match_category(
+            item.get("key_", ""), item.get("name", "")
+        )
+    except Exception as e:
+        logger.warning(f"Error determining category: {e}")
+        return None
+
+
+def _format_value(value, unit):
+    """
+    Format a value based on its unit for display
+    """
+    try:
+        if unit == "%":
+            return f"{value:.1f}%"
+        elif unit.upper() in ["B", "KB", "MB", "GB", "TB"]:
+            # Simple byte formatting
+            if unit == "B" and value > 1024:
+                if value > 1024 * 1024:
+                    return f"{value / (1024 * 1024):.2f} MB"
+                return f"{value / 1024:.2f} KB"
+            return f"{value} {unit}"
+        elif unit in ["s", "ms"]:
+            if unit == "s" and value < 0.1:
+                return f"{value * 1000:.1f} ms"
+            return f"{value} {unit}"
+        else:
+            # Default formatting
+            return f"{value} {unit}" if unit else f"{value}"
+    except Exception as e:
+        logger.warning(f"Error formatting value {value} with unit {unit}: {e}")
+        return f"{value} {unit}" if unit else f"{value}"
+
+
+def _format_timestamp(timestamp):
+    """
+    Format a Unix timestamp to a human-readable date/time
+    """
+    try:
+        return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+    except Exception as e:
+        logger.warning(f"Error formatting timestamp {timestamp}: {e}")
+        return str(timestamp)
@@ -0,0 +1,212 @@
+import logging
+import time
+
+from utils import ServiceErrorHandler
+from zabbixproxy.services import get_async_zabbix_client
+
+from .build_host_visualizations import _chartable_items, assemble_host_visualizations
+from .get_history_batched import (
+    history_chunk_params,
+    plan_history_chunks,
+    split_history_rows,
+)
+from .get_series_for_items import history_series, stitch_series, trend_boundary
+from .get_trends_batched import plan_trend_chunks, split_trend_rows, trend_chunk_params
+
+logger = logging.getLogger("zabbix")
+
+ITEM_OUTPUT = ["itemid", "name", "key_", "value_type", "units", "delay"]
+
+
+async def build_host_visualizations_async(
+    host_id, time_range=24, limit=100, downsample=None, points=500, concurrency=None
+):
+    """
+    Async counterpart of `build_host_visualizations` for ASGI views
+
+    Every history.get and trend.get chunk is sent at once on the shared
+    httpx client, at most `concurrency` (ZABBIX_ASYNC_CONCURRENCY) in flight
+    for this request; the payload is assembled exactly like the sync one.
+
+    Returns:
+        tuple: (payload or None when the host has no items, stats)
+    """
+    client = get_async_zabbix_client()
+    time_till = int(time.time())
+    time_from = time_till - (time_range * 3600)
+
+    items = await client.call_with_auth(
+        "item.get",
+        {
+            "output": ITEM_OUTPUT,
+            "selectTags": ["tag", "value"],
+            "hostids": host_id,
+            "sortfield": "name",
+            "filter": {"status": "0"},
+        },
+    )
+    if not items:
+        logger.warning(f"No items found for host ID {host_id}")
+        return None, {"upstream_calls": 1}
+
+    suggestions, numeric_items = _chartable_items(items)
+    series_by_item, history_calls, missing = await get_series_for_items_async(
+        client,
+        numeric_items,
+        limit=None if downsample else limit,
+        time_from=time_from,
+        time_till=time_till,
+        concurrency=concurrency,
+    )
+    return assemble_host_visualizations(
+        host_id,
+        suggestions,
+        series_by_item,
+        time_from,
+        time_till,
+        1 + history_calls,
+        missing=missing,
+        downsample=downsample,
+        points=points,
+    )
+
+
+async def get_series_for_items_async(
+    client, items, limit=100, time_from=None, time_till=None, concurrency=None
+):
+    """
+    Async `get_series_for_items`: trend and history chunks of a stitched
+    range are fetched together rather than one after the other. As in the
+    sync version, the raw part of a stitched range is read without `limit`.
+
+    Returns:
+        tuple: ({itemid: {"resolution": str, "points": list}}, number of calls,
+            IDs of the items with a failed call)
+    """
+    boundary = trend_boundary(items, time_from, time_till)
+    if boundary is None:
+        history, calls, missing = await get_history_batched_async(
+            client, items, limit, time_from, time_till, concurrency=concurrency
+        )
+        return history_series(history), calls, missing
+
+    trend_chunks = plan_trend_chunks(items)
+    history_chunks = plan_history_chunks(items)
+    results = await client.gather(
+        [
+            ("trend.get", trend_chunk_params(chunk, time_from, boundary - 1))
+            for chunk in trend_chunks
+        ]
+        + [
+            (
+                "history.get",
+                history_chunk_params(item_ids, value_type, None, boundary, time_till),
+            )
+            for value_type, item_ids in history_chunks
+        ],
+        concurrency=concurrency,
+    )
+
+    trends = {}
+    trend_missing = set()
+    for chunk, rows in zip(trend_chunks, results):
+        if isinstance(rows, ServiceErrorHandler):
+            logger.error(f"Trend fetch failed for {len(chunk)} items: {rows}")
+            trend_missing.update(chunk)
+            continue
+        trends.update(split_trend_rows(_raise_unexpected(rows) or [], chunk))
+
+    history, history_calls, missing = await _collect_history(
+        client,
+        history_chunks,
+        results[len(trend_chunks) :],
+        None,
+        boundary,
+        time_till,
+        concurrency,
+    )
+    return (
+        stitch_series(items, trends, history),
+        len(trend_chunks) + history_calls,
+        trend_missing | missing,
+    )
+
+
+async def get_history_batched_async(
+    client, items, limit=100, time_from=None, time_till=None, concurrency=None
+):
+    """
+    Async `get_history_batched`: all chunks are sent at once, then the
+    items that came back short are refetched in further rounds.
+
+    Returns:
+        tuple: ({itemid: history sorted oldest first}, number of history.get
+            calls, IDs of the items whose chunk failed)
+    """
+    chunks = plan_history_chunks(items)
+    if not chunks:
+        return {}, 0, set()
+
+    results = await client.gather(
+        [
+            (
+                "history.get",
+                history_chunk_params(item_ids, value_type, limit, time_from, time_till),
+            )
+            for value_type, item_ids in chunks
+        ],
+        concurrency=concurrency,
+    )
+    return await _collect_history(
+        client, chunks, results, limit, time_from, time_till, concurrency
+    )
+
+
+async def _collect_history(
+    client, chunks, results, limit, time_from, time_till, concurrency
+):
+    history = {}
+    missing = set()
+    calls = 0
+    while chunks:
+        calls += len(chunks)
+        retry = []
+        for (value_type, item_ids), rows in zip(chunks, results):
+            if isinstance(rows, ServiceErrorHandler):
+                logger.error(
+                    f"History fetch failed for {len(item_ids)} items of value type {value_type}: {rows}"
+                )
+                missing.update(item_ids)
+                continue
+            per_item, short = split_history_rows(
+                _raise_unexpected(rows) or [], item_ids, limit
+            )
+            for itemid, points in per_item.items():
+                if itemid not in short:
+                    # Return in chronological order (oldest first)
+                    history[itemid] = points[::-1]
+            if short:
+                retry.append((value_type, short))
+
+        chunks = retry
+        if chunks:
+            results = await client.gather(
+                [
+                    (
+                        "history.get",
+                        history_chunk_params(
+                            item_ids, value_type, limit, time_from, time_till
+                        ),
+                    )
+                    for value_type, item_ids in chunks
+                ],
+                concurrency=concurrency,
+            )
+    return history, calls, missing
+
+
+def _raise_unexpected(result):
+    """Re-raise anything `gather` caught that is not a Zabbix error."""
+    if isinstance(result, BaseException):
+        raise result
+    return result
@@ -0,0 +1,66 @@
+LAYOUTS = ("rows", "columnar")
+
+BYTE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
+
+def to_columnar(payload):
+    """
+    Rewrite the chart data of a visualization payload into parallel arrays
+
+    Every item's `data` list of {time, value, formatted} dicts becomes
+    {"times": [...], "values": [...]} (plus "min"/"max" when present), where
+    `times` holds the first timestamp followed by the difference to the
+    previous one. The per-point `formatted` strings are dropped in favour of
+    one `format` description per item (see `value_format`).
+
+    Works on full, cached and delta payloads; the payload is not modified.
+    """
+    columnar = dict(payload)
+    if "groups" in payload:
+        columnar["groups"] = [
+            {**group, "items": [_columnar_item(item) for item in group["items"]]}
+            for group in payload["groups"]
+        ]
+    for key in ("standalone_items", "items"):
+        if key in payload:
+            columnar[key] = [_columnar_item(item) for item in payload[key]]
+    columnar["layout"] = "columnar"
+    return columnar
+
+
+def value_format(units):
+    """
+    Describe how the frontend should render values of an item
+
+    Mirrors the server-side formatting: percentages with one decimal, bytes
+    scaled to KB/MB past 1024, seconds below 0.1 shown in ms.
+    """
+    if units == "%":
+        return {"unit": units, "kind": "percent", "decimals": 1}
+    if units.upper() in BYTE_UNITS:
+        return {"unit": units, "kind": "bytes", "decimals": 2}
+    if units in ("s", "ms"):
+        return {"unit": units, "kind": "duration", "decimals": 1}
+    return {"unit": units, "kind": "plain"}
+
+
+def _columnar_item(item):
+    points = item.get("data", [])
+    columns = {"times": [], "values": []}
+    if points and "min" in points[0]:
+        columns["min"] = []
+        columns["max"] = []
+
+    previous = 0
+    for point in points:
+        columns["times"].append(point["time"] - previous)
+        previous = point["time"]
+        columns["values"].append(point["value"])
+        if "min" in columns:
+            columns["min"].append(point.get("min", point["value"]))
+            columns["max"].append(point.get("max", point["value"]))
+
+    converted = {**item, "data": columns}
+    if "units" in item:
+        converted["format"] = value_format(item["units"] or "")
+    return converted
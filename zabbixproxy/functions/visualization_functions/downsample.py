@@ -0,0 +1,106 @@
+import numpy as np
+
+DOWNSAMPLE_METHODS = ("lttb", "minmax")
+
+
+def downsample_series(history, method, points):
+    """
+    Reduce a history series to at most `points` chart points
+
+    Args:
+        history (list): History rows with clock and value, oldest first.
+            Rows that already carry min and max (trends) keep them in "minmax".
+        method (str): "lttb" keeps the visually significant raw points,
+            "minmax" averages equal time buckets and keeps their min and max
+        points (int): Point budget, usually the chart width in pixels
+
+    Returns:
+        list: Dicts with time and value, plus min and max for "minmax"
+    """
+    times = np.fromiter((int(h.get("clock", 0)) for h in history), dtype=np.int64)
+    values = np.fromiter((float(h.get("value", 0)) for h in history), dtype=np.float64)
+
+    if method == "minmax":
+        lows = highs = None
+        if any("min" in h for h in history):
+            lows = np.fromiter(
+                (float(h.get("min", h.get("value", 0))) for h in history),
+                dtype=np.float64,
+            )
+            highs = np.fromiter(
+                (float(h.get("max", h.get("value", 0))) for h in history),
+                dtype=np.float64,
+            )
+        return minmax_buckets(times, values, points, lows, highs)
+
+    keep = lttb_indices(times, values, points)
+    return [
+        {"time": int(t), "value": float(v)} for t, v in zip(times[keep], values[keep])
+    ]
+
+
+def lttb_indices(times, values, threshold):
+    """
+    Largest-Triangle-Three-Buckets: indices of the points to keep
+
+    The first and last points are always kept. The rest is split into
+    `threshold - 2` buckets, and from each bucket the point forming the
+    largest triangle with the previously kept point and the average of the
+    next bucket is kept. Each bucket is scored as one vectorized operation.
+    """
+    n = len(times)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = times.astype(np.float64)
+    y = values
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+
+    keep = np.empty(threshold, dtype=np.int64)
+    keep[0] = 0
+    keep[-1] = n - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        if bucket + 2 < len(edges):
+            next_start, next_end = edges[bucket + 1], edges[bucket + 2]
+        else:
+            next_start, next_end = n - 1, n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        area = np.abs(
+            (x[previous] - avg_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (avg_y - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        keep[bucket + 1] = previous
+    return keep
+
+
+def minmax_buckets(times, values, buckets, lows=None, highs=None):
+    """
+    Split the series into equal time buckets and aggregate each one
+
+    Returns one point per non-empty bucket at the mean time of its samples,
+    with the bucket average as value and its min and max alongside. `lows`
+    and `highs` replace `values` for the min and max when the samples are
+    already aggregates.
+    """
+    if len(times) == 0:
+        return []
+
+    span = int(times[-1] - times[0]) + 1
+    bucket_ids = ((times - times[0]) * buckets) // span
+
+    starts = np.flatnonzero(np.r_[True, bucket_ids[1:] != bucket_ids[:-1]])
+    counts = np.diff(np.r_[starts, len(times)])
+    mean_times = np.add.reduceat(times, starts) // counts
+    avgs = np.add.reduceat(values, starts) / counts
+    mins = np.minimum.reduceat(values if lows is None else lows, starts)
+    maxs = np.maximum.reduceat(values if highs is None else highs, starts)
+
+    return [
+        {"time": int(t), "value": float(avg), "min": float(lo), "max": float(hi)}
+        for t, avg, lo, hi in zip(mean_times, avgs, mins, maxs)
+    ]
@@ -0,0 +1,151 @@
+import logging
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+from utils import ServiceErrorHandler
+
+from .request import send_request
+
+logger = logging.getLogger("zabbix")
+
+
+def get_history_batched(items, limit=100, time_from=None, time_till=None):
+    """
+    Get the latest history points for many items with as few calls as possible
+
+    history.get accepts a single value type per call, so items are grouped by
+    value type, and by update interval so that items sharing a call produce
+    points at about the same rate. Each group is split into chunks of
+    ZABBIX_HISTORY_BATCH_SIZE items, every chunk is fetched with one call and
+    the rows are split back out per item. Chunks run concurrently.
+
+    Args:
+        items (list): Zabbix items with itemid, value_type and delay
+        limit (int, optional): Maximum number of records per item, or None for
+            every record in the time range. Defaults to 100.
+        time_from (int, optional): Start time as Unix timestamp. Defaults to None.
+        time_till (int, optional): End time as Unix timestamp. Defaults to None.
+
+    Returns:
+        tuple: ({itemid: history sorted oldest first}, number of history.get
+            calls, IDs of the items whose chunk failed). Failed items are left
+            out of the mapping, so callers can tell them from items without data.
+    """
+    chunks = plan_history_chunks(items)
+    if not chunks:
+        return {}, 0, set()
+
+    history = {}
+    missing = set()
+    calls = 0
+    workers = max(1, min(settings.ZABBIX_HISTORY_CONCURRENCY, len(chunks)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                _fetch_chunk, item_ids, value_type, limit, time_from, time_till
+            )
+            for value_type, item_ids in chunks
+        ]
+        for (value_type, item_ids), future in zip(chunks, futures):
+            try:
+                chunk_history, chunk_calls = future.result()
+            except ServiceErrorHandler as e:
+                logger.error(
+                    f"History fetch failed for {len(item_ids)} items of value type {value_type}: {e}"
+                )
+                calls += 1
+                missing.update(item_ids)
+                continue
+            calls += chunk_calls
+            for itemid, rows in chunk_history.items():
+                # Return in chronological order (oldest first)
+                history[itemid] = rows[::-1]
+
+    logger.debug(
+        f"Fetched history for {len(items)} items with {calls} history.get calls"
+    )
+    return history, calls, missing
+
+
+def plan_history_chunks(items):
+    """
+    Split items into (value_type, item_ids) chunks of at most
+    ZABBIX_HISTORY_BATCH_SIZE items sharing a value type and update interval
+    """
+    groups = defaultdict(list)
+    for item in items:
+        groups[(str(item["value_type"]), item.get("delay", ""))].append(item["itemid"])
+
+    batch_size = max(1, settings.ZABBIX_HISTORY_BATCH_SIZE)
+    return [
+        (value_type, item_ids[start : start + batch_size])
+        for (value_type, _), item_ids in groups.items()
+        for start in range(0, len(item_ids), batch_size)
+    ]
+
+
+def history_chunk_params(item_ids, value_type, limit, time_from, time_till):
+    """history.get parameters for one chunk, newest rows first"""
+    params = {
+        "output": "extend",
+        "itemids": item_ids,
+        "sortfield": "clock",
+        "sortorder": "DESC",
+        "history": value_type,
+    }
+    if limit:
+        params["limit"] = limit * len(item_ids)
+    if time_from:
+        params["time_from"] = time_from
+    if time_till:
+        params["time_till"] = time_till
+    return params
+
+
+def split_history_rows(rows, item_ids, limit):
+    """
+    Split the rows of one chunk call back out per item
+
+    Returns:
+        tuple: ({itemid: rows newest first}, item IDs to fetch again). When
+            the shared limit of the call was reached, a busy item may have
+            crowded out older rows of the others, so the items that came back
+            short must be fetched again. At least one item is always full in
+            that case, so the retry set shrinks on every round.
+    """
+    per_item = {itemid: [] for itemid in item_ids}
+    for row in rows:
+        points = per_item.get(row.get("itemid"))
+        if points is not None and (not limit or len(points) < limit):
+            points.append(row)
+
+    short = []
+    if limit and len(rows) >= limit * len(item_ids):
+        short = [itemid for itemid, points in per_item.items() if len(points) < limit]
+        if len(short) == len(item_ids):
+            short = []
+    return per_item, short
+
+
+def _fetch_chunk(item_ids, value_type, limit, time_from, time_till):
+    """
+    Fetch up to `limit` newest rows per item in one call, newest first,
+    refetching the items that came back short (see `split_history_rows`).
+    """
+    rows = send_request(
+        "history.get",
+        history_chunk_params(item_ids, value_type, limit, time_from, time_till),
+    )
+    calls = 1
+
+    per_item, short = split_history_rows(rows, item_ids, limit)
+    if short:
+        refetched, extra_calls = _fetch_chunk(
+            short, value_type, limit, time_from, time_till
+        )
+        per_item.update(refetched)
+        calls += extra_calls
+
+    return per_item, calls
@@ -3,7 +3,8 @@ from .request import send_request
 
 def get_items_for_host(host_id):
     params = {
-        "output": ["itemid", "name", "key_", "value_type", "units"],
+        "output": ["itemid", "name", "key_", "value_type", "units", "delay"],
+        "selectTags": ["tag", "value"],
         "hostids": host_id,
         "sortfield": "name",
         "filter": {"status": "0"},
@@ -0,0 +1,149 @@
+import logging
+import time
+
+from django.conf import settings
+
+from zabbixproxy.functions.history_mirror_functions.read_history_mirror import (
+    merge_tail,
+    read_mirrored_history,
+)
+
+from .get_history_batched import get_history_batched
+from .get_trends_batched import get_trends_batched
+
+logger = logging.getLogger("zabbix")
+
+RESOLUTION_HISTORY = "history"
+RESOLUTION_TREND = "trend"
+RESOLUTION_STITCHED = "trend+history"
+
+
+def get_series_for_items(items, limit=100, time_from=None, time_till=None):
+    """
+    Get chart series for numeric items, from trends when the range is long
+
+    Ranges up to ZABBIX_TREND_THRESHOLD_HOURS are served from raw history as
+    before. Longer ranges read hourly trends up to a boundary at the start of
+    the hour ZABBIX_TREND_RAW_HOURS before `time_till`, and raw history after
+    it, so recent data is not lost to trends that Zabbix has not written yet.
+
+    In trend mode `limit` does not apply: the raw part is read whole, since
+    it only spans ZABBIX_TREND_RAW_HOURS and capping its newest rows would
+    leave a gap after the trend boundary, and the trend part has at most one
+    point per hour of the range.
+
+    Raw history is read from the local history mirror for the items it
+    covers, and from Zabbix for the rest.
+
+    Args:
+        items (list): Numeric Zabbix items with itemid, value_type and delay
+        limit (int, optional): Maximum number of raw records per item when
+            the range is served from raw history, or None for every record.
+            Defaults to 100.
+        time_from (int): Start time as Unix timestamp
+        time_till (int): End time as Unix timestamp
+
+    Returns:
+        tuple: ({itemid: {"resolution": str, "points": list}}, number of calls,
+            IDs of the items with a failed call). Points are oldest first and
+            have clock and value; trend points also have min and max. An item
+            with a failed call has no series, or only the part that was read.
+    """
+    boundary = trend_boundary(items, time_from, time_till)
+    if boundary is None:
+        history, calls, missing = _get_history(items, limit, time_from, time_till)
+        return history_series(history), calls, missing
+
+    trends, trend_calls, trend_missing = get_trends_batched(
+        items, time_from=time_from, time_till=boundary - 1
+    )
+    history, history_calls, missing = _get_history(items, None, boundary, time_till)
+    logger.debug(
+        f"Stitched trends before {boundary} with raw history for {len(items)} items"
+    )
+    return (
+        stitch_series(items, trends, history),
+        trend_calls + history_calls,
+        trend_missing | missing,
+    )
+
+
+def _get_history(items, limit, time_from, time_till):
+    """
+    Raw history from the local mirror where it covers the range, else Zabbix.
+    The rows after the last sync of mirrored items are read from Zabbix.
+    """
+    time_till = time_till or int(time.time())
+    mirrored, remaining, synced_till = read_mirrored_history(
+        items, limit, time_from, time_till
+    )
+    history, calls, missing = get_history_batched(
+        remaining, limit=limit, time_from=time_from, time_till=time_till
+    )
+    if synced_till:
+        tail, tail_calls, tail_missing = get_history_batched(
+            [item for item in items if item["itemid"] in synced_till],
+            limit=limit,
+            time_from=max(time_from, min(synced_till.values()) + 1),
+            time_till=time_till,
+        )
+        merge_tail(mirrored, tail, synced_till, limit)
+        calls += tail_calls
+        missing |= tail_missing
+    history.update(mirrored)
+    return history, calls, missing
+
+
+def trend_boundary(items, time_from, time_till):
+    """
+    Clock from which raw history is used when trends serve the range, or
+    None when the whole range is served from raw history
+    """
+    threshold = settings.ZABBIX_TREND_THRESHOLD_HOURS * 3600
+    if (
+        not items
+        or not time_from
+        or not time_till
+        or time_till - time_from <= threshold
+    ):
+        return None
+
+    boundary = time_till - settings.ZABBIX_TREND_RAW_HOURS * 3600
+    return boundary - boundary % 3600
+
+
+def history_series(history):
+    """Wrap raw history per item as series"""
+    return {
+        itemid: {"resolution": RESOLUTION_HISTORY, "points": rows}
+        for itemid, rows in history.items()
+    }
+
+
+def stitch_series(items, trends, history):
+    """Join trend points and the raw history after them into one series per item"""
+    series = {}
+    for item in items:
+        itemid = item["itemid"]
+        if itemid not in trends and itemid not in history:
+            continue
+
+        points = [
+            {
+                "clock": row["clock"],
+                "value": row["value_avg"],
+                "min": row["value_min"],
+                "max": row["value_max"],
+            }
+            for row in trends.get(itemid, [])
+        ]
+        raw = history.get(itemid, [])
+        if points and raw:
+            resolution = RESOLUTION_STITCHED
+        elif points:
+            resolution = RESOLUTION_TREND
+        else:
+            resolution = RESOLUTION_HISTORY
+        series[itemid] = {"resolution": resolution, "points": points + raw}
+
+    return series
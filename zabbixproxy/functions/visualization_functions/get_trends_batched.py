@@ -0,0 +1,90 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+from utils import ServiceErrorHandler
+
+from .request import send_request
+
+logger = logging.getLogger("zabbix")
+
+
+def get_trends_batched(items, time_from=None, time_till=None):
+    """
+    Get hourly trends (min/avg/max) for many items
+
+    Unlike history.get, trend.get accepts items of any numeric value type in
+    one call, so items are only split into chunks of ZABBIX_HISTORY_BATCH_SIZE,
+    fetched concurrently.
+
+    Args:
+        items (list): Zabbix items with itemid
+        time_from (int, optional): Start time as Unix timestamp. Defaults to None.
+        time_till (int, optional): End time as Unix timestamp. Defaults to None.
+
+    Returns:
+        tuple: ({itemid: trends sorted oldest first}, number of trend.get
+            calls, IDs of the items whose chunk failed). Failed items are left
+            out of the mapping.
+    """
+    chunks = plan_trend_chunks(items)
+    if not chunks:
+        return {}, 0, set()
+
+    trends = {}
+    missing = set()
+    workers = max(1, min(settings.ZABBIX_HISTORY_CONCURRENCY, len(chunks)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_fetch_chunk, chunk, time_from, time_till)
+            for chunk in chunks
+        ]
+        for chunk, future in zip(chunks, futures):
+            try:
+                trends.update(future.result())
+            except ServiceErrorHandler as e:
+                logger.error(f"Trend fetch failed for {len(chunk)} items: {e}")
+                missing.update(chunk)
+
+    return trends, len(chunks), missing
+
+
+def plan_trend_chunks(items):
+    """Split item IDs into chunks of at most ZABBIX_HISTORY_BATCH_SIZE"""
+    item_ids = [item["itemid"] for item in items]
+    batch_size = max(1, settings.ZABBIX_HISTORY_BATCH_SIZE)
+    return [
+        item_ids[start : start + batch_size]
+        for start in range(0, len(item_ids), batch_size)
+    ]
+
+
+def trend_chunk_params(item_ids, time_from, time_till):
+    """trend.get parameters for one chunk"""
+    params = {
+        "output": ["itemid", "clock", "num", "value_min", "value_avg", "value_max"],
+        "itemids": item_ids,
+    }
+    if time_from:
+        params["time_from"] = time_from
+    if time_till:
+        params["time_till"] = time_till
+    return params
+
+
+def split_trend_rows(rows, item_ids):
+    """Split the rows of one chunk call back out per item, oldest first"""
+    per_item = {itemid: [] for itemid in item_ids}
+    for row in rows:
+        points = per_item.get(row.get("itemid"))
+        if points is not None:
+            points.append(row)
+    for points in per_item.values():
+        points.sort(key=lambda row: int(row.get("clock", 0)))
+    return per_item
+
+
+def _fetch_chunk(item_ids, time_from, time_till):
+    rows = send_request("trend.get", trend_chunk_params(item_ids, time_from, time_till))
+    return split_trend_rows(rows, item_ids)
@@ -0,0 +1,181 @@
+import logging
+import time
+
+import orjson
+import redis
+from django.conf import settings
+
+from utils import ServiceErrorHandler, get_redis
+
+from .build_host_visualizations import build_host_visualizations
+
+logger = logging.getLogger("zabbix")
+
+SNAPSHOT_PREFIX = "monipro:viz"
+
+
+def get_host_visualizations(
+    host_id, time_range=24, limit=100, downsample=None, points=500
+):
+    """
+    Serve the visualization payload for a host from the Redis snapshot cache
+
+    Snapshots live under a key per time bucket of
+    VISUALIZATION_SNAPSHOT_BUCKET_SECONDS, and the newest one is also kept as
+    the host's last good snapshot for VISUALIZATION_SNAPSHOT_KEEP_SECONDS.
+    Partial payloads, with items whose Zabbix call failed, are only cached
+    for VISUALIZATION_SNAPSHOT_PARTIAL_SECONDS and never become the last
+    good snapshot.
+
+    - A snapshot for the current bucket is served as is.
+    - Otherwise a last good snapshot younger than
+      VISUALIZATION_SNAPSHOT_MAX_STALE_SECONDS is served while one Celery task
+      rebuilds it in the background.
+    - Otherwise the payload is rebuilt inline, and if Zabbix cannot be reached
+      the last good snapshot is served whatever its age.
+
+    Returns:
+        tuple: (payload or None when the host has no items, stats). Cached
+            payloads carry a `snapshot` block with built_at, age and stale.
+    """
+    params = {
+        "host_id": host_id,
+        "time_range": time_range,
+        "limit": limit,
+        "downsample": downsample,
+        "points": points,
+    }
+    base_key = _base_key(**params)
+    now = time.time()
+
+    try:
+        conn = get_redis()
+        current = conn.get(_bucket_key(base_key, now))
+        latest = None if current else conn.get(f"{base_key}:latest")
+    except redis.RedisError as e:
+        logger.warning(f"Visualization snapshot cache unavailable: {e}")
+        return build_host_visualizations(**params)
+
+    if current:
+        return _with_age(orjson.loads(current), now, stale=False), {"upstream_calls": 0}
+
+    latest = orjson.loads(latest) if latest else None
+    if latest:
+        age = now - latest["built_at"]
+        if age <= settings.VISUALIZATION_SNAPSHOT_MAX_STALE_SECONDS:
+            _schedule_refresh(base_key, params)
+            return _with_age(latest, now, stale=True), {"upstream_calls": 0}
+
+    try:
+        payload, stats = refresh_snapshot(**params)
+    except ServiceErrorHandler as e:
+        if not latest:
+            raise
+        logger.error(
+            f"Serving last good visualization snapshot for host {host_id}: {e}"
+        )
+        return _with_age(latest, now, stale=True), {"upstream_calls": 0}
+
+    if payload is not None:
+        payload["snapshot"] = {"built_at": int(now), "age": 0, "stale": False}
+    return payload, stats
+
+
+def refresh_snapshot(host_id, time_range=24, limit=100, downsample=None, points=500):
+    """
+    Rebuild a host's visualization payload and store it as the new snapshot
+
+    A partial payload (see `missing_items`) is stored for the current bucket
+    for VISUALIZATION_SNAPSHOT_PARTIAL_SECONDS only, so it is rebuilt soon,
+    and leaves the last good snapshot alone.
+
+    Returns:
+        tuple: (payload or None when the host has no items, stats)
+    """
+    params = {
+        "host_id": host_id,
+        "time_range": time_range,
+        "limit": limit,
+        "downsample": downsample,
+        "points": points,
+    }
+    payload, stats = build_host_visualizations(**params)
+    if payload is None:
+        return payload, stats
+
+    now = time.time()
+    base_key = _base_key(**params)
+    blob = orjson.dumps({"built_at": now, "payload": payload})
+    partial = bool(payload.get("missing_items"))
+    try:
+        pipe = get_redis().pipeline()
+        pipe.set(
+            _bucket_key(base_key, now),
+            blob,
+            ex=(
+                settings.VISUALIZATION_SNAPSHOT_PARTIAL_SECONDS
+                if partial
+                else settings.VISUALIZATION_SNAPSHOT_BUCKET_SECONDS * 2
+            ),
+        )
+        if not partial:
+            pipe.set(
+                f"{base_key}:latest",
+                blob,
+                ex=settings.VISUALIZATION_SNAPSHOT_KEEP_SECONDS,
+            )
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Could not store visualization snapshot: {e}")
+    return payload, stats
+
+
+def release_refresh_lock(
+    host_id, time_range=24, limit=100, downsample=None, points=500
+):
+    """Let the next stale read schedule a refresh again."""
+    key = _base_key(host_id, time_range, limit, downsample, points)
+    try:
+        get_redis().delete(f"{key}:refresh")
+    except redis.RedisError as e:
+        logger.warning(f"Could not release visualization refresh lock: {e}")
+
+
+def _schedule_refresh(base_key, params):
+    """Queue one background rebuild per snapshot, however many readers ask."""
+    from zabbixproxy.tasks import refresh_visualization_snapshot_task
+
+    lock_key = f"{base_key}:refresh"
+    try:
+        if not get_redis().set(
+            lock_key, 1, nx=True, ex=settings.VISUALIZATION_SNAPSHOT_LOCK_SECONDS
+        ):
+            return
+    except redis.RedisError as e:
+        logger.warning(f"Could not take visualization refresh lock: {e}")
+        return
+
+    try:
+        refresh_visualization_snapshot_task.delay(**params)
+    except Exception as e:
+        logger.error(f"Could not queue visualization snapshot refresh: {e}")
+        release_refresh_lock(**params)
+
+
+def _base_key(host_id, time_range, limit, downsample, points):
+    shape = f"{downsample}:{points}" if downsample else "raw"
+    return f"{SNAPSHOT_PREFIX}:{host_id}:{time_range}:{limit}:{shape}"
+
+
+def _bucket_key(base_key, now):
+    return f"{base_key}:{int(now) // settings.VISUALIZATION_SNAPSHOT_BUCKET_SECONDS}"
+
+
+def _with_age(snapshot, now, stale):
+    payload = snapshot["payload"]
+    payload["snapshot"] = {
+        "built_at": int(snapshot["built_at"]),
+        "age": int(now - snapshot["built_at"]),
+        "stale": stale,
+    }
+    return payload
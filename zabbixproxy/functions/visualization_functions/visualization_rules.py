@@ -0,0 +1,245 @@
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+from django.conf import settings
+
+# Suggestions and categories depend only on an item's signature (value type,
+# units, key, name), which repeats across every host built from the same
+# templates. Rules are compiled once, the first match wins, and results are
+# memoized per signature in a bounded LRU of VISUALIZATION_RULE_CACHE_SIZE.
+
+# Placeholders filled in per item, since title and description are not
+# part of the cached signature.
+TITLE = object()
+UNITS = object()
+DESCRIPTION = object()
+
+Signature = namedtuple("Signature", "value_type units key name")
+Rule = namedtuple("Rule", "name matches type options")
+CategoryRule = namedtuple("CategoryRule", "category matches")
+
+
+def _contains(*words):
+    """Precompiled "any of these substrings" test."""
+    return re.compile("|".join(re.escape(word) for word in words)).search
+
+
+STATUS_KEY = _contains("status", "state", "available", "ping")
+GAUGE_TERMS = _contains("cpu", "memory", "disk", "space", "usage", "util")
+RATE_UNITS = _contains("bps", "b/s", "bytes/s", "bits/s")
+COMPLEMENTARY_KEY = _contains("free", "total")
+COMPLEMENTARY_NAME = _contains("available", "used")
+COUNT_NAME = _contains("processes", "count")
+BYTE_UNITS = {"B", "KB", "MB", "GB", "TB"}
+
+NETWORK_KEY = _contains("net.", "icmp", "tcp", "udp", "ftp", "http")
+MEMORY_TERMS = _contains("mem", "swap")
+STORAGE_KEY = _contains("vfs", "disk", "fs.", "storage")
+
+
+VISUALIZATION_RULES = (
+    # Non-graphable data (char, log, text)
+    Rule(
+        "text",
+        lambda s: s.value_type in (1, 2, 4),
+        "text-display",
+        {"title": TITLE, "description": DESCRIPTION},
+    ),
+    # Uptime/Time-based data
+    Rule(
+        "uptime",
+        lambda s: "uptime" in s.key
+        or "uptime" in s.name
+        or "boot time" in s.name
+        or "unixtime" in s.units,
+        "single-stat",
+        {"title": TITLE, "format": "duration", "description": DESCRIPTION},
+    ),
+    # Boolean/Status data (up/down, on/off)
+    Rule(
+        "status",
+        lambda s: s.value_type == 3
+        and STATUS_KEY(s.key)
+        and "icmpping" in s.key
+        and "loss" not in s.key
+        and "sec" not in s.key,
+        "status-indicator",
+        {"title": TITLE, "description": DESCRIPTION},
+    ),
+    # Usage percentages - good for gauges
+    Rule(
+        "percent-gauge",
+        lambda s: s.units == "%" and bool(GAUGE_TERMS(s.name) or GAUGE_TERMS(s.key)),
+        "gauge",
+        {
+            "title": TITLE,
+            "min": 0,
+            "max": 100,
+            "unit": "%",
+            "description": DESCRIPTION,
+        },
+    ),
+    # Other percentages (packet loss, ...) - line chart on a 0-100 axis
+    Rule(
+        "percent",
+        lambda s: s.units == "%",
+        "line",
+        {
+            "title": TITLE,
+            "unit": "%",
+            "description": DESCRIPTION,
+            "yaxis": {"min": 0, "max": 100},
+        },
+    ),
+    # Network Traffic (bits or bytes per second)
+    Rule(
+        "rate",
+        lambda s: bool(RATE_UNITS(s.units.lower())),
+        "area-chart",
+        {
+            "title": TITLE,
+            "unit": UNITS,
+            "description": DESCRIPTION,
+            "stacked": False,
+            "gradient": True,
+        },
+    ),
+    # Free vs Total space - good for pie charts
+    Rule(
+        "bytes-share",
+        lambda s: s.units.upper() in BYTE_UNITS
+        and bool(COMPLEMENTARY_KEY(s.key) or COMPLEMENTARY_NAME(s.name)),
+        "pie-chart",
+        {
+            "title": TITLE,
+            "unit": UNITS,
+            "description": DESCRIPTION,
+            "format": "bytes",
+            # Frontend should look for related free/total items
+            "needsComplementaryData": True,
+        },
+    ),
+    # Time series of memory/disk usage
+    Rule(
+        "bytes",
+        lambda s: s.units.upper() in BYTE_UNITS,
+        "line",
+        {"title": TITLE, "unit": UNITS, "description": DESCRIPTION, "format": "bytes"},
+    ),
+    # Ping/Response time
+    Rule(
+        "response-time",
+        lambda s: "ping" in s.key or "response" in s.name or s.units in ("s", "ms"),
+        "line",
+        {"title": TITLE, "unit": UNITS, "description": DESCRIPTION},
+    ),
+    # Temperature data
+    Rule(
+        "temperature",
+        lambda s: s.units in ("C", "F") or "temp" in s.name,
+        "line",
+        {"title": TITLE, "unit": UNITS, "description": DESCRIPTION},
+    ),
+    # Process count or number of items
+    Rule(
+        "count",
+        lambda s: bool(COUNT_NAME(s.name)) or "num" in s.key,
+        "bar-chart",
+        {"title": TITLE, "description": DESCRIPTION},
+    ),
+    # Time-series data that doesn't fit other categories
+    Rule(
+        "numeric",
+        lambda s: s.value_type in (0, 3),
+        "line",
+        {"title": TITLE, "unit": UNITS, "description": DESCRIPTION},
+    ),
+)
+
+UNKNOWN_RULE = Rule(
+    "unknown", None, "unknown", {"title": TITLE, "description": DESCRIPTION}
+)
+
+
+CATEGORY_RULES = (
+    CategoryRule("Network", lambda key, name: bool(NETWORK_KEY(key))),
+    CategoryRule("CPU", lambda key, name: "cpu" in key or "cpu" in name),
+    CategoryRule(
+        "Memory", lambda key, name: bool(MEMORY_TERMS(key) or MEMORY_TERMS(name))
+    ),
+    CategoryRule("Storage", lambda key, name: bool(STORAGE_KEY(key))),
+    CategoryRule("System", lambda key, name: "system" in key),
+    CategoryRule("Processes", lambda key, name: "proc" in key or "process" in name),
+)
+
+# Zabbix templates tag items with component:<name> (application:<name> for
+# items migrated from pre-5.4 applications); known values map onto the
+# categories above, anything else is used as is.
+CATEGORY_TAGS = ("component", "application")
+TAG_CATEGORIES = {
+    "cpu": "CPU",
+    "memory": "Memory",
+    "network": "Network",
+    "storage": "Storage",
+    "system": "System",
+    "os": "System",
+    "processes": "Processes",
+}
+
+
+@lru_cache(maxsize=settings.VISUALIZATION_RULE_CACHE_SIZE)
+def match_visualization_rule(value_type, units, key, name):
+    """Return the first rule of VISUALIZATION_RULES matching the signature."""
+    try:
+        value_type = int(value_type)
+    except (TypeError, ValueError):
+        value_type = -1
+    signature = Signature(value_type, units, key, name.lower())
+    for rule in VISUALIZATION_RULES:
+        if rule.matches(signature):
+            return rule
+    return UNKNOWN_RULE
+
+
+@lru_cache(maxsize=settings.VISUALIZATION_RULE_CACHE_SIZE)
+def match_category(key, name):
+    """Return the category of the first CATEGORY_RULES entry matching, or None."""
+    key = key.lower()
+    name = name.lower()
+    for rule in CATEGORY_RULES:
+        if rule.matches(key, name):
+            return rule.category
+    return None
+
+
+def render_options(template, title, units, description):
+    """Fill the per-item placeholders of a rule's options template."""
+    options = {}
+    for key, value in template.items():
+        if value is TITLE:
+            value = title
+        elif value is UNITS:
+            value = units
+        elif value is DESCRIPTION:
+            value = description
+        elif isinstance(value, dict):
+            value = dict(value)
+        options[key] = value
+    return options
+
+
+def tag_category(tags):
+    """Category from the item's Zabbix tags, or None when it has none."""
+    for wanted in CATEGORY_TAGS:
+        for tag in tags or ():
+            if tag.get("tag", "").lower() == wanted and tag.get("value"):
+                value = tag["value"]
+                return TAG_CATEGORIES.get(value.lower(), value)
+    return None
+
+
+def clear_rule_caches():
+    """Drop memoized results, e.g. before a cold-cache benchmark run."""
+    match_visualization_rule.cache_clear()
+    match_category.cache_clear()
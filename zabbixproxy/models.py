@@ -1,10 +1,12 @@
 import uuid
 
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.contrib.postgres.fields import ArrayField
+from django.db import models, transaction
 from django.utils import timezone
 
 from customers.models import OrganizationInfo
+from utils import publish_event
 
 User = get_user_model()
 
@@ -127,19 +129,39 @@ class TaskStatus(models.Model):
         faild_task=None,
         successful_task=None,
     ):
+        # Only fields that are passed change, so zero counts and empty lists
+        # still replace earlier progress
         self.status = status
-        if successfully_executed_tasks:
+        if successfully_executed_tasks is not None:
             self.successfully_executed_tasks = successfully_executed_tasks
-        if unsuccessfully_executed_tasks:
+        if unsuccessfully_executed_tasks is not None:
             self.unsuccessfully_executed_tasks = unsuccessfully_executed_tasks
-        if faild_task:
+        if faild_task is not None:
             self.faild_task = faild_task
-        if successful_task:
+        if successful_task is not None:
             self.successful_task = successful_task
-        if error_message:
+        if error_message is not None:
             self.error_message = error_message
         self.updated_at = timezone.now()
         self.save()
+        self.publish()
+
+    def publish(self):
+        """Send the task's progress to the event stream of its organization"""
+        organization_id = self.user.organization_id if self.user else None
+        data = {
+            "task_id": self.task_id,
+            "task_type": self.task_type,
+            "status": self.status,
+            "host_ip": self.host_ip,
+            "dns": self.dns,
+            "successful_task": self.successful_task,
+            "faild_task": self.faild_task,
+            "error_message": self.error_message,
+        }
+        transaction.on_commit(
+            lambda: publish_event(organization_id, "task_status", data)
+        )
 
 
 class Host(models.Model):
@@ -187,6 +209,40 @@ class HostLifecycle(models.Model):
     status = models.CharField(max_length=50, choices=STATUS_CHOICES)
     status_message = models.TextField(null=True, blank=True)
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.publish()
+
+    def publish(self):
+        """Send the lifecycle's status to the event stream of its organization"""
+        self.publish_many([self])
+
+    @classmethod
+    def publish_many(cls, lifecycles):
+        """`publish` for many lifecycles, with one query for their hosts"""
+        hosts = {
+            host["pk"]: host
+            for host in Host.objects.filter(
+                pk__in=[lifecycle.host_id for lifecycle in lifecycles]
+            ).values("pk", "host", "host_group__belongs_to")
+        }
+        for lifecycle in lifecycles:
+            host = hosts.get(lifecycle.host_id)
+            if not host:
+                continue
+            data = {
+                "host_lifecycle_id": lifecycle.pk,
+                "local_host_id": lifecycle.host_id,
+                "host": host["host"],
+                "status": lifecycle.status,
+                "status_message": lifecycle.status_message,
+            }
+            transaction.on_commit(
+                lambda org=host["host_group__belongs_to"], data=data: publish_event(
+                    org, "host_lifecycle", data
+                )
+            )
+
 
 class HostCredentials(models.Model):
     host = models.ForeignKey(Host, on_delete=models.CASCADE)
@@ -218,3 +274,55 @@ class TemplateMirror(models.Model):
 
     def __str__(self):
         return f"{self.template_name}"
+
+
+class HistoryMirrorItem(models.Model):
+    """
+    A numeric Zabbix item mirrored into `HistoryChunk` rows, with its
+    high-water mark: the newest (clock, ns) already copied.
+    """
+
+    itemid = models.CharField(max_length=20, unique=True)
+    hostid = models.CharField(max_length=20, db_index=True)
+    value_type = models.IntegerField()
+    # Start of the mirrored range; older data is read from Zabbix
+    mirrored_from = models.IntegerField()
+    # End of the range covered by the last successful sync
+    synced_till = models.IntegerField()
+    last_clock = models.IntegerField()
+    last_ns = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.itemid}-{self.last_clock}"
+
+
+class HistoryChunk(models.Model):
+    """
+    History of one item over HISTORY_MIRROR_CHUNK_SECONDS, as parallel
+    arrays ordered by (clock, ns). Float items (value_type 0) keep their
+    values in `values`, unsigned items (value_type 3) in `uint_values`, as
+    uint64 counters do not fit a double without losing precision.
+    """
+
+    item = models.ForeignKey(
+        HistoryMirrorItem, on_delete=models.CASCADE, related_name="chunks"
+    )
+    start_clock = models.IntegerField()
+    end_clock = models.IntegerField()
+    clocks = ArrayField(models.IntegerField(), default=list)
+    ns = ArrayField(models.IntegerField(), default=list)
+    values = ArrayField(models.FloatField(), default=list)
+    uint_values = ArrayField(
+        models.DecimalField(max_digits=20, decimal_places=0), default=list
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["item", "start_clock"], name="unique_history_chunk"
+            )
+        ]
+        indexes = [models.Index(fields=["end_clock"])]
+
+    def __str__(self):
+        return f"{self.item_id}-{self.start_clock}"
@@ -1,7 +1,9 @@
+from zabbixproxy.serializers.agent_upgrade import AgentUpgradeSerializer
 from zabbixproxy.serializers.ansibal_runner import AnsibleRequestSerializer
 from zabbixproxy.serializers.get_template import TemplateGroupMirrorSerializer
 from zabbixproxy.serializers.host_create import HostSerializer
 from zabbixproxy.serializers.host_list import ActiveHostSerializer
+from zabbixproxy.serializers.ssh_target import no_leading_dash
 from zabbixproxy.serializers.template import TemplateSerializer
 from zabbixproxy.serializers.template_group import TemplateGroupSerializer
 from zabbixproxy.serializers.zabbix_user import ZabbixUserSerializer
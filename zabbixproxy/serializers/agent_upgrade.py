@@ -0,0 +1,36 @@
+import re
+
+from django.core.validators import MaxValueValidator, MinValueValidator
+from rest_framework import serializers
+
+SERIAL = re.compile(r"^(\d+|\d{1,3}%)$")
+
+
+class AgentUpgradeSerializer(serializers.Serializer):
+    serial = serializers.CharField(
+        required=False,
+        help_text='Hosts per batch, a count or a percentage like "20%"',
+    )
+    max_fail_percentage = serializers.IntegerField(
+        required=False,
+        validators=[MinValueValidator(0), MaxValueValidator(100)],
+        help_text="Share of failed hosts in a batch that stops the upgrade",
+    )
+    forks = serializers.IntegerField(
+        required=False,
+        validators=[MinValueValidator(1), MaxValueValidator(200)],
+        help_text="Hosts worked on in parallel",
+    )
+    reconfigure_only = serializers.BooleanField(
+        required=False,
+        default=False,
+        help_text="Only rewrite the agent config, keep the installed package",
+    )
+
+    def validate_serial(self, value):
+        value = value.strip()
+        if not SERIAL.match(value) or value.rstrip("%") in ("0", ""):
+            raise serializers.ValidationError(
+                'serial must be a positive count or a percentage like "20%"'
+            )
+        return value
@@ -3,20 +3,28 @@
 from django.core.validators import MaxValueValidator, MinValueValidator
 from rest_framework import serializers
 
+from zabbixproxy.serializers.ssh_target import no_leading_dash
+
 
 class AnsibleRequestSerializer(serializers.Serializer):
     ip = serializers.CharField(
-        required=False, allow_blank=True, help_text="IP address of the target host"
+        required=False,
+        allow_blank=True,
+        validators=[no_leading_dash],
+        help_text="IP address of the target host",
     )
     dns = serializers.CharField(
-        required=False, allow_blank=True, help_text="DNS name of the target host"
+        required=False,
+        allow_blank=True,
+        validators=[no_leading_dash],
+        help_text="DNS name of the target host",
     )
     tags = serializers.CharField(
         required=False,
         allow_blank=True,
         help_text="Tags to be used in the Ansible playbook",
     )
-    username = serializers.CharField(required=True)
+    username = serializers.CharField(required=True, validators=[no_leading_dash])
     password = serializers.CharField(
         required=True, write_only=True, style={"input_type": "password"}
     )
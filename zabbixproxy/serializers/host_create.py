@@ -2,6 +2,7 @@ from rest_framework import serializers
 
 from utils import ServiceErrorHandler
 from zabbixproxy.models import Host
+from zabbixproxy.serializers.ssh_target import no_leading_dash
 
 
 class HostSerializer(serializers.ModelSerializer):
@@ -9,6 +10,12 @@ class HostSerializer(serializers.ModelSerializer):
         model = Host
         fields = "__all__"
 
+    def validate_ip(self, value):
+        return no_leading_dash(value)
+
+    def validate_dns(self, value):
+        return no_leading_dash(value)
+
     def validate(self, data):
         device_type = data.get(
             "device_type", getattr(self.instance, "device_type", None)
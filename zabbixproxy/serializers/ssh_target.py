@@ -0,0 +1,11 @@
+from rest_framework import serializers
+
+
+def no_leading_dash(value):
+    """
+    Reject an SSH user or host that ssh would read as an option, like
+    "-oProxyCommand=..."
+    """
+    if value and str(value).lstrip().startswith("-"):
+        raise serializers.ValidationError("Must not start with '-'.")
+    return value
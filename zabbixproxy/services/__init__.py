@@ -0,0 +1,16 @@
+from zabbixproxy.services.zabbix_client import (
+    ZabbixAPIError,
+    ZabbixAuthError,
+    ZabbixClient,
+    ZabbixConnectionError,
+    get_zabbix_client,
+)
+from zabbixproxy.services.zabbix_async_client import (
+    AsyncZabbixClient,
+    get_async_zabbix_client,
+)
+from zabbixproxy.services.zabbix_auth import (
+    ZabbixTokenManager,
+    get_token_manager,
+    get_zabbix_auth_token,
+)
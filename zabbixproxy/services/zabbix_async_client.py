@@ -0,0 +1,181 @@
+import asyncio
+import itertools
+import logging
+import weakref
+
+import httpx
+import orjson
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from zabbixproxy.services.zabbix_client import (
+    RETRYABLE_STATUS_CODES,
+    ZabbixAuthError,
+    ZabbixConnectionError,
+    decode_response,
+    is_retry_safe,
+)
+
+# httpx errors raised before the request was sent; only these are retried
+# for writes
+NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+zabbix_logger = logging.getLogger("zabbix")
+
+
+class AsyncZabbixClient:
+    """
+    Pooled JSON-RPC client for the Zabbix API on an `httpx.AsyncClient`.
+
+    The async counterpart of `ZabbixClient` for ASGI views: one instance per
+    event loop (see `get_async_zabbix_client`) shares its keep-alive pool
+    between every request served by the worker, and waiting on Zabbix does
+    not hold a thread. Retries and error handling match `ZabbixClient`.
+    """
+
+    def __init__(
+        self,
+        api_url,
+        pool_size=None,
+        connect_timeout=None,
+        read_timeout=None,
+        max_retries=None,
+        retry_backoff=None,
+        verify=None,
+    ):
+        self.api_url = api_url.rstrip("/")
+        self.endpoint = f"{self.api_url}/api_jsonrpc.php"
+        self.max_retries = max_retries or settings.ZABBIX_MAX_RETRIES
+        self.retry_backoff = (
+            retry_backoff
+            if retry_backoff is not None
+            else settings.ZABBIX_RETRY_BACKOFF
+        )
+        self._request_ids = itertools.count(1)
+        self.http = httpx.AsyncClient(
+            headers={"Content-Type": "application/json-rpc"},
+            limits=httpx.Limits(
+                max_connections=pool_size or settings.ZABBIX_POOL_SIZE,
+                max_keepalive_connections=pool_size or settings.ZABBIX_POOL_SIZE,
+            ),
+            timeout=httpx.Timeout(
+                read_timeout or settings.ZABBIX_READ_TIMEOUT,
+                connect=connect_timeout or settings.ZABBIX_CONNECT_TIMEOUT,
+            ),
+            verify=verify if verify is not None else settings.ZABBIX_VERIFY_SSL,
+        )
+
+    async def call(self, method, params, auth_token=None):
+        """
+        Call a Zabbix API method and return its `result`.
+
+        Raises:
+            ZabbixAPIError: The API answered with an error object
+            ZabbixConnectionError: The API was unreachable after all retries
+        """
+        body = orjson.dumps(
+            {
+                "jsonrpc": "2.0",
+                "method": method,
+                "params": params,
+                "id": next(self._request_ids),
+            }
+        )
+        headers = {"Authorization": f"Bearer {auth_token}"} if auth_token else None
+        attempts = self.max_retries
+        retry_safe = is_retry_safe(method)
+
+        for attempt in range(1, attempts + 1):
+            try:
+                zabbix_logger.debug(
+                    f"Zabbix API call '{method}' (attempt {attempt}/{attempts})"
+                )
+                response = await self.http.post(
+                    self.endpoint, content=body, headers=headers
+                )
+                if response.status_code in RETRYABLE_STATUS_CODES:
+                    raise httpx.HTTPStatusError(
+                        f"HTTP {response.status_code} from Zabbix API",
+                        request=response.request,
+                        response=response,
+                    )
+                return decode_response(method, response.status_code, response.content)
+
+            except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                zabbix_logger.warning(
+                    f"Zabbix API call '{method}' failed (attempt {attempt}/{attempts}): {e}"
+                )
+                if not retry_safe and not isinstance(e, NOT_SENT_ERRORS):
+                    zabbix_logger.critical(
+                        f"Zabbix API call '{method}' failed and may have been "
+                        f"applied, not retrying"
+                    )
+                    raise ZabbixConnectionError(
+                        "Zabbix API request failed and may have been applied"
+                    )
+                if attempt == attempts:
+                    zabbix_logger.critical(
+                        f"Zabbix API call '{method}' failed after {attempts} attempts"
+                    )
+                    raise ZabbixConnectionError("Failed to connect to Zabbix API")
+                await asyncio.sleep(self.retry_backoff * (2 ** (attempt - 1)))
+
+    async def call_with_auth(self, method, params):
+        """
+        Call a method with the cached admin session, logging in again once
+        when Zabbix rejects it.
+        """
+        from zabbixproxy.services.zabbix_auth import get_token_manager
+
+        manager = get_token_manager()
+        get_token = sync_to_async(manager.get_token, thread_sensitive=False)
+        token = await get_token()
+        try:
+            return await self.call(method, params, auth_token=token)
+        except ZabbixAuthError:
+            zabbix_logger.warning(
+                f"Zabbix session rejected for '{method}', logging in again"
+            )
+            await sync_to_async(manager.invalidate, thread_sensitive=False)(token)
+            return await self.call(method, params, auth_token=await get_token())
+
+    async def gather(self, calls, concurrency=None):
+        """
+        Run several authenticated calls concurrently, at most `concurrency`
+        (ZABBIX_ASYNC_CONCURRENCY) at a time.
+
+        Args:
+            calls: Iterable of (method, params) pairs
+
+        Returns:
+            list: One result per call, in order. A failed call yields its
+                exception instead of a result.
+        """
+        semaphore = asyncio.Semaphore(concurrency or settings.ZABBIX_ASYNC_CONCURRENCY)
+
+        async def limited(method, params):
+            async with semaphore:
+                return await self.call_with_auth(method, params)
+
+        return await asyncio.gather(
+            *(limited(method, params) for method, params in calls),
+            return_exceptions=True,
+        )
+
+
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_zabbix_client(api_url=None):
+    """
+    Return the shared `AsyncZabbixClient` for `api_url` on the running loop.
+
+    httpx connections belong to the event loop that opened them, so each
+    loop gets its own client; under an ASGI server that is one per worker.
+    """
+    api_url = api_url or settings.ZABBIX_API_URL
+    clients = _async_clients.setdefault(asyncio.get_running_loop(), {})
+    client = clients.get(api_url)
+    if client is None:
+        client = clients[api_url] = AsyncZabbixClient(api_url)
+    return client
@@ -0,0 +1,175 @@
+import logging
+import threading
+import time
+from datetime import timedelta
+
+import redis
+from django.conf import settings
+
+from utils import ServiceErrorHandler, get_redis
+from zabbixproxy.models import ZabbixAuthToken
+from zabbixproxy.services.zabbix_client import get_zabbix_client
+
+zabbix_logger = logging.getLogger("zabbix")
+
+TOKEN_KEY = "monipro:zabbix:admin_token"
+LOCK_KEY = "monipro:zabbix:admin_token:lock"
+
+
+class ZabbixTokenManager:
+    """
+    Caches the Zabbix admin session and refreshes it before it expires.
+
+    Lookups go from an in-process copy, to Redis (shared by every Django and
+    Celery process), to the `ZabbixAuthToken` table when Redis is down.
+    Refreshes are coalesced twice: a thread lock inside the process and a
+    Redis lock across processes, so only one `user.login` is ever in flight.
+    """
+
+    def __init__(self, api_url, username, password, ttl, refresh_margin, lock_timeout):
+        self.api_url = api_url
+        self.username = username
+        self.password = password
+        self.ttl = ttl
+        self.refresh_margin = refresh_margin
+        self.lock_timeout = lock_timeout
+        self._local = None
+        self._local_lock = threading.Lock()
+
+    def get_token(self):
+        """Return a valid admin token, logging in only when none is cached."""
+        token = self._fresh(self._local)
+        if token:
+            return token
+
+        cached = self._read_shared()
+        token = self._fresh(cached)
+        if token:
+            self._local = cached
+            return token
+
+        return self._refresh()
+
+    def invalidate(self, token):
+        """Forget `token` everywhere, unless another caller already replaced it."""
+        if self._local and self._local[0] == token:
+            self._local = None
+        try:
+            conn = get_redis()
+            cached = conn.get(TOKEN_KEY)
+            if cached and cached.decode().split("|", 1)[0] == token:
+                conn.delete(TOKEN_KEY)
+        except redis.RedisError as e:
+            zabbix_logger.warning(f"Could not invalidate cached Zabbix token: {e}")
+        ZabbixAuthToken.objects.filter(auth=token).delete()
+
+    def _fresh(self, cached):
+        if cached and cached[1] - self.refresh_margin > time.time():
+            return cached[0]
+        return None
+
+    def _read_shared(self):
+        try:
+            value = get_redis().get(TOKEN_KEY)
+            if value:
+                token, expires_at = value.decode().split("|", 1)
+                return token, float(expires_at)
+            return None
+        except (redis.RedisError, ValueError) as e:
+            zabbix_logger.warning(f"Redis unavailable for Zabbix token lookup: {e}")
+
+        record = ZabbixAuthToken.objects.order_by("-created_at").first()
+        if record and record.auth:
+            expires_at = record.created_at + timedelta(seconds=self.ttl)
+            return record.auth, expires_at.timestamp()
+        return None
+
+    def _write_shared(self, token, expires_at):
+        try:
+            get_redis().set(TOKEN_KEY, f"{token}|{expires_at}", ex=self.ttl)
+        except redis.RedisError as e:
+            zabbix_logger.warning(f"Could not cache Zabbix token in Redis: {e}")
+        ZabbixAuthToken.get_or_create_token(token)
+
+    def _refresh(self):
+        with self._local_lock:
+            # Another thread may have refreshed while we waited for the lock.
+            token = self._fresh(self._local)
+            if token:
+                return token
+
+            lock = None
+            try:
+                lock = get_redis().lock(
+                    LOCK_KEY,
+                    timeout=self.lock_timeout,
+                    blocking_timeout=self.lock_timeout,
+                )
+                if not lock.acquire():
+                    zabbix_logger.warning(
+                        "Timed out waiting for the Zabbix login lock, logging in directly"
+                    )
+                    lock = None
+            except redis.RedisError as e:
+                zabbix_logger.warning(f"Redis lock unavailable for Zabbix login: {e}")
+                lock = None
+
+            try:
+                # The lock holder we waited on has usually stored a new token.
+                cached = self._read_shared()
+                token = self._fresh(cached)
+                if token:
+                    self._local = cached
+                    return token
+
+                token = self._login()
+                expires_at = time.time() + self.ttl
+                self._write_shared(token, expires_at)
+                self._local = (token, expires_at)
+                return token
+            finally:
+                if lock is not None:
+                    try:
+                        lock.release()
+                    except redis.RedisError:
+                        pass
+
+    def _login(self):
+        zabbix_logger.info("Refreshing cached Zabbix admin session")
+        try:
+            token = get_zabbix_client(self.api_url).call(
+                "user.login",
+                {"username": self.username, "password": self.password},
+            )
+        except ServiceErrorHandler as e:
+            zabbix_logger.critical(f"Zabbix authentication failed: {str(e)}")
+            raise ServiceErrorHandler("something went wrong please try again later")
+
+        if not token:
+            raise ServiceErrorHandler("something went wrong please try again later")
+        return token
+
+
+_token_manager = None
+_token_manager_lock = threading.Lock()
+
+
+def get_token_manager():
+    """Return the process-wide token manager for the configured admin user."""
+    global _token_manager
+    with _token_manager_lock:
+        if _token_manager is None:
+            _token_manager = ZabbixTokenManager(
+                api_url=settings.ZABBIX_API_URL,
+                username=settings.ZABBIX_ADMIN_USER,
+                password=settings.ZABBIX_ADMIN_PASSWORD,
+                ttl=settings.ZABBIX_TOKEN_TTL,
+                refresh_margin=settings.ZABBIX_TOKEN_REFRESH_MARGIN,
+                lock_timeout=settings.ZABBIX_TOKEN_LOCK_TIMEOUT,
+            )
+    return _token_manager
+
+
+def get_zabbix_auth_token():
+    """Return the cached Zabbix admin token, refreshing it when needed."""
+    return get_token_manager().get_token()
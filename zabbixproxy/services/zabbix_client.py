@@ -0,0 +1,281 @@
+import itertools
+import logging
+import os
+import threading
+import time
+
+import orjson
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+
+from utils import ServiceErrorHandler
+
+zabbix_logger = logging.getLogger("zabbix")
+
+# Gateway errors are usually a restarting php-fpm/nginx in front of Zabbix,
+# so they are retried like network errors. Everything else is final.
+RETRYABLE_STATUS_CODES = {502, 503, 504}
+
+# Methods that change nothing in Zabbix and can be sent again after a
+# timeout or gateway error. Writes (host.create, host.delete, ...) are only
+# retried when the request never left this process, since a write that
+# timed out may already be committed and would fail as a duplicate.
+RETRY_SAFE_METHODS = {"apiinfo.version", "user.login"}
+
+
+def is_retry_safe(method):
+    """Whether `method` may be sent again after it reached Zabbix"""
+    return method.endswith(".get") or method in RETRY_SAFE_METHODS
+
+
+class ZabbixAPIError(ServiceErrorHandler):
+    """Error object returned by the Zabbix JSON-RPC API."""
+
+    def __init__(self, message="Zabbix API error", code=None, data=""):
+        self.code = code
+        self.error_message = message
+        self.data = data
+        super().__init__(f"{message}: {data}" if data else message)
+
+
+class ZabbixAuthError(ZabbixAPIError):
+    """The session used for the call is missing, expired or terminated."""
+
+
+# Substrings Zabbix uses in `error.data` for a dead or invalid session.
+AUTH_ERROR_MARKERS = (
+    "not authorized",
+    "not authorised",
+    "session terminated",
+    "re-login",
+)
+
+
+class ZabbixConnectionError(ServiceErrorHandler):
+    """Zabbix API could not be reached after all retries."""
+
+
+class ZabbixClient:
+    """
+    Pooled JSON-RPC client for the Zabbix API.
+
+    One instance per API URL is shared by every caller in a worker process
+    (see `get_zabbix_client`), so requests reuse keep-alive connections
+    instead of paying a new TCP+TLS handshake on every call.
+
+    Network errors and gateway responses are retried with exponential
+    backoff for read methods (see `is_retry_safe`); writes are only retried
+    when the connection could not be opened. JSON-RPC errors are raised
+    immediately as `ZabbixAPIError`.
+    """
+
+    def __init__(
+        self,
+        api_url,
+        pool_size=None,
+        connect_timeout=None,
+        read_timeout=None,
+        max_retries=None,
+        retry_backoff=None,
+        verify=None,
+    ):
+        self.api_url = api_url.rstrip("/")
+        self.endpoint = f"{self.api_url}/api_jsonrpc.php"
+        self.pool_size = pool_size or settings.ZABBIX_POOL_SIZE
+        self.timeout = (
+            connect_timeout or settings.ZABBIX_CONNECT_TIMEOUT,
+            read_timeout or settings.ZABBIX_READ_TIMEOUT,
+        )
+        self.max_retries = max_retries or settings.ZABBIX_MAX_RETRIES
+        self.retry_backoff = (
+            retry_backoff
+            if retry_backoff is not None
+            else settings.ZABBIX_RETRY_BACKOFF
+        )
+        self.verify = verify if verify is not None else settings.ZABBIX_VERIFY_SSL
+        self._request_ids = itertools.count(1)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.pool_size,
+            max_retries=0,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"Content-Type": "application/json-rpc"})
+
+    def call(
+        self,
+        method,
+        params,
+        auth_token=None,
+        timeout=None,
+        max_retries=None,
+        retry_delay=None,
+    ):
+        """
+        Call a Zabbix API method and return its `result`.
+
+        Args:
+            method: JSON-RPC method name, e.g. "host.get"
+            params: Method parameters (dict or list)
+            auth_token: Bearer token, omitted for user.login
+            timeout: Optional (connect, read) timeout override
+            max_retries: Optional override of the pool retry count
+            retry_delay: Optional override of the base backoff delay
+
+        Raises:
+            ZabbixAPIError: The API answered with an error object
+            ZabbixConnectionError: The API was unreachable after all retries
+        """
+        payload = {
+            "jsonrpc": "2.0",
+            "method": method,
+            "params": params,
+            "id": next(self._request_ids),
+        }
+        body = orjson.dumps(payload)
+        headers = {"Authorization": f"Bearer {auth_token}"} if auth_token else None
+        attempts = max_retries or self.max_retries
+        backoff = retry_delay if retry_delay is not None else self.retry_backoff
+        retry_safe = is_retry_safe(method)
+
+        for attempt in range(1, attempts + 1):
+            try:
+                zabbix_logger.debug(
+                    f"Zabbix API call '{method}' (attempt {attempt}/{attempts})"
+                )
+                response = self.session.post(
+                    self.endpoint,
+                    data=body,
+                    headers=headers,
+                    timeout=timeout or self.timeout,
+                    verify=self.verify,
+                )
+                if response.status_code in RETRYABLE_STATUS_CODES:
+                    raise requests.HTTPError(
+                        f"HTTP {response.status_code} from Zabbix API",
+                        response=response,
+                    )
+                return self._decode(method, response)
+
+            except (
+                requests.ConnectionError,
+                requests.Timeout,
+                requests.HTTPError,
+            ) as e:
+                zabbix_logger.warning(
+                    f"Zabbix API call '{method}' failed (attempt {attempt}/{attempts}): {e}"
+                )
+                if not retry_safe and not _not_sent(e):
+                    zabbix_logger.critical(
+                        f"Zabbix API call '{method}' failed and may have been "
+                        f"applied, not retrying"
+                    )
+                    raise ZabbixConnectionError(
+                        "Zabbix API request failed and may have been applied"
+                    )
+                if attempt == attempts:
+                    zabbix_logger.critical(
+                        f"Zabbix API call '{method}' failed after {attempts} attempts"
+                    )
+                    raise ZabbixConnectionError("Failed to connect to Zabbix API")
+                time.sleep(backoff * (2 ** (attempt - 1)))
+
+    def call_with_auth(self, method, params, auth_token=None, **kwargs):
+        """
+        Call a method with the cached admin session.
+
+        `auth_token` may be a token handed over by a caller (e.g. a Celery
+        task argument); when Zabbix rejects the session, the token is dropped
+        from the cache and the call is retried once with a fresh login.
+        """
+        from zabbixproxy.services.zabbix_auth import get_token_manager
+
+        manager = get_token_manager()
+        token = auth_token or manager.get_token()
+        try:
+            return self.call(method, params, auth_token=token, **kwargs)
+        except ZabbixAuthError:
+            zabbix_logger.warning(
+                f"Zabbix session rejected for '{method}', logging in again"
+            )
+            manager.invalidate(token)
+            return self.call(method, params, auth_token=manager.get_token(), **kwargs)
+
+    def _decode(self, method, response):
+        """Parse a JSON-RPC response exactly once and unwrap its result."""
+        return decode_response(method, response.status_code, response.content)
+
+
+def _not_sent(error):
+    """Whether a requests error happened before the request reached Zabbix"""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    if not isinstance(error, requests.ConnectionError) or not error.args:
+        return False
+    reason = getattr(error.args[0], "reason", None)
+    return isinstance(reason, (NewConnectionError, ConnectTimeoutError))
+
+
+def decode_response(method, status_code, content):
+    """
+    Unwrap the `result` of a JSON-RPC response body.
+
+    Shared by the sync and async clients so both raise the same errors.
+    """
+    if status_code >= 400:
+        zabbix_logger.error(f"Zabbix API call '{method}' returned HTTP {status_code}")
+        raise ZabbixAPIError("Zabbix API request failed", code=status_code)
+    if not content:
+        raise ZabbixAPIError("Empty response from Zabbix API")
+
+    try:
+        data = orjson.loads(content)
+    except orjson.JSONDecodeError:
+        zabbix_logger.error(f"Invalid JSON received from Zabbix for '{method}'.")
+        raise ZabbixAPIError("Invalid response from Zabbix API")
+
+    if "error" in data:
+        error_info = data["error"]
+        error_code = error_info.get("code", "N/A")
+        error_message = error_info.get("message", "No message")
+        error_data = error_info.get("data", "")
+        zabbix_logger.error(
+            f"Zabbix API Error [{error_code}]: {error_message} - {error_data}"
+        )
+        error_text = f"{error_message} {error_data}".lower()
+        if any(marker in error_text for marker in AUTH_ERROR_MARKERS):
+            raise ZabbixAuthError(error_message, code=error_code, data=error_data)
+        raise ZabbixAPIError(error_message, code=error_code, data=error_data)
+
+    return data.get("result")
+
+
+_clients = {}
+_clients_pid = None
+_clients_lock = threading.Lock()
+
+
+def get_zabbix_client(api_url=None):
+    """
+    Return the shared `ZabbixClient` for `api_url` in this process.
+
+    Clients are dropped after a fork so Celery prefork children never
+    reuse sockets inherited from their parent.
+    """
+    global _clients_pid
+    api_url = api_url or settings.ZABBIX_API_URL
+    pid = os.getpid()
+
+    with _clients_lock:
+        if _clients_pid != pid:
+            _clients.clear()
+            _clients_pid = pid
+        client = _clients.get(api_url)
+        if client is None:
+            client = _clients[api_url] = ZabbixClient(api_url)
+    return client
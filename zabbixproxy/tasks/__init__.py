@@ -1,3 +1,14 @@
+from zabbixproxy.tasks.agent_upgrade import agent_fleet_upgrade_task
+from zabbixproxy.tasks.bulk_host_creation import (
+    bulk_host_creation_chunk_task,
+    bulk_host_creation_finished_task,
+    bulk_host_creation_workflow,
+)
+from zabbixproxy.tasks.bulk_host_deletion import (
+    bulk_host_deletion_chunk_task,
+    bulk_host_deletion_finished_task,
+    bulk_host_deletion_workflow,
+)
 from zabbixproxy.tasks.host_creation import host_creation_task
 from zabbixproxy.tasks.host_creation.agent_base_host_creation import (
     agent_base_host_creation_task,
@@ -8,7 +19,14 @@ from zabbixproxy.tasks.host_creation.host_creation_workflow import (
 from zabbixproxy.tasks.host_deletion.host_deletion_workflow import (
     host_deletion_workflow,
 )
+from zabbixproxy.tasks.history_mirror import (
+    prune_history_mirror_task,
+    sync_history_mirror_task,
+)
 from zabbixproxy.tasks.host_lifecycle_handlers import (
     update_host_lifecycle_status_failure_task,
     update_host_lifecycle_status_success_task,
 )
+from zabbixproxy.tasks.visualization_snapshot import (
+    refresh_visualization_snapshot_task,
+)
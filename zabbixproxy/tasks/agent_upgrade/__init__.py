@@ -0,0 +1 @@
+from zabbixproxy.tasks.agent_upgrade.agent_upgrade import agent_fleet_upgrade_task
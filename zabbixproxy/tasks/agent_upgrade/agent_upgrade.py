@@ -0,0 +1,156 @@
+import logging
+
+from celery import shared_task
+from django.db import transaction
+
+from utils import ServiceErrorHandler
+from zabbixproxy.functions.automation_functions import (
+    agent_upgrade_lock,
+    extend_agent_upgrade_lock,
+    release_agent_upgrade_lock,
+    task_status_progress,
+    upgrade_zabbix_agents,
+)
+from zabbixproxy.models import HostCredentials, HostLifecycle, TaskStatus
+
+celery_logger = logging.getLogger("celery")
+
+
+@shared_task
+def agent_fleet_upgrade_task(
+    task_status_id,
+    organization_id,
+    serial=None,
+    max_fail_percentage=None,
+    forks=None,
+    reconfigure_only=False,
+):
+    """
+    Upgrade or reconfigure the Zabbix agent of every active host of an
+    organization that has credentials, in rolling batches
+
+    The TaskStatus follows the run task by task and ends with the upgraded
+    and failed hosts, failed hosts marked `aborted` when the failure
+    threshold stopped them before their health check; each host's
+    HostLifecycle message tells its result. The organization's upgrade lock,
+    taken by the view, is held until the task ends.
+    """
+    lock = agent_upgrade_lock(organization_id, token=task_status_id)
+    try:
+        _upgrade(
+            task_status_id,
+            organization_id,
+            lock,
+            serial=serial,
+            max_fail_percentage=max_fail_percentage,
+            forks=forks,
+            reconfigure_only=reconfigure_only,
+        )
+    finally:
+        release_agent_upgrade_lock(lock)
+
+
+def _upgrade(
+    task_status_id,
+    organization_id,
+    lock,
+    serial,
+    max_fail_percentage,
+    forks,
+    reconfigure_only,
+):
+    extend_agent_upgrade_lock(lock)
+    task_status = TaskStatus.objects.get(pk=task_status_id)
+    task_status.update_status("in_progress")
+
+    lifecycles = list(
+        HostLifecycle.objects.select_related("host").filter(
+            status="active", host__host_group__belongs_to=organization_id
+        )
+    )
+    credentials = {
+        credential.host_id: credential
+        for credential in HostCredentials.objects.filter(
+            host__in=[lifecycle.host_id for lifecycle in lifecycles]
+        )
+    }
+    lifecycles = [
+        lifecycle for lifecycle in lifecycles if lifecycle.host_id in credentials
+    ]
+    if not lifecycles:
+        task_status.update_status(
+            "completed", error_message="No active hosts with credentials to upgrade"
+        )
+        return
+
+    action = "reconfiguration" if reconfigure_only else "upgrade"
+    progress = task_status_progress(task_status)
+
+    def on_progress(collector):
+        progress(collector)
+        extend_agent_upgrade_lock(lock)
+
+    try:
+        results = upgrade_zabbix_agents(
+            [
+                {
+                    "hostname": lifecycle.host.host,
+                    "target_host": lifecycle.host.ip or lifecycle.host.dns,
+                    "username": credentials[lifecycle.host_id].username,
+                    "password": credentials[lifecycle.host_id].password,
+                }
+                for lifecycle in lifecycles
+            ],
+            serial=serial,
+            max_fail_percentage=max_fail_percentage,
+            forks=forks,
+            reconfigure_only=reconfigure_only,
+            on_progress=on_progress,
+        )
+    except ServiceErrorHandler as e:
+        celery_logger.error(f"Agent {action} {task_status_id} failed: {e}")
+        task_status.update_status("failed", error_message=str(e))
+        return
+
+    upgraded, failed = [], []
+    for lifecycle in lifecycles:
+        result = results[lifecycle.host.host]
+        if result["overall_success"]:
+            lifecycle.status_message = f"Zabbix agent {action} succeeded."
+            upgraded.append(lifecycle.host.host)
+            continue
+        error = "; ".join(
+            f"{e['task']}: {e['details']}"
+            for e in result["unsuccessfully_executed_tasks"]
+        )
+        outcome = "aborted" if result["aborted"] else "failed"
+        lifecycle.status_message = f"Zabbix agent {action} {outcome}: {error}"
+        failed.append(
+            {"host": lifecycle.host.host, "error": error, "aborted": result["aborted"]}
+        )
+
+    with transaction.atomic():
+        HostLifecycle.objects.bulk_update(lifecycles, ["status_message"])
+        HostLifecycle.publish_many(lifecycles)
+
+    task_status.update_status(
+        "failed" if failed else "completed",
+        successfully_executed_tasks=upgraded,
+        unsuccessfully_executed_tasks=failed,
+        successful_task=len(upgraded),
+        faild_task=len(failed),
+        error_message=_failure_summary(failed, action),
+    )
+    celery_logger.info(
+        f"Agent {action} {task_status_id} finished: {len(upgraded)} hosts ok, {len(failed)} not"
+    )
+
+
+def _failure_summary(failed, action):
+    if not failed:
+        return None
+    aborted = sum(1 for host in failed if host["aborted"])
+    summary = f"{len(failed) - aborted} hosts failed the {action}"
+    if aborted:
+        summary += f", {aborted} were aborted by the failure threshold"
+    return summary
@@ -0,0 +1,5 @@
+from zabbixproxy.tasks.bulk_host_creation.bulk_host_creation import (
+    bulk_host_creation_chunk_task,
+    bulk_host_creation_finished_task,
+    bulk_host_creation_workflow,
+)
@@ -0,0 +1,211 @@
+import logging
+
+from celery import chord, shared_task
+from django.conf import settings
+from django.db import transaction
+
+from utils import ServiceErrorHandler
+from zabbixproxy.functions.automation_functions import (
+    deploy_zabbix_agents,
+    task_status_progress,
+)
+from zabbixproxy.functions.host_functions import (
+    bulk_host_creation,
+    host_create_params,
+)
+from zabbixproxy.models import Host, HostCredentials, HostLifecycle, TaskStatus
+
+celery_logger = logging.getLogger("celery")
+
+
+@shared_task
+def bulk_host_creation_workflow(task_status_id, hosts, hostgroup):
+    """
+    Create the Zabbix hosts of a bulk onboarding request
+
+    Hosts with credentials first get the Zabbix agent, all of them with one
+    Ansible run; hosts the agent could not be deployed to are not created.
+    Then one `bulk_host_creation_chunk_task` per ZABBIX_HOST_CREATE_CHUNK_SIZE
+    hosts runs as a Celery group; `bulk_host_creation_finished_task` records
+    the outcome in the request's TaskStatus once all chunks are done.
+
+    Args:
+        task_status_id: TaskStatus of the request
+        hosts (list): {"host_lifecycle_id", "templates"} per host
+        hostgroup: Zabbix host group of the organization
+    """
+    task_status = TaskStatus.objects.get(pk=task_status_id)
+    task_status.update_status("in_progress")
+    hosts, failed = _deploy_agents(hosts, task_status)
+
+    size = settings.ZABBIX_HOST_CREATE_CHUNK_SIZE
+    chunks = [hosts[i : i + size] for i in range(0, len(hosts), size)]
+    finished = bulk_host_creation_finished_task.s(task_status_id, failed)
+    if chunks:
+        chord(bulk_host_creation_chunk_task.s(chunk, hostgroup) for chunk in chunks)(
+            finished
+        )
+    else:
+        finished.delay([])
+    celery_logger.info(
+        f"Bulk host creation {task_status_id}: {len(hosts)} hosts in {len(chunks)} chunks"
+    )
+
+
+@shared_task
+def bulk_host_creation_chunk_task(hosts, hostgroup):
+    """
+    Create one chunk of hosts with an array-valued host.create call and
+    record each host's result in its HostLifecycle
+
+    Never raises, so a failing chunk does not keep the chord from finishing.
+
+    Returns:
+        dict: {"created": [host names], "failed": [{"host", "error"}]}
+    """
+    templates = {host["host_lifecycle_id"]: host["templates"] for host in hosts}
+    lifecycles = list(
+        HostLifecycle.objects.select_related("host").filter(pk__in=templates)
+    )
+    params = [
+        host_create_params(
+            host_name=lifecycle.host.host,
+            hostgroup=hostgroup,
+            template_list=templates[lifecycle.pk],
+            ip=lifecycle.host.ip or "",
+            dns=lifecycle.host.dns or "",
+        )
+        for lifecycle in lifecycles
+    ]
+
+    try:
+        results = bulk_host_creation(params)
+    except ServiceErrorHandler as e:
+        celery_logger.error(f"Bulk host creation of {len(params)} hosts failed: {e}")
+        results = [(None, str(e))] * len(params)
+    except Exception as e:
+        celery_logger.exception(f"Unexpected error in bulk host creation: {e}")
+        results = [(None, "Unexpected error while creating the host")] * len(params)
+
+    created, failed = [], []
+    for lifecycle, (hostid, error) in zip(lifecycles, results):
+        if hostid:
+            lifecycle.host.host_id = hostid
+            lifecycle.status = "active"
+            lifecycle.status_message = "Host created successfully."
+            created.append(lifecycle.host.host)
+        else:
+            lifecycle.status = "creation_failed"
+            lifecycle.status_message = (
+                f"error while creating host for {lifecycle.host.host}: {error}"
+            )
+            failed.append({"host": lifecycle.host.host, "error": error})
+
+    with transaction.atomic():
+        Host.objects.bulk_update(
+            [lifecycle.host for lifecycle in lifecycles if lifecycle.host.host_id],
+            ["host_id"],
+        )
+        HostLifecycle.objects.bulk_update(lifecycles, ["status", "status_message"])
+        HostLifecycle.publish_many(lifecycles)
+
+    celery_logger.info(
+        f"Bulk host creation chunk: {len(created)} created, {len(failed)} failed"
+    )
+    return {"created": created, "failed": failed}
+
+
+@shared_task
+def bulk_host_creation_finished_task(results, task_status_id, failed=None):
+    """Record the outcome of all chunks in the request's TaskStatus"""
+    created = [host for result in results for host in result["created"]]
+    failed = (failed or []) + [host for result in results for host in result["failed"]]
+    TaskStatus.objects.get(pk=task_status_id).update_status(
+        "failed" if not created else "completed",
+        successfully_executed_tasks=created,
+        unsuccessfully_executed_tasks=failed,
+        successful_task=len(created),
+        faild_task=len(failed),
+        error_message=f"{len(failed)} hosts could not be created" if failed else None,
+    )
+    celery_logger.info(
+        f"Bulk host creation {task_status_id} finished: {len(created)} created, {len(failed)} failed"
+    )
+
+
+def _deploy_agents(hosts, task_status):
+    """
+    Deploy the Zabbix agent to the hosts with credentials in one Ansible run
+
+    While the playbook runs, the TaskStatus counts its finished Ansible tasks
+    and lists the latest ones and the failed ones.
+
+    Returns:
+        tuple: (hosts to create in Zabbix, [{"host", "error"}] of the hosts
+            the agent could not be deployed to)
+    """
+    lifecycles = {
+        lifecycle.pk: lifecycle
+        for lifecycle in HostLifecycle.objects.select_related("host").filter(
+            pk__in=[host["host_lifecycle_id"] for host in hosts]
+        )
+    }
+    credentials = {
+        credential.host_id: credential
+        for credential in HostCredentials.objects.filter(
+            host__in=[lifecycle.host_id for lifecycle in lifecycles.values()]
+        )
+    }
+    targets = [
+        lifecycle
+        for lifecycle in lifecycles.values()
+        if lifecycle.host_id in credentials
+    ]
+    if not targets:
+        return hosts, []
+
+    try:
+        results = deploy_zabbix_agents(
+            [
+                {
+                    "hostname": lifecycle.host.host,
+                    "target_host": lifecycle.host.ip or lifecycle.host.dns,
+                    "username": credentials[lifecycle.host_id].username,
+                    "password": credentials[lifecycle.host_id].password,
+                }
+                for lifecycle in targets
+            ],
+            tags="install",
+            preflight=settings.AGENT_PREFLIGHT_ENABLED,
+            on_progress=task_status_progress(task_status),
+        )
+    except ServiceErrorHandler as e:
+        celery_logger.error(f"Fleet agent deployment failed: {e}")
+        results = {}
+
+    failed_ids, failed = set(), []
+    for lifecycle in targets:
+        result = results.get(lifecycle.host.host)
+        if result and result["overall_success"]:
+            lifecycle.status_message = "Zabbix agent deployed, creating host."
+            continue
+        errors = (result or {}).get("unsuccessfully_executed_tasks") or [
+            {"task": "Ansible run", "details": "Zabbix agent deployment failed"}
+        ]
+        error = "; ".join(f"{e['task']}: {e['details']}" for e in errors)
+        lifecycle.status = "creation_failed"
+        lifecycle.status_message = (
+            f"error while creating host for {lifecycle.host.host}: {error}"
+        )
+        failed_ids.add(lifecycle.pk)
+        failed.append({"host": lifecycle.host.host, "error": error})
+
+    with transaction.atomic():
+        HostLifecycle.objects.bulk_update(targets, ["status", "status_message"])
+        HostLifecycle.publish_many(targets)
+    celery_logger.info(
+        f"Zabbix agent deployed to {len(targets) - len(failed)} of {len(targets)} hosts"
+    )
+    return [
+        host for host in hosts if host["host_lifecycle_id"] not in failed_ids
+    ], failed
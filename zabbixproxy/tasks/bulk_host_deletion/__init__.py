@@ -0,0 +1,5 @@
+from zabbixproxy.tasks.bulk_host_deletion.bulk_host_deletion import (
+    bulk_host_deletion_chunk_task,
+    bulk_host_deletion_finished_task,
+    bulk_host_deletion_workflow,
+)
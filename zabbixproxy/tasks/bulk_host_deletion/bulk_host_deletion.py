@@ -0,0 +1,175 @@
+import logging
+
+from celery import chord, shared_task
+from django.conf import settings
+from django.db import transaction
+
+from utils import ServiceErrorHandler
+from zabbixproxy.functions.host_functions import bulk_host_deletion, existing_host_ids
+from zabbixproxy.models import Host, HostLifecycle, TaskStatus
+
+celery_logger = logging.getLogger("celery")
+
+
+@shared_task
+def bulk_host_deletion_workflow(task_status_id, local_host_ids):
+    """
+    Delete the Zabbix hosts of many local hosts
+
+    Existence of all hosts is checked with one host.get; hosts missing in
+    Zabbix are marked deletion_failed right away, and so are all hosts, with
+    the lookup's error, when that host.get fails. The others are deleted by
+    one `bulk_host_deletion_chunk_task` per ZABBIX_HOST_DELETE_CHUNK_SIZE hosts,
+    run as a Celery group, and `bulk_host_deletion_finished_task` records
+    the per-host outcome in the request's TaskStatus.
+
+    Args:
+        task_status_id: TaskStatus of the request
+        local_host_ids (list): Host primary keys, all with a Zabbix host_id
+    """
+    task_status = TaskStatus.objects.get(pk=task_status_id)
+    task_status.update_status("in_progress")
+    lifecycles = list(
+        HostLifecycle.objects.select_related("host").filter(host__pk__in=local_host_ids)
+    )
+    _update_lifecycles(
+        lifecycles,
+        lambda lifecycle: (
+            "deletion_in_progress",
+            "Host deletion workflow initiated and in progress.",
+        ),
+    )
+
+    hosts = Host.objects.filter(pk__in=local_host_ids).values_list("host_id", "host")
+    host_names = {str(host_id): name for host_id, name in hosts}
+    try:
+        existing = existing_host_ids(list(host_names))
+    except ServiceErrorHandler as e:
+        celery_logger.error(f"Bulk host deletion {task_status_id} failed: {e}")
+        existing = set()
+        lookup_error = str(e)
+    else:
+        lookup_error = None
+
+    # Hosts not deleted up front: missing in Zabbix, or all of them when
+    # the lookup failed, in which case they may well still exist
+    missing = [host_id for host_id in host_names if host_id not in existing]
+    failed = [
+        {"host": host_names[h], "error": lookup_error or "Host not found in Zabbix"}
+        for h in missing
+    ]
+    _update_lifecycles(
+        [
+            lifecycle
+            for lifecycle in lifecycles
+            if str(lifecycle.host.host_id) in missing
+        ],
+        lambda lifecycle: (
+            "deletion_failed",
+            (
+                f"Host ID {lifecycle.host.host_id} deletion unsuccessful: "
+                f"{lookup_error}"
+                if lookup_error
+                else f"Host with ID {lifecycle.host.host_id} not found."
+            ),
+        ),
+    )
+
+    size = settings.ZABBIX_HOST_DELETE_CHUNK_SIZE
+    host_ids = [host_id for host_id in host_names if host_id in existing]
+    chunks = [host_ids[i : i + size] for i in range(0, len(host_ids), size)]
+    finished = bulk_host_deletion_finished_task.s(task_status_id, failed)
+    if chunks:
+        chord(bulk_host_deletion_chunk_task.s(chunk) for chunk in chunks)(finished)
+    else:
+        finished.delay([])
+    celery_logger.info(
+        f"Bulk host deletion {task_status_id}: {len(host_ids)} hosts in "
+        f"{len(chunks)} chunks, {len(missing)} "
+        f"{'not checked' if lookup_error else 'not found'}"
+    )
+
+
+@shared_task
+def bulk_host_deletion_chunk_task(host_ids):
+    """
+    Delete one chunk of Zabbix hosts with an array-valued host.delete call and
+    record each host's result in its HostLifecycle
+
+    Never raises, so a failing chunk does not keep the chord from finishing.
+
+    Returns:
+        dict: {"deleted": [host names], "failed": [{"host", "error"}]}
+    """
+    try:
+        results = bulk_host_deletion(host_ids)
+    except ServiceErrorHandler as e:
+        celery_logger.error(f"Bulk host deletion of {len(host_ids)} hosts failed: {e}")
+        results = {host_id: str(e) for host_id in host_ids}
+    except Exception as e:
+        celery_logger.exception(f"Unexpected error in bulk host deletion: {e}")
+        results = {
+            host_id: "Unexpected error while deleting the host" for host_id in host_ids
+        }
+
+    lifecycles = list(
+        HostLifecycle.objects.select_related("host").filter(
+            host__host_id__in=[int(host_id) for host_id in host_ids]
+        )
+    )
+    _update_lifecycles(
+        lifecycles,
+        lambda lifecycle: (
+            ("inactive", f"Host ID {lifecycle.host.host_id} deleted successfully.")
+            if results.get(str(lifecycle.host.host_id)) is None
+            else (
+                "deletion_failed",
+                f"Host ID {lifecycle.host.host_id} deletion unsuccessful: "
+                f"{results[str(lifecycle.host.host_id)]}",
+            )
+        ),
+    )
+
+    names = dict(
+        Host.objects.filter(
+            host_id__in=[int(host_id) for host_id in host_ids]
+        ).values_list("host_id", "host")
+    )
+    deleted, failed = [], []
+    for host_id, error in results.items():
+        name = names.get(int(host_id), host_id)
+        if error is None:
+            deleted.append(name)
+        else:
+            failed.append({"host": name, "error": error})
+    celery_logger.info(
+        f"Bulk host deletion chunk: {len(deleted)} deleted, {len(failed)} failed"
+    )
+    return {"deleted": deleted, "failed": failed}
+
+
+@shared_task
+def bulk_host_deletion_finished_task(results, task_status_id, failed=None):
+    """Record the outcome of all chunks in the request's TaskStatus"""
+    deleted = [host for result in results for host in result["deleted"]]
+    failed = (failed or []) + [host for result in results for host in result["failed"]]
+    TaskStatus.objects.get(pk=task_status_id).update_status(
+        "failed" if not deleted else "completed",
+        successfully_executed_tasks=deleted,
+        unsuccessfully_executed_tasks=failed,
+        successful_task=len(deleted),
+        faild_task=len(failed),
+        error_message=f"{len(failed)} hosts could not be deleted" if failed else None,
+    )
+    celery_logger.info(
+        f"Bulk host deletion {task_status_id} finished: {len(deleted)} deleted, {len(failed)} failed"
+    )
+
+
+def _update_lifecycles(lifecycles, status_of):
+    """Set (status, status_message) = status_of(lifecycle) with one query"""
+    for lifecycle in lifecycles:
+        lifecycle.status, lifecycle.status_message = status_of(lifecycle)
+    with transaction.atomic():
+        HostLifecycle.objects.bulk_update(lifecycles, ["status", "status_message"])
+        HostLifecycle.publish_many(lifecycles)
@@ -0,0 +1,4 @@
+from zabbixproxy.tasks.history_mirror.history_mirror import (
+    prune_history_mirror_task,
+    sync_history_mirror_task,
+)
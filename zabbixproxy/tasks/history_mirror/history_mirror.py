@@ -0,0 +1,60 @@
+import logging
+
+import redis
+from celery import shared_task
+from django.conf import settings
+from redis.exceptions import LockError
+
+from utils import ServiceErrorHandler, get_redis
+from zabbixproxy.functions.history_mirror_functions import (
+    prune_history_mirror,
+    sync_history_mirror,
+)
+
+celery_logger = logging.getLogger("celery")
+
+SYNC_LOCK_KEY = "monipro:history_mirror:sync"
+
+
+@shared_task(ignore_result=True)
+def sync_history_mirror_task():
+    """
+    Periodic (Celery beat) incremental sync of the local history mirror.
+    Only one sync runs at a time; a beat tick during a long sync is skipped.
+    The lock expires after HISTORY_MIRROR_SYNC_SECONDS * 10 without
+    progress and is renewed after every page synced.
+    """
+    timeout = settings.HISTORY_MIRROR_SYNC_SECONDS * 10
+    lock = get_redis().lock(SYNC_LOCK_KEY, timeout=timeout)
+    try:
+        if not lock.acquire(blocking=False):
+            celery_logger.info("History mirror sync already running, skipping")
+            return
+    except redis.RedisError as e:
+        celery_logger.warning(f"Could not take history mirror lock: {e}")
+        return
+
+    try:
+        stats = sync_history_mirror(on_page=lambda: _extend(lock, timeout))
+        celery_logger.info(f"History mirror sync done: {stats}")
+    except ServiceErrorHandler as e:
+        celery_logger.error(f"History mirror sync failed, resuming next run: {e}")
+    finally:
+        try:
+            lock.release()
+        except (redis.RedisError, LockError) as e:
+            celery_logger.warning(f"Could not release history mirror lock: {e}")
+
+
+def _extend(lock, timeout):
+    try:
+        lock.extend(timeout, replace_ttl=True)
+    except (redis.RedisError, LockError) as e:
+        celery_logger.warning(f"Could not extend history mirror lock: {e}")
+
+
+@shared_task(ignore_result=True)
+def prune_history_mirror_task():
+    """Apply MONIPRO_HISTORY_DAYS retention to the local history mirror."""
+    deleted = prune_history_mirror()
+    celery_logger.info(f"History mirror retention removed {deleted} chunks")
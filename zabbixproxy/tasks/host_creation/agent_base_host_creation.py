@@ -1,14 +1,17 @@
 import logging
 import re
+import uuid
 from typing import Any, Dict, Optional, cast
 
 from celery import shared_task
+from django.conf import settings
 
 from utils import ServiceErrorHandler
 from zabbixproxy.functions.automation_functions.ansibal_runner import (
     create_zabbix_agent,
+    task_status_progress,
 )
-from zabbixproxy.models import Host, HostLifecycle
+from zabbixproxy.models import Host, HostLifecycle, TaskStatus
 
 celery_logger = logging.getLogger("celery")
 
@@ -73,6 +76,17 @@ def agent_base_host_creation_task(
             host_lifecycle.save()
         raise ServiceErrorHandler(error_msg)
 
+    task_status, _ = TaskStatus.objects.update_or_create(
+        task_id=self.request.id or str(uuid.uuid4()),
+        defaults={
+            "user": host.host_group.created_by if host.host_group else None,
+            "task_type": "zabbix_agent_deployment",
+            "host_ip": ip,
+            "dns": dns,
+            "status": "in_progress",
+        },
+    )
+
     try:
 
         agent_response = create_zabbix_agent(
@@ -82,6 +96,8 @@ def agent_base_host_creation_task(
             hostname=host_name,
             password=host_password,
             tags="install",
+            preflight=settings.AGENT_PREFLIGHT_ENABLED,
+            on_progress=task_status_progress(task_status),
         )
 
         overall_success = agent_response.get("overall_success", False)
@@ -111,6 +127,7 @@ def agent_base_host_creation_task(
         celery_logger.info(
             f"HostLifecycle {host_lifecycle_id}: Zabbix agent deployed successfully for host '{host_name}'."
         )
+        task_status.update_status("completed")
 
         return {
             "status": "success",
@@ -133,46 +150,20 @@ def agent_base_host_creation_task(
         error_msg = (
             f"Error in agent_base_host_creation_task (agent deployment): {str(e)}"
         )
-        if self.request.retries < self.max_retries and (
-            "not authorized" in str(e).lower() or "session terminated" in str(e).lower()
-        ):
-            celery_logger.warning(
-                f"Retrying task {self.request.id} for HostLifecycle {host_lifecycle_id} (attempt {self.request.retries + 1}/{self.max_retries}): {error_msg}"
-            )
-            if host_lifecycle:
-                host_lifecycle.status_message = (
-                    f"Retrying agent deployment: {error_msg}"
-                )
-                host_lifecycle.save()
-            raise self.retry(countdown=5, exc=e)
-        else:
-            celery_logger.error(
-                f"HostLifecycle {host_lifecycle_id} failed after retries: {error_msg}"
-            )
-            if host_lifecycle:
-                host_lifecycle.status_message = lifecycle_err_msg
-                host_lifecycle.save()
-            raise ServiceErrorHandler(error_msg)
+        celery_logger.error(f"HostLifecycle {host_lifecycle_id} failed: {error_msg}")
+        task_status.update_status("failed", error_message=error_msg)
+        if host_lifecycle:
+            host_lifecycle.status_message = lifecycle_err_msg
+            host_lifecycle.save()
+        raise ServiceErrorHandler(error_msg)
 
     except Exception as e:
         error_msg = f"Unexpected error in agent_base_host_creation_task (agent deployment): {str(e)}"
-        if self.request.retries < self.max_retries and (
-            "not authorized" in str(e).lower() or "session terminated" in str(e).lower()
-        ):
-            celery_logger.warning(
-                f"Retrying task {self.request.id} for HostLifecycle {host_lifecycle_id} (attempt {self.request.retries + 1}/{self.max_retries}): {error_msg}"
-            )
-            if host_lifecycle:
-                host_lifecycle.status_message = (
-                    f"Retrying agent deployment due to unexpected error: {error_msg}"
-                )
-                host_lifecycle.save()
-            raise self.retry(countdown=5, exc=e)
-        else:
-            celery_logger.error(
-                f"HostLifecycle {host_lifecycle_id} failed after retries due to unexpected error: {error_msg}"
-            )
-            if host_lifecycle:
-                host_lifecycle.status_message = lifecycle_err_msg
-                host_lifecycle.save()
-            raise ServiceErrorHandler(error_msg)
+        celery_logger.error(
+            f"HostLifecycle {host_lifecycle_id} failed due to unexpected error: {error_msg}"
+        )
+        task_status.update_status("failed", error_message=error_msg)
+        if host_lifecycle:
+            host_lifecycle.status_message = lifecycle_err_msg
+            host_lifecycle.save()
+        raise ServiceErrorHandler(error_msg)
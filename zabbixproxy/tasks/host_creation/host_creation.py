@@ -116,42 +116,18 @@ def host_creation_task(self, prev_task_result: Dict[str, Any]):
 
     except ServiceErrorHandler as e:
         error_msg = f"Error creating Zabbix host: {str(e)}"
-        if self.request.retries < self.max_retries and (
-            "not authorized" in str(e).lower() or "session terminated" in str(e).lower()
-        ):
-            celery_logger.warning(
-                f"Retrying task {self.request.id} for HostLifecycle {host_lifecycle_id} (attempt {self.request.retries + 1}/{self.max_retries}): {error_msg}"
-            )
-            if host_lifecycle:
-                host_lifecycle.status_message = lifecycle_err_msg
-                host_lifecycle.save()
-            raise self.retry(countdown=5, exc=e)
-        else:
-            celery_logger.error(
-                f"HostLifecycle {host_lifecycle_id} failed after retries: {error_msg}"
-            )
-            if host_lifecycle:
-                host_lifecycle.status_message = lifecycle_err_msg
-                host_lifecycle.save()
-            raise ServiceErrorHandler(error_msg)
+        celery_logger.error(f"HostLifecycle {host_lifecycle_id} failed: {error_msg}")
+        if host_lifecycle:
+            host_lifecycle.status_message = lifecycle_err_msg
+            host_lifecycle.save()
+        raise ServiceErrorHandler(error_msg)
 
     except Exception as e:
         error_msg = f"Unexpected error creating host: {str(e)}"
-        if self.request.retries < self.max_retries and (
-            "not authorized" in str(e).lower() or "session terminated" in str(e).lower()
-        ):
-            celery_logger.warning(
-                f"Retrying task {self.request.id} for HostLifecycle {host_lifecycle_id} (attempt {self.request.retries + 1}/{self.max_retries}): {error_msg}"
-            )
-            if host_lifecycle:
-                host_lifecycle.status_message = lifecycle_err_msg
-                host_lifecycle.save()
-            raise self.retry(countdown=5, exc=e)
-        else:
-            celery_logger.error(
-                f"HostLifecycle {host_lifecycle_id} failed after retries due to unexpected error: {error_msg}"
-            )
-            if host_lifecycle:
-                host_lifecycle.status_message = lifecycle_err_msg
-                host_lifecycle.save()
-            raise ServiceErrorHandler(error_msg)
+        celery_logger.error(
+            f"HostLifecycle {host_lifecycle_id} failed due to unexpected error: {error_msg}"
+        )
+        if host_lifecycle:
+            host_lifecycle.status_message = lifecycle_err_msg
+            host_lifecycle.save()
+        raise ServiceErrorHandler(error_msg)
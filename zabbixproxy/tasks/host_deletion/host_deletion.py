@@ -61,21 +61,8 @@ def host_deletion_task(self, prev_task_output: Dict[str, Any]):
         )
 
     except ServiceErrorHandler as e:
-        retries = getattr(self.request, "retries", 0)
         error_msg = str(e)
 
-        if retries < self.max_retries and (
-            "not authorized" in error_msg.lower()
-            or "session terminated" in error_msg.lower()
-        ):
-            celery_logger.warning(
-                f"Retrying deletion task for HostLifecycle {host_lifecycle_id} (attempt {retries + 1}): {error_msg}"
-            )
-            if host_lifecycle:
-                host_lifecycle.status_message = lifecycle_err_msg
-                host_lifecycle.save()
-            raise self.retry(countdown=5, exc=e)
-
         celery_logger.error(
             f"HostLifecycle {host_lifecycle_id} deletion failed: {error_msg}"
         )
@@ -88,19 +75,6 @@ def host_deletion_task(self, prev_task_output: Dict[str, Any]):
 
     except Exception as e:
         error_msg = str(e)
-        retries = getattr(self.request, "retries", 0)
-
-        if retries < self.max_retries and (
-            "not authorized" in error_msg.lower()
-            or "session terminated" in error_msg.lower()
-        ):
-            celery_logger.warning(
-                f"Retrying deletion task for HostLifecycle {host_lifecycle_id} (attempt {retries + 1}): {error_msg}"
-            )
-            if host_lifecycle:
-                host_lifecycle.status_message = lifecycle_err_msg
-                host_lifecycle.save()
-            raise self.retry(countdown=5, exc=e)
 
         celery_logger.error(
             f"HostLifecycle {host_lifecycle_id} deletion failed: {error_msg}"
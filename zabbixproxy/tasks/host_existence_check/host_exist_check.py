@@ -66,52 +66,22 @@ def check_host_existance_task(self, initial_task_params: Dict[str, Any]):
 
     except ServiceErrorHandler as e:
         error_msg = str(e)
-        retries = getattr(self.request, "retries", 0)
-
-        if retries < self.max_retries and (
-            "not authorized" in error_msg.lower()
-            or "session terminated" in error_msg.lower()
-        ):
-            celery_logger.warning(
-                f"Retrying task {self.request.id} for HostLifecycle {host_lifecycle_id} "
-                f"(attempt {retries + 1}/{self.max_retries}) due to auth error: {error_msg}"
-            )
-            if host_lifecycle:
-                host_lifecycle.status_message = lifecycle_err_msg
-                host_lifecycle.save()
-            raise self.retry(countdown=5, exc=e)
-        else:
-            celery_logger.error(
-                f"HostLifecycle {host_lifecycle_id} failed after retries: {error_msg}"
-            )
-            if host_lifecycle:
-                host_lifecycle.status = "deletion_failed"
-                host_lifecycle.status_message = lifecycle_err_msg
-                host_lifecycle.save()
-            raise ServiceErrorHandler(error_msg)
+
+        celery_logger.error(f"HostLifecycle {host_lifecycle_id} failed: {error_msg}")
+        if host_lifecycle:
+            host_lifecycle.status = "deletion_failed"
+            host_lifecycle.status_message = lifecycle_err_msg
+            host_lifecycle.save()
+        raise ServiceErrorHandler(error_msg)
 
     except Exception as e:
         error_msg = str(e)
-        retries = getattr(self.request, "retries", 0)
-
-        if retries < self.max_retries and (
-            "not authorized" in error_msg.lower()
-            or "session terminated" in error_msg.lower()
-        ):
-            celery_logger.warning(
-                f"Retrying task {self.request.id} for HostLifecycle {host_lifecycle_id} "
-                f"(attempt {retries + 1}/{self.max_retries}) due to unexpected auth error: {error_msg}"
-            )
-            if host_lifecycle:
-                host_lifecycle.status_message = lifecycle_err_msg
-                host_lifecycle.save()
-            raise self.retry(countdown=5, exc=e)
-        else:
-            celery_logger.error(
-                f"HostLifecycle {host_lifecycle_id} failed due to unexpected error: {error_msg}"
-            )
-            if host_lifecycle:
-                host_lifecycle.status = "deletion_failed"
-                host_lifecycle.status_message = lifecycle_err_msg
-                host_lifecycle.save()
-            raise ServiceErrorHandler(error_msg)
+
+        celery_logger.error(
+            f"HostLifecycle {host_lifecycle_id} failed due to unexpected error: {error_msg}"
+        )
+        if host_lifecycle:
+            host_lifecycle.status = "deletion_failed"
+            host_lifecycle.status_message = lifecycle_err_msg
+            host_lifecycle.save()
+        raise ServiceErrorHandler(error_msg)
@@ -51,26 +51,10 @@ def create_zabbix_template(
 
     except ServiceErrorHandler as e:
         error_msg = f"Error creating Zabbix Template: {str(e)}"
-        if self.request.retries < self.max_retries and (
-            "not authorized" in str(e).lower() or "session terminated" in str(e).lower()
-        ):
-            celery_logger.warning(
-                f"Retrying task {self.request.id} for TemplateMirror (attempt {self.request.retries + 1}/{self.max_retries}): {error_msg}"
-            )
-            raise self.retry(countdown=5, exc=e)
-        else:
-            celery_logger.error(f"TemplateMirror failed after retries: {error_msg}")
-            raise ServiceErrorHandler(error_msg)
+        celery_logger.error(f"TemplateMirror failed: {error_msg}")
+        raise ServiceErrorHandler(error_msg)
 
     except Exception as e:
         error_msg = f"Unexpected error creating template: {str(e)}"
-        if self.request.retries < self.max_retries and (
-            "not authorized" in str(e).lower() or "session terminated" in str(e).lower()
-        ):
-            celery_logger.warning(
-                f"Retrying task {self.request.id} for TemplateMirror (attempt {self.request.retries + 1}/{self.max_retries}): {error_msg}"
-            )
-            raise self.retry(countdown=5, exc=e)
-        else:
-            celery_logger.error(f"TemplateMirror failed after retries: {error_msg}")
-            raise ServiceErrorHandler(error_msg)
+        celery_logger.error(f"TemplateMirror failed: {error_msg}")
+        raise ServiceErrorHandler(error_msg)
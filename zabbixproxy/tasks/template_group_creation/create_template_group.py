@@ -51,30 +51,10 @@ def create_zabbix_template_group(
 
     except ServiceErrorHandler as e:
         error_msg = f"Error creating Zabbix Template group: {str(e)}"
-        if self.request.retries < self.max_retries and (
-            "not authorized" in str(e).lower() or "session terminated" in str(e).lower()
-        ):
-            celery_logger.warning(
-                f"Retrying task {self.request.id} for TemplateGroupMirror (attempt {self.request.retries + 1}/{self.max_retries}): {error_msg}"
-            )
-            raise self.retry(countdown=5, exc=e)
-        else:
-            celery_logger.error(
-                f"TemplateGroupMirror failed after retries: {error_msg}"
-            )
-            raise ServiceErrorHandler(error_msg)
+        celery_logger.error(f"TemplateGroupMirror failed: {error_msg}")
+        raise ServiceErrorHandler(error_msg)
 
     except Exception as e:
         error_msg = f"Unexpected error creating template group: {str(e)}"
-        if self.request.retries < self.max_retries and (
-            "not authorized" in str(e).lower() or "session terminated" in str(e).lower()
-        ):
-            celery_logger.warning(
-                f"Retrying task {self.request.id} for TemplateGroupMirror (attempt {self.request.retries + 1}/{self.max_retries}): {error_msg}"
-            )
-            raise self.retry(countdown=5, exc=e)
-        else:
-            celery_logger.error(
-                f"TemplateGroupMirror failed after retries: {error_msg}"
-            )
-            raise ServiceErrorHandler(error_msg)
+        celery_logger.error(f"TemplateGroupMirror failed: {error_msg}")
+        raise ServiceErrorHandler(error_msg)
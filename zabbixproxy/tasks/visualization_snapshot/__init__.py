@@ -0,0 +1,3 @@
+from zabbixproxy.tasks.visualization_snapshot.refresh_snapshot import (
+    refresh_visualization_snapshot_task,
+)
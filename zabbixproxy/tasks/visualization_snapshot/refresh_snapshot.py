@@ -0,0 +1,37 @@
+import logging
+
+from celery import shared_task
+
+from utils import ServiceErrorHandler
+from zabbixproxy.functions.visualization_functions.snapshot_cache import (
+    refresh_snapshot,
+    release_refresh_lock,
+)
+
+celery_logger = logging.getLogger("celery")
+
+
+@shared_task(ignore_result=True)
+def refresh_visualization_snapshot_task(
+    host_id, time_range=24, limit=100, downsample=None, points=500
+):
+    """
+    Rebuild a stale host visualization snapshot in the background.
+    On failure the last good snapshot is left in place and keeps being served.
+    """
+    params = {
+        "host_id": host_id,
+        "time_range": time_range,
+        "limit": limit,
+        "downsample": downsample,
+        "points": points,
+    }
+    try:
+        refresh_snapshot(**params)
+        celery_logger.info(f"Refreshed visualization snapshot for host {host_id}")
+    except ServiceErrorHandler as e:
+        celery_logger.warning(
+            f"Visualization snapshot refresh failed for host {host_id}, keeping last good snapshot: {e}"
+        )
+    finally:
+        release_refresh_lock(**params)
@@ -1,3 +1,632 @@
-from django.test import TestCase
+import importlib
+from unittest import mock
 
-# Create your tests here.
+import orjson
+import redis
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from customers.models import OrganizationInfo
+from users.models import User
+
+from utils import ServiceErrorHandler
+from zabbixproxy.functions.alert_functions import get_alert_changes
+from zabbixproxy.functions.history_export_functions import (
+    iter_history_pages,
+    write_export,
+)
+from zabbixproxy.functions.host_items_functions import (
+    compile_host_items,
+    get_host_items,
+    latest_history,
+)
+from zabbixproxy.functions.host_functions import bulk_host_creation
+from zabbixproxy.functions.visualization_functions import (
+    build_host_visualization_delta,
+    decode_cursor,
+    encode_cursor,
+    get_history_batched,
+)
+from zabbixproxy.functions.visualization_functions.get_history_batched import (
+    plan_history_chunks,
+    split_history_rows,
+)
+from zabbixproxy.models import Host, HostLifecycle, TaskStatus, TemplateGroupMirror
+from zabbixproxy.services import ZabbixAPIError
+from zabbixproxy.tasks.bulk_host_creation import (
+    bulk_host_creation_chunk_task,
+    bulk_host_creation_finished_task,
+)
+from zabbixproxy.tasks.bulk_host_deletion import (
+    bulk_host_deletion_chunk_task,
+    bulk_host_deletion_workflow,
+)
+from zabbixproxy.views import AgentFleetUpgradeView
+
+bulk_creation = importlib.import_module(
+    "zabbixproxy.functions.host_functions.bulk_host_creation"
+)
+bulk_creation_tasks = importlib.import_module(
+    "zabbixproxy.tasks.bulk_host_creation.bulk_host_creation"
+)
+bulk_deletion_tasks = importlib.import_module(
+    "zabbixproxy.tasks.bulk_host_deletion.bulk_host_deletion"
+)
+history_batched = importlib.import_module(
+    "zabbixproxy.functions.visualization_functions.get_history_batched"
+)
+history_pages = importlib.import_module(
+    "zabbixproxy.functions.history_export_functions.iter_history_pages"
+)
+host_visualizations = importlib.import_module(
+    "zabbixproxy.functions.visualization_functions.build_host_visualizations"
+)
+
+
+def _item(itemid, value_type="0", delay="1m"):
+    return {"itemid": itemid, "value_type": value_type, "delay": delay}
+
+
+def _rows(itemid, clocks):
+    """history.get rows of one item, newest first like the API returns them"""
+    return [
+        {"itemid": itemid, "clock": str(clock), "value": str(clock)}
+        for clock in sorted(clocks, reverse=True)
+    ]
+
+
+@override_settings(ZABBIX_HISTORY_BATCH_SIZE=2, ZABBIX_HISTORY_CONCURRENCY=1)
+class HistoryBatchTests(SimpleTestCase):
+    """Batched history.get calls split back out per item"""
+
+    def test_chunks_share_value_type_and_interval(self):
+        items = [
+            _item("1"),
+            _item("2"),
+            _item("3"),
+            _item("4", value_type="3"),
+            _item("5", delay="5m"),
+        ]
+
+        self.assertEqual(
+            plan_history_chunks(items),
+            [("0", ["1", "2"]), ("0", ["3"]), ("3", ["4"]), ("0", ["5"])],
+        )
+
+    def test_short_items_are_refetched_when_the_shared_limit_is_reached(self):
+        rows = _rows("1", [10, 20])
+
+        per_item, short = split_history_rows(rows, ["1", "2"], limit=1)
+
+        self.assertEqual(per_item, {"1": rows[:1], "2": []})
+        self.assertEqual(short, ["2"])
+
+    def test_rows_are_split_per_item_oldest_first(self):
+        def history_get(method, params):
+            # The busy item 1 crowds item 2 out of the first call
+            if params["itemids"] == ["1", "2"]:
+                return _rows("1", [10, 20, 30, 40])
+            return _rows("2", [15, 25])
+
+        with mock.patch.object(
+            history_batched, "send_request", side_effect=history_get
+        ):
+            history, calls, missing = get_history_batched(
+                [_item("1"), _item("2")], limit=2
+            )
+
+        self.assertEqual([row["clock"] for row in history["1"]], ["30", "40"])
+        self.assertEqual([row["clock"] for row in history["2"]], ["15", "25"])
+        self.assertEqual(calls, 2)
+        self.assertEqual(missing, set())
+
+    def test_items_of_a_failed_chunk_are_reported_missing(self):
+        def history_get(method, params):
+            if params["history"] == "3":
+                raise ServiceErrorHandler("Zabbix API request failed")
+            return _rows(params["itemids"][0], [10])
+
+        with mock.patch.object(
+            history_batched, "send_request", side_effect=history_get
+        ):
+            history, calls, missing = get_history_batched(
+                [_item("1"), _item("2", value_type="3")]
+            )
+
+        self.assertEqual(list(history), ["1"])
+        self.assertEqual(missing, {"2"})
+        self.assertEqual(calls, 2)
+
+
+HOST_ITEMS = [
+    {
+        "itemid": "1",
+        "name": "CPU user",
+        "value_type": "0",
+        "units": "%",
+        "lastclock": "100",
+        "lastvalue": "3.5",
+    },
+    {
+        "itemid": "2",
+        "name": "CPU idle",
+        "value_type": "0",
+        "units": "%",
+        "lastclock": "0",
+        "lastvalue": "0",
+    },
+]
+
+
+class HostItemsTests(SimpleTestCase):
+    """get_host_items with batched history and the latest mode"""
+
+    def get(self, **query):
+        view = "zabbixproxy.functions.host_items_functions.item_list_function"
+        client = mock.Mock()
+        client.call_with_auth.return_value = HOST_ITEMS
+        history = ({"1": _rows("1", [100, 90])}, 1, {"2"})
+        with (
+            mock.patch(f"{view}.get_zabbix_client", return_value=client),
+            mock.patch(
+                f"{view}.get_real_time_data_for_items", return_value=history
+            ) as batched,
+        ):
+            request = RequestFactory().get("/", {"hostids": "10", **query})
+            response = get_host_items(request)
+        return orjson.loads(response.content), batched
+
+    def test_latest_history_skips_items_never_collected(self):
+        self.assertEqual(
+            latest_history(HOST_ITEMS),
+            {"1": [{"itemid": "1", "clock": "100", "value": "3.5"}]},
+        )
+
+    def test_items_without_history_are_left_out(self):
+        compiled = compile_host_items(HOST_ITEMS, {"1": _rows("1", [100])})
+
+        self.assertEqual([item["itemid"] for item in compiled], ["1"])
+
+    def test_history_is_fetched_in_batches_and_failures_listed(self):
+        body, batched = self.get()
+
+        batched.assert_called_once_with(HOST_ITEMS)
+        self.assertEqual(body["status"], "success")
+        self.assertEqual([item["itemid"] for item in body["data"]], ["1"])
+        self.assertEqual(body["missing_items"], ["2"])
+
+    def test_latest_mode_reads_no_history(self):
+        body, batched = self.get(latest="true")
+
+        batched.assert_not_called()
+        self.assertEqual(body["data"][0]["result"][0]["value"], "3.5")
+
+
+def _cpu_item(itemid):
+    return {
+        "itemid": itemid,
+        "name": f"CPU {itemid}",
+        "key_": f"system.cpu.util[,{itemid}]",
+        "value_type": "0",
+        "units": "%",
+        "delay": "1m",
+    }
+
+
+class VisualizationDeltaTests(SimpleTestCase):
+    """The delta cursor and what a poll reports as changed"""
+
+    def test_cursor_round_trip(self):
+        cursor = encode_cursor(10, {"1": 100, "2": 200})
+
+        self.assertEqual(decode_cursor("10", cursor), {"1": 100, "2": 200})
+
+    def test_cursor_of_another_host_is_refused(self):
+        cursor = encode_cursor(10, {"1": 100})
+
+        with self.assertRaisesMessage(ServiceErrorHandler, "another host"):
+            decode_cursor(11, cursor)
+
+    def test_malformed_cursor_is_refused(self):
+        for cursor in ("not a cursor", encode_cursor(10, {"1": "x"})):
+            with self.assertRaisesMessage(ServiceErrorHandler, "Invalid cursor"):
+                decode_cursor(10, cursor)
+
+    def test_delta_reports_new_points_and_keeps_failed_clocks(self):
+        items = [_cpu_item("1"), _cpu_item("2"), _cpu_item("3")]
+        # get_history_batched hands rows back oldest first
+        history = ({"1": _rows("1", [20, 30, 40])[::-1]}, 1, {"2"})
+
+        with (
+            mock.patch.object(
+                host_visualizations, "get_items_for_host", return_value=items
+            ),
+            mock.patch.object(
+                host_visualizations, "get_history_batched", return_value=history
+            ),
+        ):
+            payload, stats = build_host_visualization_delta(
+                10, {"1": 20, "2": 25, "9": 5}
+            )
+
+        self.assertEqual(payload["items"][0]["id"], "1")
+        self.assertEqual(
+            [point["time"] for point in payload["items"][0]["data"]], [30, 40]
+        )
+        self.assertEqual(payload["removed"], ["9"])
+        self.assertEqual(payload["added"], ["3"])
+        self.assertEqual(payload["missing_items"], ["2"])
+        self.assertEqual(decode_cursor(10, payload["cursor"]), {"1": 40, "2": 25})
+        self.assertEqual(stats["upstream_calls"], 2)
+
+
+def _ns_rows(*clock_ns):
+    return [
+        {"itemid": "1", "clock": str(clock), "ns": str(ns), "value": "1"}
+        for clock, ns in clock_ns
+    ]
+
+
+class HistoryExportTests(SimpleTestCase):
+    """Paging history for exports and writing the export out"""
+
+    def pages(self, responses, page_size):
+        with mock.patch.object(
+            history_pages, "send_request", side_effect=responses
+        ) as history_get:
+            pages = list(
+                iter_history_pages(
+                    [_item("1")], 0, 100, page_size=page_size, use_mirror=False
+                )
+            )
+        starts = [call.args[1]["time_from"] for call in history_get.call_args_list]
+        return pages, starts
+
+    def test_full_page_continues_from_its_last_second(self):
+        pages, starts = self.pages(
+            [
+                _ns_rows((10, 0), (11, 0), (12, 0)),
+                _ns_rows((12, 0), (13, 0)),
+            ],
+            page_size=3,
+        )
+
+        self.assertEqual(
+            pages, [_ns_rows((10, 0), (11, 0), (12, 0)), _ns_rows((13, 0))]
+        )
+        self.assertEqual(starts, [0, 12])
+
+    def test_page_full_of_one_second_moves_on(self):
+        same_second = _ns_rows((10, 0), (10, 1))
+
+        pages, starts = self.pages(
+            [same_second, same_second, _ns_rows((11, 0))], page_size=2
+        )
+
+        self.assertEqual(pages, [same_second, _ns_rows((11, 0))])
+        self.assertEqual(starts, [0, 10, 11])
+
+    def test_csv_export_ends_with_the_error(self):
+        def pages():
+            yield _ns_rows((10, 0))
+            raise ServiceErrorHandler("Zabbix API\nrequest failed")
+
+        body = b"".join(
+            write_export(pages(), [{"itemid": "1", "key_": "agent.ping"}], "csv")
+        )
+
+        self.assertEqual(
+            body.decode().splitlines(),
+            [
+                "itemid,key,clock,ns,value",
+                "1,agent.ping,10,0,1",
+                "# error: Zabbix API request failed",
+            ],
+        )
+
+
+def _event(eventid, value="1"):
+    return {
+        "eventid": str(eventid),
+        "objectid": "500",
+        "name": "High CPU",
+        "severity": "4",
+        "clock": "100",
+        "value": value,
+        "acknowledged": "0",
+        "hosts": [{"hostid": "10", "host": "web-1"}],
+    }
+
+
+class AlertFeedTests(SimpleTestCase):
+    """Polling alert changes after a cursor"""
+
+    feed = "zabbixproxy.functions.alert_functions.alert_feed"
+
+    def changes(self, events, cursor, limit, conn=None):
+        client = mock.Mock()
+        client.call_with_auth.return_value = events
+        redis_patch = (
+            mock.patch(f"{self.feed}.get_redis", return_value=conn)
+            if conn
+            else mock.patch(
+                f"{self.feed}.get_redis", side_effect=redis.ConnectionError("down")
+            )
+        )
+        with (
+            mock.patch(f"{self.feed}.organization_host_ids", return_value=["10"]),
+            mock.patch(f"{self.feed}.get_zabbix_client", return_value=client),
+            redis_patch,
+        ):
+            changes = get_alert_changes(mock.Mock(pk=7), cursor, limit)
+        return changes, client
+
+    def test_page_after_the_cursor(self):
+        changes, client = self.changes(
+            [_event(21), _event(22, value="0"), _event(23)], cursor=20, limit=2
+        )
+
+        params = client.call_with_auth.call_args.args[1]
+        self.assertEqual(params["eventid_from"], "21")
+        self.assertEqual(params["limit"], 3)
+        self.assertEqual([event["id"] for event in changes["events"]], ["21", "22"])
+        self.assertEqual(changes["events"][1]["status"], "resolved")
+        self.assertEqual(changes["cursor"], 22)
+        self.assertTrue(changes["has_more"])
+
+    def test_no_new_events_keep_the_cursor(self):
+        changes, _ = self.changes([], cursor=20, limit=2)
+
+        self.assertEqual(changes, {"events": [], "cursor": 20, "has_more": False})
+
+    def test_cached_page_is_shared(self):
+        cached = {"events": [], "cursor": 20, "has_more": False}
+        conn = mock.Mock()
+        conn.get.return_value = orjson.dumps(cached)
+
+        changes, client = self.changes([_event(21)], cursor=20, limit=2, conn=conn)
+
+        conn.get.assert_called_once_with("monipro:alerts:7:changes:20:2")
+        client.call_with_auth.assert_not_called()
+        self.assertEqual(changes, cached)
+
+
+def _lifecycles(hosts, status="creation_in_progress"):
+    """HostLifecycle per {host name: Zabbix host ID}"""
+    category = TemplateGroupMirror.objects.create(
+        template_group_discription="Linux", template_group_name="Linux"
+    )
+    return [
+        HostLifecycle.objects.create(
+            host=Host.objects.create(host=name, ip="10.0.0.1", host_id=host_id),
+            host_monitoring_category=category,
+            status=status,
+        )
+        for name, host_id in hosts.items()
+    ]
+
+
+class BulkHostCreationTests(TestCase):
+    """Chunked host.create and how a chunk reports partial failures"""
+
+    def test_rejected_bulk_call_falls_back_to_one_call_per_host(self):
+        client = mock.Mock()
+        client.call_with_auth.side_effect = [
+            ZabbixAPIError("Invalid params", data="Host web-2 already exists"),
+            {"hostids": ["101"]},
+            ZabbixAPIError("Invalid params", data="Host web-2 already exists"),
+        ]
+
+        with mock.patch.object(bulk_creation, "get_zabbix_client", return_value=client):
+            results = bulk_host_creation([{"host": "web-1"}, {"host": "web-2"}])
+
+        self.assertEqual(
+            results,
+            [("101", None), (None, "Invalid params: Host web-2 already exists")],
+        )
+        self.assertEqual(client.call_with_auth.call_count, 3)
+
+    def chunk(self, lifecycles, **patch):
+        hosts = [
+            {"host_lifecycle_id": lifecycle.pk, "templates": ["10001"]}
+            for lifecycle in lifecycles
+        ]
+        with mock.patch.object(bulk_creation_tasks, "bulk_host_creation", **patch):
+            return bulk_host_creation_chunk_task(hosts, "5")
+
+    def test_chunk_records_each_host(self):
+        lifecycles = _lifecycles({"web-1": 0, "web-2": 0})
+
+        result = self.chunk(
+            lifecycles, return_value=[("101", None), (None, "Host exists")]
+        )
+
+        self.assertEqual(
+            result,
+            {
+                "created": ["web-1"],
+                "failed": [{"host": "web-2", "error": "Host exists"}],
+            },
+        )
+        created, failed = HostLifecycle.objects.select_related("host").order_by("pk")
+        self.assertEqual((created.status, created.host.host_id), ("active", 101))
+        self.assertEqual((failed.status, failed.host.host_id), ("creation_failed", 0))
+
+    def test_failing_chunk_fails_its_hosts_without_raising(self):
+        lifecycles = _lifecycles({"web-1": 0, "web-2": 0})
+
+        result = self.chunk(
+            lifecycles, side_effect=ServiceErrorHandler("Zabbix is unreachable")
+        )
+
+        self.assertEqual(result["created"], [])
+        self.assertEqual(len(result["failed"]), 2)
+        self.assertEqual(
+            set(HostLifecycle.objects.values_list("status", flat=True)),
+            {"creation_failed"},
+        )
+
+    def test_finished_task_adds_up_the_chunks(self):
+        task_status = TaskStatus.objects.create(task_id="bulk-1", task_type="bulk")
+        deploy_failed = [{"host": "web-4", "error": "unreachable"}]
+        results = [
+            {"created": ["web-1", "web-2"], "failed": []},
+            {"created": [], "failed": [{"host": "web-3", "error": "Host exists"}]},
+        ]
+
+        bulk_host_creation_finished_task(results, task_status.pk, deploy_failed)
+
+        task_status.refresh_from_db()
+        self.assertEqual(task_status.status, "completed")
+        self.assertEqual(task_status.successfully_executed_tasks, ["web-1", "web-2"])
+        self.assertEqual(
+            [host["host"] for host in task_status.unsuccessfully_executed_tasks],
+            ["web-4", "web-3"],
+        )
+        self.assertEqual((task_status.successful_task, task_status.faild_task), (2, 2))
+
+
+class BulkHostDeletionTests(TestCase):
+    """Chunked host.delete and hosts that are not deleted up front"""
+
+    def setUp(self):
+        self.lifecycles = _lifecycles({"web-1": 101, "web-2": 102}, status="active")
+        self.task_status = TaskStatus.objects.create(
+            task_id="bulk-1", task_type="bulk_host_deletion"
+        )
+
+    def statuses(self):
+        return dict(HostLifecycle.objects.values_list("host__host", "status"))
+
+    def workflow(self, **existing):
+        with (
+            mock.patch.object(bulk_deletion_tasks, "existing_host_ids", **existing),
+            mock.patch.object(bulk_deletion_tasks, "chord") as chord,
+            mock.patch.object(
+                bulk_deletion_tasks, "bulk_host_deletion_finished_task"
+            ) as finished,
+        ):
+            bulk_host_deletion_workflow(
+                self.task_status.pk,
+                [lifecycle.host_id for lifecycle in self.lifecycles],
+            )
+        return chord, finished
+
+    def test_chunk_records_each_host(self):
+        with mock.patch.object(
+            bulk_deletion_tasks,
+            "bulk_host_deletion",
+            return_value={"101": None, "102": "No permissions"},
+        ):
+            result = bulk_host_deletion_chunk_task(["101", "102"])
+
+        self.assertEqual(
+            result,
+            {
+                "deleted": ["web-1"],
+                "failed": [{"host": "web-2", "error": "No permissions"}],
+            },
+        )
+        self.assertEqual(
+            self.statuses(), {"web-1": "inactive", "web-2": "deletion_failed"}
+        )
+
+    def test_hosts_missing_in_zabbix_are_not_deleted(self):
+        chord, finished = self.workflow(return_value={"101"})
+
+        (chunks,), _ = chord.call_args
+        self.assertEqual([chunk.args for chunk in chunks], [(["101"],)])
+        finished.s.assert_called_once_with(
+            self.task_status.pk,
+            [{"host": "web-2", "error": "Host not found in Zabbix"}],
+        )
+        self.assertEqual(
+            HostLifecycle.objects.get(host__host="web-2").status_message,
+            "Host with ID 102 not found.",
+        )
+
+    def test_failed_lookup_fails_every_host_with_its_error(self):
+        chord, finished = self.workflow(
+            side_effect=ServiceErrorHandler("Zabbix API returned an error")
+        )
+
+        chord.assert_not_called()
+        finished.s.return_value.delay.assert_called_once_with([])
+        self.assertEqual(
+            finished.s.call_args.args[1],
+            [
+                {"host": name, "error": "Zabbix API returned an error"}
+                for name in ("web-1", "web-2")
+            ],
+        )
+        self.assertEqual(set(self.statuses().values()), {"deletion_failed"})
+        self.assertEqual(
+            HostLifecycle.objects.get(host__host="web-1").status_message,
+            "Host ID 101 deletion unsuccessful: Zabbix API returned an error",
+        )
+
+
+class AgentFleetUpgradeTests(TestCase):
+    """One agent upgrade per organization, guarded by its Redis lock"""
+
+    view = "zabbixproxy.views.agent_upgrade"
+
+    def setUp(self):
+        organization = OrganizationInfo.objects.create(
+            organization_name="Acme", organization_phone="5550100"
+        )
+        self.user = User.objects.create_user(
+            "ops@example.com", "secret", "secret", organization=organization
+        )
+        self.running = TaskStatus.objects.create(
+            user=self.user,
+            task_id="upgrade-1",
+            task_type="agent_fleet_upgrade",
+            status="in_progress",
+        )
+
+    def post(self, data=None, **acquire):
+        lock = mock.Mock()
+        lock.acquire.configure_mock(**acquire)
+        request = APIRequestFactory().post("/", data or {}, format="json")
+        force_authenticate(request, user=self.user)
+        with (
+            mock.patch(f"{self.view}.agent_upgrade_lock", return_value=lock),
+            mock.patch(f"{self.view}.agent_fleet_upgrade_task") as task,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            response = AgentFleetUpgradeView.as_view()(request)
+        return response, task
+
+    def test_running_upgrade_gets_409(self):
+        response, task = self.post(return_value=False)
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data["task_id"], "upgrade-1")
+        task.delay.assert_not_called()
+
+    def test_free_lock_starts_the_upgrade_and_fails_stale_ones(self):
+        response, task = self.post({"serial": "20%"}, return_value=True)
+
+        self.assertEqual(response.status_code, 202)
+        started = TaskStatus.objects.get(task_id=response.data["task_id"])
+        task.delay.assert_called_once_with(
+            str(started.pk),
+            self.user.organization_id,
+            serial="20%",
+            reconfigure_only=False,
+        )
+        self.running.refresh_from_db()
+        self.assertEqual(self.running.status, "failed")
+
+    def test_redis_down_gets_503(self):
+        response, task = self.post(side_effect=redis.ConnectionError("down"))
+
+        self.assertEqual(response.status_code, 503)
+        task.delay.assert_not_called()
+
+    def test_invalid_serial_gets_400(self):
+        response, task = self.post({"serial": "0%"}, return_value=True)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("serial", response.data["errors"])
@@ -7,19 +7,31 @@ from zabbixproxy.functions.host_items_functions import (
     get_real_time_data,
 )
 from zabbixproxy.views import (
+    AgentFleetUpgradeView,
+    AlertFeedView,
     AnsibleDeployView,
+    BulkHostDeletionView,
+    BulkHostOnboardingView,
     CheckReachabilityView,
     GetTemplateNameView,
     GetTemplates,
     GetZabbixHostes,
     HostAndUserGroupCreationView,
     HostAPIView,
+    HistoryExportView,
     HostDeletionView,
     HostVisualizationsView,
+    IncidentFeedView,
     TemplateGroupView,
     TemplateView,
     ZabbixHostCreationView,
     ZabbixUserCreationView,
+    check_reachability_async_view,
+    stream_events,
+    get_host_items_async,
+    get_real_time_data_async,
+    get_zabbix_alerts_async,
+    host_visualizations_async,
 )
 
 urlpatterns = [
@@ -35,9 +47,14 @@ urlpatterns = [
     path("host-items/", get_host_items, name="get_host_items"),
     path("real-time-data/", get_real_time_data, name="get_real_time_data"),
     path("deploy/", AnsibleDeployView.as_view(), name="deploy"),
+    path("agents/upgrade/", AgentFleetUpgradeView.as_view(), name="agent-upgrade"),
     path("get-zabbix-alerts/", get_zabbix_alerts, name="get-zabbix-alerts"),
+    path("alerts/feed/", AlertFeedView.as_view(), name="alert-feed"),
+    path("alerts/incidents/", IncidentFeedView.as_view(), name="incident-feed"),
+    path("events/", stream_events, name="event-stream"),
     path("local-hosts/", HostAPIView.as_view(), name="local-host-list-create"),
     path("local-hosts/<int:pk>/", HostAPIView.as_view(), name="local-host-detail"),
+    path("bulk-hosts/", BulkHostOnboardingView.as_view(), name="bulk-host-onboarding"),
     path("send-sms/", SendSMSView.as_view(), name="send-sms"),
     path("reachability/", CheckReachabilityView.as_view(), name="reachability"),
     path(
@@ -48,6 +65,7 @@ urlpatterns = [
     path("template-name/", GetTemplateNameView.as_view(), name="template-name"),
     path("templates/", GetTemplates.as_view(), name="templates"),
     path("delete-host/", HostDeletionView.as_view(), name="host-deletion"),
+    path("delete-hosts/", BulkHostDeletionView.as_view(), name="bulk-host-deletion"),
     path(
         "create-template-group/",
         TemplateGroupView.as_view(),
@@ -59,4 +77,27 @@ urlpatterns = [
         HostVisualizationsView.as_view(),
         name="host-visualizations",
     ),
+    path("history-export/", HistoryExportView.as_view(), name="history-export"),
+    # Async (ASGI) variants of the proxy endpoints
+    path("async/host-items/", get_host_items_async, name="async-host-items"),
+    path(
+        "async/real-time-data/",
+        get_real_time_data_async,
+        name="async-real-time-data",
+    ),
+    path(
+        "async/get-zabbix-alerts/",
+        get_zabbix_alerts_async,
+        name="async-get-zabbix-alerts",
+    ),
+    path(
+        "async/reachability/",
+        check_reachability_async_view,
+        name="async-reachability",
+    ),
+    path(
+        "async/visualizations/<str:host_id>/",
+        host_visualizations_async,
+        name="async-host-visualizations",
+    ),
 ]
@@ -1,4 +1,15 @@
+from zabbixproxy.views.agent_upgrade import AgentFleetUpgradeView
+from zabbixproxy.views.alert_feed import AlertFeedView, IncidentFeedView
 from zabbixproxy.views.ancibal_runner import AnsibleDeployView
+from zabbixproxy.views.async_proxy import (
+    check_reachability_async_view,
+    get_host_items_async,
+    get_real_time_data_async,
+    get_zabbix_alerts_async,
+    host_visualizations_async,
+)
+from zabbixproxy.views.bulk_host_deletion import BulkHostDeletionView
+from zabbixproxy.views.bulk_host_onboarding import BulkHostOnboardingView
 from zabbixproxy.views.check_reachability import CheckReachabilityView
 from zabbixproxy.views.create_host import HostAPIView
 from zabbixproxy.views.create_template import TemplateView
@@ -7,7 +18,9 @@ from zabbixproxy.views.create_user import ZabbixUserCreationView
 from zabbixproxy.views.create_user_and_host_group import HostAndUserGroupCreationView
 from zabbixproxy.views.create_zabbix_host import ZabbixHostCreationView
 from zabbixproxy.views.delete_host import HostDeletionView
+from zabbixproxy.views.event_stream import stream_events
 from zabbixproxy.views.get_hosts import GetZabbixHostes
 from zabbixproxy.views.get_template import GetTemplateNameView
 from zabbixproxy.views.get_template_two import GetTemplates
+from zabbixproxy.views.history_export import HistoryExportView
 from zabbixproxy.views.item_visualizations import HostVisualizationsView
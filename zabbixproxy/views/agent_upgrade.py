@@ -0,0 +1,124 @@
+import logging
+import uuid
+
+import redis
+from django.db import transaction
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from zabbixproxy.functions.automation_functions import (
+    agent_upgrade_lock,
+    release_agent_upgrade_lock,
+)
+from zabbixproxy.models import TaskStatus
+from zabbixproxy.serializers import AgentUpgradeSerializer
+from zabbixproxy.tasks import agent_fleet_upgrade_task
+
+django_logger = logging.getLogger("django")
+
+
+class AgentFleetUpgradeView(APIView):
+    """
+    This endpoint is used to upgrade or reconfigure the Zabbix agent of all
+    active hosts of the user's organization.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        """
+        Start a rolling agent upgrade.
+
+        Body (all optional): serial (hosts per batch, e.g. 10 or "20%"),
+        max_fail_percentage, forks and reconfigure_only. Progress is
+        reported through the returned TaskStatus. One upgrade runs per
+        organization at a time, guarded by `agent_upgrade_lock`; a second
+        request gets 409 with the running upgrade's task_id.
+        """
+        serializer = AgentUpgradeSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(
+                {"status": "error", "errors": serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        organization_id = request.user.organization_id
+        if not organization_id:
+            return Response(
+                {"status": "error", "message": "User has no associated organization"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        task_status_id = uuid.uuid4()
+        lock = agent_upgrade_lock(organization_id)
+        try:
+            acquired = lock.acquire(blocking=False, token=str(task_status_id))
+        except redis.RedisError as e:
+            django_logger.error(f"Agent upgrade lock unavailable: {e}")
+            return Response(
+                {
+                    "status": "error",
+                    "message": "Agent upgrades are unavailable, please try again later",
+                },
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+        upgrades = TaskStatus.objects.filter(
+            task_type="agent_fleet_upgrade",
+            user__organization_id=organization_id,
+            status__in=["pending", "in_progress"],
+        )
+        if not acquired:
+            running = upgrades.order_by("-created_at").first()
+            return Response(
+                {
+                    "status": "error",
+                    "message": "An agent upgrade is already running",
+                    "task_id": running.task_id if running else None,
+                },
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        try:
+            with transaction.atomic():
+                # The lock was free, so these upgrades stopped without
+                # finishing (their worker died)
+                upgrades.update(
+                    status="failed",
+                    error_message="Interrupted, the upgrade did not finish",
+                )
+                task_status = TaskStatus.objects.create(
+                    id=task_status_id,
+                    user=request.user,
+                    task_id=str(uuid.uuid4()),
+                    task_type="agent_fleet_upgrade",
+                )
+                transaction.on_commit(
+                    lambda: agent_fleet_upgrade_task.delay(
+                        str(task_status_id),
+                        organization_id,
+                        **serializer.validated_data,
+                    )
+                )
+        except Exception as e:
+            release_agent_upgrade_lock(lock)
+            django_logger.exception(f"Error starting agent upgrade: {str(e)}")
+            return Response(
+                {
+                    "status": "error",
+                    "message": "Something went wrong, please try again later",
+                },
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+        django_logger.info(
+            f"Agent upgrade of organization {organization_id} started by {request.user.email}"
+        )
+        return Response(
+            {
+                "status": "success",
+                "message": "Agent upgrade started",
+                "task_id": task_status.task_id,
+            },
+            status=status.HTTP_202_ACCEPTED,
+        )
@@ -0,0 +1,130 @@
+import logging
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from utils import ServiceErrorHandler
+from zabbixproxy.functions.alert_functions import (
+    correlate_alerts,
+    get_active_problems,
+    get_alert_changes,
+)
+
+logger = logging.getLogger("zabbix")
+
+
+class AlertFeedView(APIView):
+    """
+    Alert feed of the caller's organization.
+
+    Without a cursor the active problems are returned, newest first, together
+    with a `cursor`. Polling with that cursor returns only the trigger events
+    (new problems and resolutions) that happened since, oldest first, and the
+    cursor to poll with next.
+
+    Query Parameters:
+    - cursor: eventid returned by the previous call
+    - page: Page of the active problems (default 1), without cursor
+    - page_size: Rows per page (default ALERT_FEED_PAGE_SIZE, at most
+      ALERT_FEED_MAX_PAGE_SIZE)
+
+    Upstream results are cached per organization for
+    ALERT_FEED_CACHE_SECONDS, so users of one organization share one query.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        organization = getattr(request.user, "organization", None)
+        if organization is None:
+            return Response(
+                {"error": "User is not part of an organization"},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        try:
+            cursor, page, page_size = self._parse_query(request.query_params)
+        except ServiceErrorHandler as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            if cursor is not None:
+                changes = get_alert_changes(organization, cursor, page_size)
+                return Response({"mode": "changes", **changes})
+            snapshot = get_active_problems(organization)
+        except ServiceErrorHandler as e:
+            logger.error(f"Alert feed for organization {organization.pk} failed: {e}")
+            return Response({"error": str(e)}, status=status.HTTP_502_BAD_GATEWAY)
+
+        problems = snapshot["problems"]
+        start = (page - 1) * page_size
+        return Response(
+            {
+                "mode": "snapshot",
+                "cursor": snapshot["cursor"],
+                "built_at": snapshot["built_at"],
+                "count": len(problems),
+                "page": page,
+                "page_size": page_size,
+                "has_more": start + page_size < len(problems),
+                "events": problems[start : start + page_size],
+            }
+        )
+
+    def _parse_query(self, query_params):
+        try:
+            cursor = query_params.get("cursor")
+            cursor = int(cursor) if cursor else None
+            page = int(query_params.get("page", "1"))
+            page_size = int(
+                query_params.get("page_size", settings.ALERT_FEED_PAGE_SIZE)
+            )
+        except ValueError:
+            raise ServiceErrorHandler("Invalid cursor, page or page_size")
+
+        if (cursor is not None and cursor < 0) or page < 1 or page_size < 1:
+            raise ServiceErrorHandler("cursor, page and page_size must be positive")
+        return cursor, page, min(page_size, settings.ALERT_FEED_MAX_PAGE_SIZE)
+
+
+class IncidentFeedView(APIView):
+    """
+    Active problems of the caller's organization correlated into incidents.
+
+    Alerts on one host, or sharing an ALERT_CORRELATION_TAGS value, within
+    ALERT_CORRELATION_WINDOW_SECONDS of each other form one incident, newest
+    incident first. Reads the same per-organization problem cache as
+    AlertFeedView.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        organization = getattr(request.user, "organization", None)
+        if organization is None:
+            return Response(
+                {"error": "User is not part of an organization"},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        try:
+            snapshot = get_active_problems(organization)
+        except ServiceErrorHandler as e:
+            logger.error(
+                f"Incident feed for organization {organization.pk} failed: {e}"
+            )
+            return Response({"error": str(e)}, status=status.HTTP_502_BAD_GATEWAY)
+
+        incidents = correlate_alerts(snapshot["problems"])
+        return Response(
+            {
+                "cursor": snapshot["cursor"],
+                "built_at": snapshot["built_at"],
+                "alerts": len(snapshot["problems"]),
+                "count": len(incidents),
+                "incidents": incidents,
+            }
+        )
@@ -37,8 +37,6 @@ class AnsibleDeployView(APIView):
                 inv_file.write(inv_content.strip())
                 inv_file.flush()
 
-                ansible_logger.debug(f"Inventory content:\n{inv_content}")
-
                 runner = ansible_runner.run(
                     playbook=settings.PLAYBOOK_PATH,
                     inventory=inv_file.name,
@@ -0,0 +1,243 @@
+import logging
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+
+from utils import ServiceErrorHandler, compressed_json_response
+from zabbixproxy.functions.alert_functions import (
+    alert_params,
+    group_alerts_by_host,
+    organization_host_ids,
+)
+from zabbixproxy.functions.check_reachability_functions import (
+    check_reachability_async,
+    validate_reachability_target,
+)
+from zabbixproxy.functions.host_items_functions import (
+    compile_host_items,
+    host_items_params,
+    latest_history,
+)
+from zabbixproxy.functions.visualization_functions import (
+    build_host_visualizations_async,
+    get_history_batched_async,
+    to_columnar,
+)
+from zabbixproxy.services import ZabbixAPIError, get_async_zabbix_client
+from zabbixproxy.views.item_visualizations import parse_visualization_query
+
+zabbix_logger = logging.getLogger("zabbix")
+django_logger = logging.getLogger("django")
+
+# Async (ASGI) counterparts of the Zabbix proxy endpoints. They answer the
+# same way as the sync views, but every upstream call goes through the shared
+# httpx.AsyncClient of the worker and the calls of one request are fanned out
+# concurrently, at most ZABBIX_ASYNC_CONCURRENCY at a time.
+
+
+async def _authenticated_user(request):
+    """
+    Authenticate the JWT of `request` like DRF's IsAuthenticated would.
+
+    Returns:
+        User or None
+    """
+    try:
+        result = await sync_to_async(JWTAuthentication().authenticate)(request)
+    except (AuthenticationFailed, InvalidToken):
+        return None
+    return result[0] if result else None
+
+
+async def _authenticated(request):
+    return await _authenticated_user(request) is not None
+
+
+def _unauthorized():
+    return JsonResponse(
+        {"detail": "Authentication credentials were not provided."}, status=401
+    )
+
+
+@csrf_exempt
+@require_GET
+async def get_host_items_async(request):
+    """
+    Async `get_host_items`: history for all items is fetched in concurrent
+    history.get chunks.
+    """
+    if not await _authenticated(request):
+        return _unauthorized()
+
+    hostids = request.GET.get("hostids")
+    name = request.GET.get("name", "CPU")
+    latest = request.GET.get("latest", "false").lower() in ("1", "true")
+
+    if not hostids:
+        return JsonResponse({"error": "Missing hostids parameter"}, status=400)
+
+    client = get_async_zabbix_client()
+    extra = {}
+    try:
+        items = await client.call_with_auth(
+            "item.get", host_items_params(hostids, name)
+        )
+        if latest:
+            history = latest_history(items)
+        else:
+            history, calls, missing = await get_history_batched_async(client, items)
+            extra["missing_items"] = sorted(missing)
+            zabbix_logger.debug(
+                f"Fetched history for {len(items)} items with {calls} history.get calls"
+            )
+            history = {itemid: rows[::-1] for itemid, rows in history.items()}
+    except ZabbixAPIError as e:
+        return JsonResponse({"status": "error", "message": str(e)}, status=502)
+    except ServiceErrorHandler as e:
+        django_logger.error(f"Error in get_host_items_async: {e}")
+        return JsonResponse(
+            {"status": "error", "message": "Unexpected error occurred"}, status=500
+        )
+
+    return JsonResponse(
+        {"status": "success", "data": compile_host_items(items, history), **extra}
+    )
+
+
+@csrf_exempt
+@require_GET
+async def get_real_time_data_async(request):
+    """
+    Latest 100 history rows of comma separated `itemids` of one `value_type`.
+    """
+    if not await _authenticated(request):
+        return _unauthorized()
+
+    itemids = request.GET.get("itemids")
+    if not itemids:
+        return JsonResponse({"error": "Missing itemids parameter"}, status=400)
+
+    params = {
+        "output": "extend",
+        "history": request.GET.get("value_type", "0"),
+        "itemids": itemids.split(","),
+        "limit": 100,
+        "sortfield": "clock",
+        "sortorder": "DESC",
+    }
+    if request.GET.get("hostids"):
+        params["hostids"] = request.GET["hostids"].split(",")
+
+    try:
+        result = await get_async_zabbix_client().call_with_auth("history.get", params)
+    except ServiceErrorHandler as e:
+        django_logger.error(f"Error in get_real_time_data_async: {e}")
+        return JsonResponse({"error": "Zabbix API request failed"}, status=502)
+    return JsonResponse({"result": result or []})
+
+
+@require_GET
+async def get_zabbix_alerts_async(request):
+    user = await _authenticated_user(request)
+    if user is None:
+        return _unauthorized()
+
+    host_ids = await sync_to_async(
+        lambda: organization_host_ids(getattr(user, "organization", None))
+    )()
+    if not host_ids:
+        return JsonResponse({})
+
+    try:
+        alerts = await get_async_zabbix_client().call_with_auth(
+            "trigger.get", alert_params(host_ids)
+        )
+    except ZabbixAPIError as e:
+        return JsonResponse({"error": e.data or str(e)}, status=500)
+    except ServiceErrorHandler:
+        return JsonResponse({"error": "Zabbix API request failed"}, status=500)
+
+    return JsonResponse(group_alerts_by_host(alerts), safe=False)
+
+
+@require_GET
+async def check_reachability_async_view(request):
+    """
+    Async `CheckReachabilityView`: DNS lookups do not hold a worker thread.
+    """
+    if not await _authenticated(request):
+        return _unauthorized()
+
+    host = request.GET.get("host")
+    is_domain = request.GET.get("is_domain", "false").lower() == "true"
+
+    error = validate_reachability_target(host, is_domain)
+    if error:
+        return JsonResponse({"status": "error", "message": error}, status=400)
+
+    try:
+        reachable = await check_reachability_async(is_domain, host)
+    except Exception as e:
+        django_logger.error(f"Error checking reachability: {e}")
+        return JsonResponse(
+            {
+                "status": "error",
+                "message": "Error checking reachability, try again later",
+            },
+            status=500,
+        )
+    if not reachable:
+        return JsonResponse(
+            {"status": "error", "message": "Host is not reachable"}, status=404
+        )
+    return JsonResponse({"status": "success", "message": "Host is reachable"})
+
+
+@require_GET
+async def host_visualizations_async(request, host_id):
+    """
+    Async `HostVisualizationsView` built live from Zabbix
+
+    Accepts time_range, limit, downsample, points and layout like the sync
+    view, and fetches every history/trend chunk of the host concurrently.
+    Snapshot caching and delta polling stay on the sync endpoint. Responses
+    are compressed according to Accept-Encoding.
+    """
+    if not await _authenticated(request):
+        return _unauthorized()
+
+    try:
+        time_range, limit, downsample, points, layout = parse_visualization_query(
+            request.GET
+        )
+    except ServiceErrorHandler as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    try:
+        payload, stats = await build_host_visualizations_async(
+            host_id,
+            time_range=time_range,
+            limit=limit,
+            downsample=downsample,
+            points=points,
+        )
+    except ServiceErrorHandler as e:
+        zabbix_logger.error(f"Error in host_visualizations_async: {e}")
+        return JsonResponse({"error": str(e)}, status=500)
+
+    if payload is None:
+        return JsonResponse(
+            {"error": f"No items found for host ID {host_id}"}, status=404
+        )
+
+    headers = {"X-Upstream-Calls": str(stats["upstream_calls"])}
+    if "downsample_ms" in stats:
+        headers["X-Downsample-Ms"] = f"{stats['downsample_ms']:.2f}"
+    if layout == "columnar":
+        payload = to_columnar(payload)
+    return compressed_json_response(request, payload, headers=headers)
@@ -0,0 +1,123 @@
+import logging
+import uuid
+
+from django.conf import settings
+from django.db import transaction
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from zabbixproxy.models import Host, TaskStatus
+from zabbixproxy.tasks import bulk_host_deletion_workflow
+
+django_logger = logging.getLogger("django")
+
+
+class BulkHostDeletionView(APIView):
+    """
+    This endpoint is used to delete many hosts of the user's organization.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def delete(self, request):
+        """
+        Delete the local hosts in {"ids": [...]}.
+
+        Hosts never created in Zabbix (host_id 0) are deleted right away. The
+        others are deleted from Zabbix in the background with chunked
+        host.delete calls; their HostLifecycle and the returned TaskStatus
+        report the outcome per host.
+        """
+        ids = request.data.get("ids")
+        if not isinstance(ids, list) or not ids:
+            return Response(
+                {"status": "error", "message": "ids must be a non-empty list"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            ids = [_host_id(value) for value in ids]
+        except ValueError:
+            return Response(
+                {"status": "error", "message": "ids must be integer host ids"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(ids) > settings.BULK_HOST_MAX_ROWS:
+            return Response(
+                {
+                    "status": "error",
+                    "message": f"At most {settings.BULK_HOST_MAX_ROWS} hosts can be deleted at once",
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            hosts = {
+                host["pk"]: host
+                for host in Host.objects.filter(
+                    pk__in=ids, host_group__belongs_to=request.user.organization_id
+                ).values("pk", "host", "host_id")
+            }
+            outcomes = []
+            local_only, in_zabbix = [], []
+            for local_host_id in ids:
+                host = hosts.get(local_host_id)
+                if host is None:
+                    outcomes.append({"id": local_host_id, "status": "not_found"})
+                elif host["host_id"] == 0:
+                    local_only.append(local_host_id)
+                    outcomes.append(
+                        {"id": local_host_id, "host": host["host"], "status": "deleted"}
+                    )
+                else:
+                    in_zabbix.append(local_host_id)
+                    outcomes.append(
+                        {"id": local_host_id, "host": host["host"], "status": "queued"}
+                    )
+
+            task_id = None
+            with transaction.atomic():
+                Host.objects.filter(pk__in=local_only).delete()
+                if in_zabbix:
+                    task_status = TaskStatus.objects.create(
+                        user=request.user,
+                        task_id=str(uuid.uuid4()),
+                        task_type="bulk_host_deletion",
+                    )
+                    task_id = task_status.task_id
+                    transaction.on_commit(
+                        lambda: bulk_host_deletion_workflow.delay(
+                            str(task_status.pk), in_zabbix
+                        )
+                    )
+        except Exception as e:
+            django_logger.error("Error in deleting hosts: %s", e)
+            return Response(
+                {"error": "Error in deleting hosts"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+        django_logger.info(
+            f"Bulk host deletion: {len(local_only)} deleted locally, {len(in_zabbix)} queued"
+        )
+        return Response(
+            {
+                "status": "success",
+                "message": (
+                    "Host deletion workflow started" if in_zabbix else "Hosts deleted"
+                ),
+                "task_id": task_id,
+                "hosts": outcomes,
+            },
+            status=status.HTTP_202_ACCEPTED if in_zabbix else status.HTTP_200_OK,
+        )
+
+
+def _host_id(value):
+    """Host pk from a JSON number or a numeric string"""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value)
+    raise ValueError(f"Invalid host id {value!r}")
@@ -0,0 +1,134 @@
+import logging
+import uuid
+
+from django.db import transaction
+from rest_framework import status
+from rest_framework.parsers import BaseParser, FormParser, JSONParser, MultiPartParser
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from utils import ServiceErrorHandler
+from zabbixproxy.functions.host_functions import (
+    create_local_hosts,
+    parse_host_rows,
+    validate_host_rows,
+)
+from zabbixproxy.models import TaskStatus
+from zabbixproxy.tasks import bulk_host_creation_workflow
+
+django_logger = logging.getLogger("django")
+
+
+class CSVTextParser(BaseParser):
+    """A raw text/csv request body, as text"""
+
+    media_type = "text/csv"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        return stream.read().decode("utf-8")
+
+
+class BulkHostOnboardingView(APIView):
+    permission_classes = [IsAuthenticated]
+    parser_classes = [JSONParser, CSVTextParser, MultiPartParser, FormParser]
+
+    def post(self, request):
+        """
+        Onboard many hosts of the user's organization at once.
+
+        Accepts JSON {"hosts": [...], "template_list": [...]}, a CSV body
+        (text/csv) or a CSV upload in the `file` field. CSV columns are the
+        host fields: host, ip, dns, device_type, network_device_type,
+        templates (";"-separated), username, password. Hosts without
+        templates use `template_list`.
+
+        Every row is validated first; when any row is invalid nothing is
+        created and the errors are returned per row. Otherwise the local
+        hosts are inserted and their Zabbix hosts are created in the
+        background, in chunks. Progress is reported through the returned
+        TaskStatus and the hosts' HostLifecycle.
+        """
+        user = request.user
+        host_group = user.organization.organization_hostgroup.first()
+        if not host_group:
+            return Response(
+                {
+                    "status": "error",
+                    "message": "No host group found for your organization.",
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            if isinstance(request.data, str):
+                data, template_list = request.data, []
+            elif "file" in request.FILES:
+                data = request.FILES["file"].read().decode("utf-8")
+                template_list = request.data.getlist("template_list")
+            else:
+                data = request.data.get("hosts")
+                template_list = request.data.get("template_list") or []
+            rows, errors = validate_host_rows(parse_host_rows(data), template_list)
+        except (ServiceErrorHandler, UnicodeDecodeError) as e:
+            return Response(
+                {"status": "error", "message": str(e)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if errors:
+            return Response(
+                {
+                    "status": "error",
+                    "message": f"{len(errors)} of {len(rows)} hosts are invalid",
+                    "errors": errors,
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            with transaction.atomic():
+                task_status = TaskStatus.objects.create(
+                    user=user,
+                    task_id=str(uuid.uuid4()),
+                    task_type="bulk_host_creation",
+                )
+                lifecycles = create_local_hosts(rows, host_group)
+                hosts = [
+                    {"host_lifecycle_id": lifecycle.pk, "templates": row["templates"]}
+                    for lifecycle, row in zip(lifecycles, rows)
+                ]
+                transaction.on_commit(
+                    lambda: bulk_host_creation_workflow.delay(
+                        str(task_status.pk), hosts, host_group.hostgroupid
+                    )
+                )
+        except Exception as e:
+            django_logger.exception(f"Bulk host onboarding failed: {str(e)}")
+            return Response(
+                {
+                    "status": "error",
+                    "message": "Something went wrong, please try again later",
+                },
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+        django_logger.info(
+            f"Bulk host onboarding of {len(rows)} hosts started by {user.email}"
+        )
+        return Response(
+            {
+                "status": "success",
+                "message": f"Creation of {len(rows)} hosts started",
+                "task_id": task_status.task_id,
+                "hosts": [
+                    {
+                        "host": row["host"],
+                        "local_host_id": lifecycle.host_id,
+                        "host_lifecycle_id": lifecycle.pk,
+                    }
+                    for lifecycle, row in zip(lifecycles, rows)
+                ],
+            },
+            status=status.HTTP_202_ACCEPTED,
+        )
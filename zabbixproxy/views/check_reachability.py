@@ -1,20 +1,17 @@
-import ipaddress
 import logging
-import re
 
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from zabbixproxy.functions.check_reachability_functions import check_reachability
+from zabbixproxy.functions.check_reachability_functions import (
+    check_reachability,
+    validate_reachability_target,
+)
 
 django_logger = logging.getLogger("django")
 
-DOMAIN_REGEX = re.compile(
-    r"^(?!-)[A-Za-z0-9-]{1,63}(?<!-)(\.(?!-)[A-Za-z0-9-]{1,63}(?<!-))*$"
-)
-
 
 class CheckReachabilityView(APIView):
     permission_classes = [IsAuthenticated]
@@ -27,29 +24,13 @@ class CheckReachabilityView(APIView):
         host = request.query_params.get("host")
         is_domain = request.query_params.get("is_domain", "false").lower() == "true"
 
-        # Validate presence
-        if not host:
+        error = validate_reachability_target(host, is_domain)
+        if error:
             return Response(
-                {"status": "error", "message": "Missing 'host' parameter"},
+                {"status": "error", "message": error},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Validate format
-        if is_domain:
-            if not DOMAIN_REGEX.fullmatch(host):
-                return Response(
-                    {"status": "error", "message": "Invalid domain format"},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-        else:
-            try:
-                ipaddress.ip_address(host)
-            except ValueError:
-                return Response(
-                    {"status": "error", "message": "Invalid IP address format"},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-
         try:
             reachable = check_reachability(is_domain, host)
             print(f"Reachability check for {host} (is_domain={is_domain}): {reachable}")
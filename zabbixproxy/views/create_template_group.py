@@ -6,28 +6,23 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from zabbixproxy.functions.credentials_functions import zabbix_login
-
 django_logger = logging.getLogger("django")
 
 from utils import ServiceErrorHandler
 from zabbixproxy.models import TemplateGroupMirror
 from zabbixproxy.serializers import TemplateGroupSerializer
+from zabbixproxy.services import get_zabbix_auth_token
 from zabbixproxy.tasks.template_group_creation import template_group_creation_workflow
 
 
 class TemplateGroupView(APIView):
     api_url = settings.ZABBIX_API_URL
-    username = settings.ZABBIX_ADMIN_USER
-    password = settings.ZABBIX_ADMIN_PASSWORD
     default_password = settings.ZABBIX_DEFAULT_PASSWORD
     permission_classes = [IsAuthenticated]
 
     def get_zabbix_auth_token(self):
         try:
-            return zabbix_login(
-                api_url=self.api_url, username=self.username, password=self.password
-            )
+            return get_zabbix_auth_token()
         except ServiceErrorHandler as e:
             raise ServiceErrorHandler(f"{str(e)}")
 
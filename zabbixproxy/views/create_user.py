@@ -8,22 +8,19 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from utils import ServiceErrorHandler
-from zabbixproxy.functions.credentials_functions import create_user, zabbix_login
+from zabbixproxy.functions.credentials_functions import create_user
 from zabbixproxy.models import ZabbixUser, ZabbixUserGroup
+from zabbixproxy.services import get_zabbix_auth_token
 
 
 class ZabbixUserCreationView(APIView):
     api_url = settings.ZABBIX_API_URL
-    username = settings.ZABBIX_ADMIN_USER
-    password = settings.ZABBIX_ADMIN_PASSWORD
     default_password = settings.ZABBIX_DEFAULT_PASSWORD
     permission_classes = [IsAuthenticated]
 
     def get_zabbix_auth_token(self):
         try:
-            return zabbix_login(
-                api_url=self.api_url, username=self.username, password=self.password
-            )
+            return get_zabbix_auth_token()
         except ServiceErrorHandler as e:
             raise ServiceErrorHandler(f"{str(e)}")
 
@@ -11,22 +11,18 @@ from utils import ServiceErrorHandler
 from zabbixproxy.functions.credentials_functions import (
     create_host_group,
     create_user_group,
-    zabbix_login,
 )
 from zabbixproxy.models import ZabbixHostGroup, ZabbixUserGroup
+from zabbixproxy.services import get_zabbix_auth_token
 
 
 class HostAndUserGroupCreationView(APIView):
     api_url = settings.ZABBIX_API_URL
-    username = settings.ZABBIX_ADMIN_USER
-    password = settings.ZABBIX_ADMIN_PASSWORD
     permission_classes = [IsAuthenticated]
 
     def get_zabbix_auth_token(self):
         try:
-            return zabbix_login(
-                api_url=self.api_url, username=self.username, password=self.password
-            )
+            return get_zabbix_auth_token()
         except ServiceErrorHandler as e:
             raise ServiceErrorHandler(f"{str(e)}")
 
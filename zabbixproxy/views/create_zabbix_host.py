@@ -8,8 +8,8 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from utils import ServiceErrorHandler
-from zabbixproxy.functions.credentials_functions import zabbix_login
 from zabbixproxy.models import Host, TemplateMirror
+from zabbixproxy.services import get_zabbix_auth_token
 from zabbixproxy.tasks import host_creation_workflow
 
 django_logger = logging.getLogger("django")
@@ -17,16 +17,12 @@ django_logger = logging.getLogger("django")
 
 class ZabbixHostCreationView(APIView):
     api_url = settings.ZABBIX_API_URL
-    username = settings.ZABBIX_ADMIN_USER
-    password = settings.ZABBIX_ADMIN_PASSWORD
     default_password = settings.ZABBIX_DEFAULT_PASSWORD
     permission_classes = [IsAuthenticated]
 
     def get_zabbix_auth_token(self):
         try:
-            return zabbix_login(
-                api_url=self.api_url, username=self.username, password=self.password
-            )
+            return get_zabbix_auth_token()
         except ServiceErrorHandler as e:
             raise ServiceErrorHandler(f"{str(e)}")
 
@@ -40,6 +36,12 @@ class ZabbixHostCreationView(APIView):
                 {"status": "error", "message": "local_host_id is required"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
+        if str(host_params.get("username") or "").startswith("-"):
+            # ssh would read it as an option, e.g. "-oProxyCommand=..."
+            return Response(
+                {"status": "error", "message": "username must not start with '-'"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
         template_list = host_params.get("template_list", [])
         if not template_list:
             return Response(
@@ -0,0 +1,114 @@
+import logging
+import re
+
+import orjson
+import redis
+import redis.asyncio
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+
+from utils import event_channel, event_stream_key, stream_request_user
+
+django_logger = logging.getLogger("django")
+
+STREAM_ID = re.compile(r"^\d+-\d+$")
+
+
+@require_GET
+async def stream_events(request):
+    """
+    Server-Sent Events stream of the caller's organization
+
+    Sends `host_lifecycle` events when a host's HostLifecycle changes and
+    `task_status` events when a TaskStatus makes progress, so clients no
+    longer have to poll `/local-hosts/`. Every event carries its stream ID;
+    a client reconnecting with Last-Event-ID (or ?last_event_id=) first
+    receives the events it missed, from the last EVENT_STREAM_MAXLEN.
+
+    EventSource cannot send an Authorization header, so the JWT may also be
+    passed as ?token=.
+    """
+    user = await stream_request_user(request)
+    if user is None:
+        return JsonResponse(
+            {"detail": "Authentication credentials were not provided."}, status=401
+        )
+    if not user.organization_id:
+        return JsonResponse(
+            {"error": "User is not part of an organization"}, status=403
+        )
+
+    last_event_id = request.headers.get("Last-Event-ID") or request.GET.get(
+        "last_event_id"
+    )
+    if last_event_id and not STREAM_ID.match(last_event_id):
+        last_event_id = None
+
+    response = StreamingHttpResponse(
+        _event_source(user.organization_id, last_event_id),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    # Keep reverse proxies from buffering the stream
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+async def _event_source(organization_id, last_event_id):
+    """
+    Subscribe first, then replay the stream after `last_event_id`, so no
+    event falls between the replay and the live messages; live messages
+    already replayed are skipped by ID.
+    """
+    conn = redis.asyncio.Redis.from_url(
+        settings.REDIS_URL, socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT
+    )
+    pubsub = conn.pubsub()
+    try:
+        await pubsub.subscribe(event_channel(organization_id))
+        yield "retry: 3000\n\n"
+
+        last = _stream_id(last_event_id)
+        if last_event_id:
+            missed = await conn.xrange(
+                event_stream_key(organization_id), min=f"({last_event_id}"
+            )
+            for event_id, fields in missed:
+                event_id = event_id.decode()
+                last = _stream_id(event_id)
+                yield _format_event(
+                    event_id, fields[b"type"].decode(), fields[b"data"].decode()
+                )
+
+        while True:
+            message = await pubsub.get_message(
+                ignore_subscribe_messages=True,
+                timeout=settings.EVENT_STREAM_HEARTBEAT_SECONDS,
+            )
+            if message is None:
+                yield ": keep-alive\n\n"
+                continue
+            event = orjson.loads(message["data"])
+            if _stream_id(event["id"]) <= last:
+                continue
+            last = _stream_id(event["id"])
+            yield _format_event(
+                event["id"], event["type"], orjson.dumps(event["data"]).decode()
+            )
+    except redis.RedisError as e:
+        django_logger.warning(f"Event stream of organization {organization_id}: {e}")
+    finally:
+        await pubsub.aclose()
+        await conn.aclose()
+
+
+def _stream_id(event_id):
+    if not event_id:
+        return (0, 0)
+    milliseconds, sequence = event_id.split("-")
+    return (int(milliseconds), int(sequence))
+
+
+def _format_event(event_id, event_type, data):
+    return f"id: {event_id}\nevent: {event_type}\ndata: {data}\n\n"
@@ -0,0 +1,142 @@
+import logging
+import time
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from utils import ServiceErrorHandler, accepted_encodings, gzip_stream
+from zabbixproxy.functions.alert_functions import organization_host_ids
+from zabbixproxy.functions.history_export_functions import (
+    EXPORT_FORMATS,
+    iter_history_pages,
+    write_export,
+)
+from zabbixproxy.functions.visualization_functions.request import send_request
+
+logger = logging.getLogger("zabbix")
+
+
+class HistoryExportView(APIView):
+    """
+    Stream the raw history of a host or a set of items as NDJSON or CSV.
+
+    History is read in time windows with paged history.get calls and written
+    out as it arrives, so memory use does not grow with the range. Paging
+    stops as soon as the client disconnects.
+
+    Only hosts of the caller's organization can be exported; other hosts
+    answer 404 and `itemids` are looked up among the organization's hosts.
+
+    Query Parameters:
+    - hostid: Export every enabled item of this host, or
+    - itemids: Comma separated item IDs to export
+    - time_from / time_till: Optional Unix timestamps; without them the
+      last `time_range` hours (default 24) are exported. Ranges are limited
+      to ZABBIX_EXPORT_MAX_DAYS.
+    - output: "ndjson" (default) or "csv"
+
+    The response is gzip encoded when the client accepts it. An export that
+    fails partway ends with an {"error": ...} line in NDJSON and a
+    "# error: ..." line in CSV.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        hostid = request.query_params.get("hostid")
+        itemids = request.query_params.get("itemids")
+        output = request.query_params.get("output", "ndjson")
+
+        if not hostid and not itemids:
+            return Response(
+                {"error": "Missing hostid or itemids parameter"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if output not in EXPORT_FORMATS:
+            return Response(
+                {"error": f"output must be one of {', '.join(EXPORT_FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            time_from, time_till = self._parse_range(request.query_params)
+        except ServiceErrorHandler as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        host_ids = organization_host_ids(getattr(request.user, "organization", None))
+        if hostid and hostid.strip() not in host_ids:
+            return Response(
+                {"error": f"Host {hostid} not found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        if not host_ids:
+            return Response(
+                {"error": "No items found to export"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        # item.get runs with admin credentials, so always narrow it to the
+        # caller's hosts
+        params = {
+            "output": ["itemid", "key_", "value_type"],
+            "filter": {"status": "0"},
+            "hostids": hostid.strip() if hostid else host_ids,
+        }
+        if itemids:
+            params["itemids"] = [i.strip() for i in itemids.split(",") if i.strip()]
+
+        try:
+            items = send_request("item.get", params)
+        except ServiceErrorHandler as e:
+            logger.error(f"History export item lookup failed: {e}")
+            return Response({"error": str(e)}, status=status.HTTP_502_BAD_GATEWAY)
+
+        if not items:
+            return Response(
+                {"error": "No items found to export"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        logger.info(
+            f"Exporting history of {len(items)} items from {time_from} to {time_till} as {output}"
+        )
+        stream = write_export(
+            iter_history_pages(items, time_from, time_till), items, output
+        )
+        encoding = "gzip" if "gzip" in accepted_encodings(request) else None
+        if encoding:
+            stream = gzip_stream(stream)
+
+        response = StreamingHttpResponse(stream, content_type=EXPORT_FORMATS[output])
+        response["Content-Disposition"] = (
+            f'attachment; filename="history-{hostid or "items"}-{time_from}-{time_till}.{output}"'
+        )
+        # Keep reverse proxies from buffering the whole export
+        response["X-Accel-Buffering"] = "no"
+        if encoding:
+            response["Content-Encoding"] = encoding
+        patch_vary_headers(response, ["Accept-Encoding"])
+        return response
+
+    def _parse_range(self, query_params):
+        try:
+            time_till = int(query_params.get("time_till") or time.time())
+            if query_params.get("time_from"):
+                time_from = int(query_params["time_from"])
+            else:
+                time_from = time_till - int(query_params.get("time_range", "24")) * 3600
+        except ValueError:
+            raise ServiceErrorHandler("Invalid time_from, time_till or time_range")
+
+        if time_from > time_till:
+            raise ServiceErrorHandler("time_from must not be after time_till")
+        if time_till - time_from > settings.ZABBIX_EXPORT_MAX_DAYS * 86400:
+            raise ServiceErrorHandler(
+                f"Exports are limited to {settings.ZABBIX_EXPORT_MAX_DAYS} days"
+            )
+        return time_from, time_till